@@ -3,9 +3,19 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     # --- Database & Auth ---
     DB_URL: str
+    ASYNC_DB_URL: str = ""  # 비우면 DB_URL의 드라이버를 aiomysql/aiosqlite로 바꿔서 사용
+    # 커넥션 풀 (엔진별 = 워커 프로세스별). 워커 수 × (POOL_SIZE + MAX_OVERFLOW) × 엔진 수 < MySQL max_connections
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30      # 풀이 가득 찼을 때 커넥션을 기다리는 최대 시간(초)
+    DB_POOL_RECYCLE: int = 1800    # MySQL wait_timeout보다 짧게 (끊긴 커넥션 재사용 방지)
+    DB_POOL_PRE_PING: bool = True
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+    # 인증 사용자 캐시 (워커 프로세스별). 다른 워커의 무효화는 TTL 후 반영됨
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAXSIZE: int = 10000
 
     # --- Email ---
     MAIL_USERNAME: str
@@ -37,6 +47,52 @@ class Settings(BaseSettings):
     CLOVA_API_KEY: str = ""
     CLOVA_REQUEST_ID: str = ""
 
+    # --- Chat 컨텍스트 (토큰 예산 + 롤링 요약) ---
+    CHAT_CONTEXT_MAX_TOKENS: int = 3000     # system + 요약 + 최근 대화에 쓸 프롬프트 예산
+    CHAT_CONTEXT_MIN_RECENT: int = 4        # 예산과 무관하게 항상 포함할 최근 메시지 수
+    CHAT_CONTEXT_FETCH_LIMIT: int = 30      # 히스토리 조회 시 최대로 읽어올 최근 메시지 수
+    CHAT_SUMMARY_EVERY: int = 10            # 요약되지 않은 과거 메시지가 N개 쌓이면 요약 갱신
+    CHAT_SUMMARY_KEEP_RECENT: int = 6       # 요약 대상에서 제외하고 원문으로 남길 최근 메시지 수
+    CHAT_SUMMARY_MAX_TOKENS: int = 400      # 요약 결과 최대 토큰
+
+    # --- 푸시 대량 발송 (FCM) ---
+    PUSH_BATCH_SIZE: int = 500              # send_each 1회당 메시지 수 (FCM 최대 500)
+    PUSH_MAX_CONCURRENCY: int = 8           # 동시에 발송할 배치 수
+    PUSH_MAX_RETRIES: int = 3               # 일시 오류 재시도 횟수
+    PUSH_BACKOFF_BASE_SEC: float = 0.5      # 재시도 대기 = base * 2^시도 (+지터)
+
+    # --- 알림 스케줄러 분산 실행 ---
+    SCHEDULER_PARTITIONS: int = 4           # 사용자 분할 수 (owner_id % N). 운영 중 변경 시 다음 버킷부터 적용
+    SCHEDULER_LEASE_SECONDS: int = 90       # 파티션 리스 유효 시간 (워커가 죽으면 이 시간 뒤 다른 워커가 인계)
+    SCHEDULER_MAX_PARTITIONS_PER_WORKER: int = 0  # 워커 1개가 맡을 최대 파티션 수 (0 = ceil(파티션 수 / 살아 있는 워커 수))
+    SCHEDULER_WORKER_ID: str = ""           # 비우면 호스트명-pid
+
+    # --- 발송 아웃박스 워커 (outbox_worker.py) ---
+    NOTIFICATIONS_VIA_OUTBOX: bool = False  # 스케줄러 푸시를 아웃박스에 적재 (켜려면 outbox_worker.py 프로세스가 떠 있어야 함)
+    OUTBOX_BATCH_SIZE: int = 500            # 한 번에 가져갈 행 수
+    OUTBOX_POLL_INTERVAL_SEC: float = 1.0   # 가져갈 행이 없을 때 대기 시간
+    OUTBOX_LEASE_SECONDS: int = 120         # 가져간 행을 이 시간 안에 처리 못 하면(워커 장애) 다시 발송 대상 (처리 중에는 1/3마다 연장)
+    OUTBOX_SMTP_CONCURRENCY: int = 4        # 동시에 여는 SMTP 연결 수 (= 이메일 동시 발송 수)
+    OUTBOX_MAX_ATTEMPTS: int = 8            # 초과 시 failed로 종료
+    OUTBOX_RETRY_BASE_SEC: int = 30         # 재시도 대기 = base * 2^(시도-1)
+
+    # --- 도감 인메모리 카탈로그 ---
+    CATALOG_REFRESH_SEC: float = 30.0       # 카탈로그 버전 확인 주기 (다른 프로세스의 도감 변경이 반영되기까지 최대 지연)
+
+    # --- ML 추천 모델 번들 ---
+    ML_ARTIFACT_DIR: str = "ml_scripts/artifacts"  # 버전별 번들 + CURRENT 파일 위치
+    ML_ARTIFACT_POLL_SEC: float = 60.0      # CURRENT 변경 확인 주기 (새 번들이 모든 워커에 반영되기까지 최대 지연)
+
+    # --- 도감 검색 인덱스 (Whoosh) ---
+    SEARCH_INDEX_DIR: str = "indexdir"
+    SEARCH_REFRESH_SEC: float = 1.0         # searcher.refresh() 확인 주기 (증분 갱신이 검색에 보이기까지 최대 지연)
+    SEARCH_WRITER_BATCH_SIZE: int = 500     # 백그라운드 writer가 한 번에 commit할 최대 변경 수
+    SEARCH_WRITER_LOCK_TIMEOUT: float = 10.0  # 다른 프로세스가 인덱스에 쓰는 중일 때 잠금 대기 시간
+    SEARCH_CACHE_SIZE: int = 2048           # 검색 결과 LRU 캐시 항목 수 (워커별)
+    SEARCH_FUZZY_MAX_EDIT: int = 2          # 오타 교정 최대 편집 거리 (한글은 자모 기준)
+    SEARCH_FUZZY_PREFIX_LENGTH: int = 8     # 삭제 사전을 만들 단어 앞부분 길이 (길수록 정확, 메모리 증가)
+    SEARCH_FUZZY_MAX_CANDIDATES: int = 100  # 검색어 단어당 편집 거리를 계산할 최대 후보 수
+
     class Config:
         env_file = ".env"
         extra = "ignore"
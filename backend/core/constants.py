@@ -3,4 +3,6 @@ WATERING_CYCLE_MAP = {
     "자주": 5,
     "보통": 10,
     "적게": 15,
-}
\ No newline at end of file
+}
+# 맵에 없는 물주기 유형일 때 사용하는 기본 주기 (단위: 일)
+DEFAULT_WATERING_CYCLE_DAYS = 7
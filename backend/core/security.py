@@ -24,11 +24,16 @@ def create_verification_token(email: str):
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-def verify_token(token: str):
+def decode_token(token: str):
+    """서명/만료를 검증한 JWT payload(dict)를 반환합니다. 실패하면 None."""
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None: return None
-        return email
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
     except JWTError:
-        return None
\ No newline at end of file
+        return None
+
+def verify_token(token: str):
+    payload = decode_token(token)
+    if payload is None: return None
+    email: str = payload.get("sub")
+    if email is None: return None
+    return email
\ No newline at end of file
@@ -1,10 +1,14 @@
 # crud.py
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import func, and_, or_
 import models, schemas
 from core.security import get_password_hash
-from datetime import datetime, timedelta, timezone
+from utils.pagination import keyset_paginate
+from services import auth_cache, catalog, search_index
+from services.watering import compute_next_watering_date, refresh_next_watering, notification_minute_of
+from datetime import datetime, date, timedelta, timezone
 
 # --- User CRUD ---
 
@@ -41,6 +45,7 @@ def update_user_password(db: Session, email: str, new_password: str):
         hashed_password = get_password_hash(new_password)
         user.hashed_password = hashed_password
         db.commit()
+        auth_cache.invalidate_user(user.id)
         db.refresh(user)
     return user
 
@@ -73,6 +78,7 @@ def delete_user(db: Session, user_id: int) -> Optional[models.User]:
     if user:
         db.delete(user)
         db.commit()
+        auth_cache.invalidate_user(user_id)
         return user
     return None
 
@@ -128,8 +134,11 @@ def create_plant(db: Session, user_id: int, name: str, species: str, plant_maste
         species=species,
         owner_id=user_id,
         plant_master_id=plant_master_id, # [수정] 전달받은 plant_master_id를 저장
-        image_url=None
+        image_url=None,
+        last_watered_at=datetime.now(), # 등록 시점을 첫 물주기로 간주 (next_watering_at 계산용)
     )
+    master = catalog.get_catalog().get(plant_master_id)
+    refresh_next_watering(db_plant, master.watering_type if master else None)
     db.add(db_plant)
     db.commit()
     db.refresh(db_plant)
@@ -154,8 +163,12 @@ def update_plant(db: Session, plant_id: int, plant_update_data: schemas.PlantCre
         return None
     
     update_data = plant_update_data.model_dump(exclude_unset=True)
+    master_changed = update_data.get("plant_master_id", plant_obj.plant_master_id) != plant_obj.plant_master_id
     for key, value in update_data.items():
         setattr(plant_obj, key, value)
+    if master_changed:
+        master = catalog.get_catalog().get(plant_obj.plant_master_id)
+        refresh_next_watering(plant_obj, master.watering_type if master else None)
 
     db.add(plant_obj)
     db.commit()
@@ -176,18 +189,22 @@ def get_master_plant_by_id(db: Session, plant_id: int):
     """PlantMaster 테이블에서 ID로 단일 식물 정보 조회"""
     return db.query(models.PlantMaster).filter(models.PlantMaster.id == plant_id).first()
 
+# 커서 페이지네이션에 사용할 수 있는 정렬 컬럼 (NULL 없는 컬럼만 허용)
+MASTER_SORT_COLUMNS = {"id", "name_ko", "species", "difficulty", "light_requirement", "created_at"}
+
 def get_all_master_plants(
     db: Session,
-    skip: int = 0,
+    cursor: Optional[str] = None,
     limit: int = 100,
     has_pets: Optional[bool] = None,
     difficulty: Optional[str] = None,       # 👈 [추가] 난이도 파라미터
     light_requirement: Optional[str] = None, # 👈 [추가] 햇빛 파라미터
     sort_by: Optional[str] = None,
     order: Optional[str] = "asc"
-) -> List[models.PlantMaster]:
+) -> Tuple[List[models.PlantMaster], Optional[str]]:
     """
-    PlantMaster 테이블에서 모든 식물 목록 조회 (필터링 기능 추가)
+    PlantMaster 테이블에서 식물 목록 조회 (필터링 + 커서 페이지네이션)
+    반환: (식물 목록, 다음 페이지 커서)
     """
     query = db.query(models.PlantMaster)
 
@@ -199,15 +216,13 @@ def get_all_master_plants(
     if light_requirement:
         query = query.filter(models.PlantMaster.light_requirement == light_requirement)
 
-    if sort_by:
-        sort_column = getattr(models.PlantMaster, sort_by, None)
-        if sort_column:
-            if order.lower() == "desc":
-                query = query.order_by(sort_column.desc())
-            else:
-                query = query.order_by(sort_column.asc())
+    # 정렬 기준이 없거나 허용되지 않은 컬럼이면 id 순
+    sort_column = models.PlantMaster.id
+    if sort_by in MASTER_SORT_COLUMNS:
+        sort_column = getattr(models.PlantMaster, sort_by)
+    desc = (order or "asc").lower() == "desc"
 
-    return query.offset(skip).limit(limit).all()
+    return keyset_paginate(query, sort_column, models.PlantMaster.id, cursor, limit, desc=desc)
 
 # def search_master_plants(db: Session, q: str, skip: int = 0, limit: int = 100):
 #     """한국어 이름으로 PlantMaster 테이블에서 식물 검색"""
@@ -221,8 +236,11 @@ def get_all_master_plants(
 def create_master_plant(db: Session, plant: models.PlantMaster) -> models.PlantMaster:
     """서비스 계층에서 완전히 조립된 PlantMaster 객체를 받아 DB에 저장합니다."""
     db.add(plant)
+    catalog.bump_version(db)
     db.commit()
     db.refresh(plant)
+    catalog.invalidate()
+    search_index.enqueue_upsert(plant) # 검색 인덱스 증분 반영 (백그라운드 writer)
     return plant
 
 # ⭐️ (관리자용) 종(species) 이름으로 중복 확인
@@ -236,6 +254,7 @@ def update_last_watered_at(db: Session, plant_id: int) -> models.Plant:
     if plant:
         plant.last_watered_at = datetime.now(plant.created_at.tzinfo) # DB 타임존과 일치
         plant.notification_snoozed_until = None # 미루기 상태 초기화
+        refresh_next_watering(plant)
         db.commit()
         db.refresh(plant)
     return plant
@@ -245,10 +264,228 @@ def snooze_notification_for_plant(db: Session, plant_id: int) -> models.Plant:
     plant = db.query(models.Plant).filter(models.Plant.id == plant_id).first()
     if plant:
         plant.notification_snoozed_until = datetime.utcnow().date() + timedelta(days=1)
+        refresh_next_watering(plant)
         db.commit()
         db.refresh(plant)
     return plant
 
+NEXT_WATERING_BATCH_SIZE = 1000 # next_watering_at 일괄 재계산 단위
+
+# ⭐️ (관리자용) 도감 물주기 유형 변경 → 해당 종 식물들의 물주기 예정일 재계산
+def update_master_watering_type(db: Session, master_id: int, watering_type: str) -> Optional[models.PlantMaster]:
+    master = get_master_plant_by_id(db, master_id)
+    if not master:
+        return None
+    master.watering_type = watering_type
+    db.flush()
+
+    plant_ids = [row.id for row in db.query(models.Plant.id).filter(models.Plant.plant_master_id == master_id)]
+    for i in range(0, len(plant_ids), NEXT_WATERING_BATCH_SIZE):
+        recompute_next_watering(db, plant_ids[i:i + NEXT_WATERING_BATCH_SIZE])
+    catalog.bump_version(db)
+    db.commit()
+    db.refresh(master)
+    catalog.invalidate()
+    search_index.enqueue_upsert(master) # watering_type은 검색 결과 저장 필드
+    return master
+
+def recompute_next_watering(db: Session, plant_ids: List[int]) -> int:
+    """
+    주어진 식물들의 next_watering_at을 다시 계산해 일괄 UPDATE합니다. (commit은 호출자가)
+    도감 물주기 유형 변경과 백필 스크립트에서 사용합니다.
+    """
+    if not plant_ids:
+        return 0
+    rows = (
+        db.query(
+            models.Plant.id,
+            models.Plant.last_watered_at,
+            models.Plant.notification_snoozed_until,
+            models.PlantMaster.watering_type,
+        )
+        .outerjoin(models.PlantMaster, models.PlantMaster.id == models.Plant.plant_master_id)
+        .filter(models.Plant.id.in_(plant_ids))
+        .all()
+    )
+    mappings = [
+        {
+            "id": row.id,
+            "next_watering_at": compute_next_watering_date(
+                row.last_watered_at, row.watering_type, row.notification_snoozed_until
+            ),
+        }
+        for row in rows
+    ]
+    db.bulk_update_mappings(models.Plant, mappings)
+    return len(mappings)
+
+# ⭐️ 알람: 물 줄 식물 조회 (스케줄러용)
+def get_due_watering_rows(
+    db: Session,
+    due_date: date,
+    after: Optional[Tuple[int, int]] = None,
+    limit: int = 1000,
+    minute_range: Optional[Tuple[int, int]] = None,
+    partition: Optional[Tuple[int, int]] = None,
+) -> List[Tuple[int, int, str, str]]:
+    """
+    next_watering_at == due_date 인 알림 대상 식물을
+    (is_notification_enabled, next_watering_at, notification_minute) 인덱스로 조회합니다.
+    - 물주기 주기/미루기는 next_watering_at에 이미 반영되어 있으므로 도감 조인이 필요 없습니다.
+    - minute_range=(start, end): 알림 시각(하루 중 분)이 start 이상 end 이하인 식물만 (분 단위 스케줄러)
+    - partition=(index, count): owner_id % count == index 인 사용자만 (스케줄러 워커 분산)
+    - (owner_id, plant_id) 키셋으로 limit개씩 끊어 읽으므로 호출자는 사용자 단위로 묶어 처리하면 됩니다.
+    반환: [(owner_id, plant_id, plant_name, push_token), ...]  # owner_id, plant_id 오름차순
+    """
+    Plant, User = models.Plant, models.User
+    query = (
+        db.query(Plant.owner_id, Plant.id, Plant.name, User.push_token)
+        .join(User, User.id == Plant.owner_id)
+        .filter(
+            Plant.is_notification_enabled == True,
+            Plant.next_watering_at == due_date,
+            User.push_token != None,
+        )
+    )
+    if minute_range:
+        query = query.filter(Plant.notification_minute.between(*minute_range))
+    if partition:
+        index, count = partition
+        query = query.filter((Plant.owner_id % count) == index)
+    if after:
+        last_owner_id, last_plant_id = after
+        query = query.filter(or_(
+            Plant.owner_id > last_owner_id,
+            and_(Plant.owner_id == last_owner_id, Plant.id > last_plant_id),
+        ))
+    return [tuple(row) for row in query.order_by(Plant.owner_id, Plant.id).limit(limit).all()]
+
+# ⭐️ 알람: 알림 설정(켜기/끄기, 알림 시각) 변경
+def update_plant_notification(
+    db: Session, plant_id: int, settings_update: schemas.PlantNotificationUpdate
+) -> Optional[models.Plant]:
+    plant = db.query(models.Plant).filter(models.Plant.id == plant_id).first()
+    if not plant:
+        return None
+    update_data = settings_update.model_dump(exclude_unset=True)
+    if "is_notification_enabled" in update_data:
+        plant.is_notification_enabled = update_data["is_notification_enabled"]
+    if "notification_time" in update_data:
+        plant.notification_time = update_data["notification_time"]
+        plant.notification_minute = notification_minute_of(plant.notification_time)
+    db.commit()
+    db.refresh(plant)
+    return plant
+
+def recompute_notification_minutes(db: Session) -> int:
+    """notification_time → notification_minute 일괄 재계산 (백필용). 값 종류가 적으므로 시각별 UPDATE 1회씩"""
+    total = 0
+    times = [row[0] for row in db.query(models.Plant.notification_time).distinct()]
+    for notification_time in times:
+        column = models.Plant.notification_time
+        condition = column == None if notification_time is None else column == notification_time
+        total += db.query(models.Plant).filter(condition).update(
+            {models.Plant.notification_minute: notification_minute_of(notification_time)},
+            synchronize_session=False,
+        )
+    db.commit()
+    return total
+
+# ⭐️ 알람 스케줄러 분산 실행: 파티션 리스 / 진행 상황
+def acquire_scheduler_lease(db: Session, name: str, owner: str, ttl_seconds: int) -> bool:
+    """
+    리스를 획득(또는 연장)합니다. 비어 있거나 만료됐거나 이미 내 것이면 성공.
+    행 단위 UPDATE/INSERT만 쓰므로 MySQL/SQLite 모두 동작하며, 동시에 시도해도 한 워커만 성공합니다.
+    """
+    now = datetime.utcnow()
+    Lease = models.SchedulerLease
+    values = {Lease.owner: owner, Lease.expires_at: now + timedelta(seconds=ttl_seconds)}
+    updated = db.query(Lease).filter(
+        Lease.name == name,
+        or_(Lease.owner == owner, Lease.expires_at < now),
+    ).update(values, synchronize_session=False)
+    if updated:
+        db.commit()
+        return True
+    try:
+        db.add(Lease(name=name, owner=owner, expires_at=now + timedelta(seconds=ttl_seconds)))
+        db.commit()
+        return True
+    except IntegrityError:
+        db.rollback() # 다른 워커가 보유 중
+        return False
+
+def renew_scheduler_lease(db: Session, name: str, owner: str, ttl_seconds: int) -> bool:
+    """
+    내가 보유 중이고 아직 만료되지 않은 리스만 연장합니다. (commit은 호출자)
+    조건부 UPDATE가 리스 행을 잠그므로, 발송 진행 기록과 같은 트랜잭션에서 호출하면
+    commit 시점까지 다른 워커가 이 리스를 가져갈 수 없습니다. False면 리스를 잃은 것.
+    """
+    now = datetime.utcnow()
+    Lease = models.SchedulerLease
+    updated = db.query(Lease).filter(
+        Lease.name == name, Lease.owner == owner, Lease.expires_at >= now,
+    ).update({Lease.expires_at: now + timedelta(seconds=ttl_seconds)}, synchronize_session=False)
+    return bool(updated)
+
+def count_live_scheduler_leases(db: Session, prefix: str) -> int:
+    """이름이 prefix로 시작하는 만료되지 않은 리스 수 (살아 있는 워커 수 집계용)"""
+    Lease = models.SchedulerLease
+    return db.query(func.count(Lease.name)).filter(
+        Lease.name.like(f"{prefix}%"), Lease.expires_at >= datetime.utcnow(),
+    ).scalar() or 0
+
+def release_scheduler_lease(db: Session, name: str, owner: str) -> None:
+    db.query(models.SchedulerLease).filter(
+        models.SchedulerLease.name == name, models.SchedulerLease.owner == owner
+    ).delete(synchronize_session=False)
+    db.commit()
+
+def get_done_scheduler_minutes(
+    db: Session, job: str, run_date: date, minute_range: Tuple[int, int], partition: Tuple[int, int]
+) -> set:
+    Run = models.SchedulerRun
+    rows = db.query(Run.minute).filter(
+        Run.job == job,
+        Run.run_date == run_date,
+        Run.minute.between(*minute_range),
+        Run.partition_count == partition[1],
+        Run.partition_no == partition[0],
+        Run.status == "done",
+    )
+    return {row.minute for row in rows}
+
+def start_scheduler_run(
+    db: Session, job: str, run_date: date, minute: int, partition: Tuple[int, int], worker_id: str
+) -> models.SchedulerRun:
+    """진행 기록을 만들거나, 중단된 기록이 있으면 그대로 이어받습니다. (last_owner_id부터 재개)"""
+    Run = models.SchedulerRun
+    key = dict(job=job, run_date=run_date, minute=minute, partition_count=partition[1], partition_no=partition[0])
+    run = db.query(Run).filter_by(**key).first()
+    if run is None:
+        run = Run(**key, status="running", worker_id=worker_id, last_owner_id=0, users_notified=0, sent=0, failed=0)
+        db.add(run)
+    else:
+        run.worker_id = worker_id
+    db.commit()
+    db.refresh(run)
+    return run
+
+# ⭐️ 알람: 사용자의 물주기 예정 목록
+def get_upcoming_waterings(db: Session, user_id: int, start: date, end: date) -> List[models.Plant]:
+    """start ~ end(포함) 사이에 물 줄 예정인 식물을 예정일 순으로 조회합니다."""
+    return (
+        db.query(models.Plant)
+        .options(joinedload(models.Plant.master_info))
+        .filter(
+            models.Plant.owner_id == user_id,
+            models.Plant.next_watering_at >= start,
+            models.Plant.next_watering_at <= end,
+        )
+        .order_by(models.Plant.next_watering_at.asc(), models.Plant.id.asc())
+        .all()
+    )
+
 # ⭐️ FCM 푸시 토큰 저장/갱신 (중복 토큰 처리 포함)
 def update_user_push_token(db: Session, user_id: int, token: str) -> Optional[models.User]:
     # 1) 이 토큰을 이미 쓰고 있는 “다른” 사용자들의 토큰을 먼저 지운다.
@@ -260,6 +497,8 @@ def update_user_push_token(db: Session, user_id: int, token: str) -> Optional[mo
         )
         for u in other_users:
             u.push_token = None
+    else:
+        other_users = []
 
     # 2) 현재 사용자에게 토큰 설정
     user = db.query(models.User).filter(models.User.id == user_id).first()
@@ -269,9 +508,29 @@ def update_user_push_token(db: Session, user_id: int, token: str) -> Optional[mo
     user.push_token = token  # token == "" 이면 그냥 그대로 저장, 원하면 여기서 None 처리해도 됨
 
     db.commit()
+    # 캐시된 사용자 스냅샷에 push_token이 들어 있으므로 토큰을 뺏긴 사용자까지 무효화
+    for u in other_users:
+        auth_cache.invalidate_user(u.id)
+    auth_cache.invalidate_user(user_id)
     db.refresh(user)
     return user
 
+# ⭐️ FCM 만료 토큰 정리 (대량 발송 결과)
+def clear_push_tokens(db: Session, tokens: List[str]) -> int:
+    """FCM이 unregistered로 응답한 토큰을 users.push_token에서 지웁니다."""
+    if not tokens:
+        return 0
+    user_ids = [row.id for row in db.query(models.User.id).filter(models.User.push_token.in_(tokens))]
+    if not user_ids:
+        return 0
+    db.query(models.User).filter(models.User.id.in_(user_ids)).update(
+        {models.User.push_token: None}, synchronize_session=False
+    )
+    db.commit()
+    for user_id in user_ids:
+        auth_cache.invalidate_user(user_id)
+    return len(user_ids)
+
 # ==============================================================================
 # Community: Post CRUD (게시글)
 # ==============================================================================
@@ -288,14 +547,10 @@ def create_post(db: Session, post: schemas.PostCreate, user_id: int) -> models.P
     db.refresh(db_post)
     return db_post
 
-def get_posts(db: Session, skip: int = 0, limit: int = 100) -> List[models.Post]:
-    """게시글 목록 조회 (최신순, 작성자 정보 포함)"""
-    return db.query(models.Post)\
-        .options(joinedload(models.Post.owner))\
-        .order_by(models.Post.created_at.desc())\
-        .offset(skip)\
-        .limit(limit)\
-        .all()
+def get_posts(db: Session, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[models.Post], Optional[str]]:
+    """게시글 목록 조회 (최신순, 작성자 정보 포함, 커서 페이지네이션)"""
+    query = db.query(models.Post).options(joinedload(models.Post.owner))
+    return keyset_paginate(query, models.Post.created_at, models.Post.id, cursor, limit, desc=True)
 
 def get_post(db: Session, post_id: int) -> Optional[models.Post]:
     """게시글 1개 상세 조회 (작성자, 댓글 및 댓글 작성자 정보 포함)"""
@@ -350,15 +605,12 @@ def create_comment(db: Session, comment: schemas.CommentCreate, post_id: int, us
     db.refresh(db_comment)
     return db_comment
 
-def get_comments_by_post(db: Session, post_id: int, skip: int = 0, limit: int = 100) -> List[models.Comment]:
-    """특정 게시글의 댓글 목록 조회 (작성자 정보 포함)"""
-    return db.query(models.Comment)\
+def get_comments_by_post(db: Session, post_id: int, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[models.Comment], Optional[str]]:
+    """특정 게시글의 댓글 목록 조회 (작성자 정보 포함, 오래된 순, 커서 페이지네이션)"""
+    query = db.query(models.Comment)\
         .options(joinedload(models.Comment.owner))\
-        .filter(models.Comment.post_id == post_id)\
-        .order_by(models.Comment.created_at.asc())\
-        .offset(skip)\
-        .limit(limit)\
-        .all()
+        .filter(models.Comment.post_id == post_id)
+    return keyset_paginate(query, models.Comment.created_at, models.Comment.id, cursor, limit, desc=False)
 
 def update_comment(db: Session, comment_id: int, comment_update: schemas.CommentUpdate, user_id: int) -> Optional[models.Comment]:
     """댓글 수정 (작성자 본인만 가능)"""
@@ -441,19 +693,15 @@ def create_manual_diary_entry(
         image_url=entry.image_url
     )
 
-def get_diaries_by_plant(db: Session, plant_id: int, user_id: int, skip: int = 0, limit: int = 100) -> List[models.Diary]:
-    """특정 식물의 전체 일지 목록을 최신순으로 조회합니다."""
+def get_diaries_by_plant(db: Session, plant_id: int, user_id: int, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[models.Diary], Optional[str]]:
+    """특정 식물의 전체 일지 목록을 최신순으로 조회합니다. (커서 페이지네이션)"""
     # 식물 소유권 확인
     plant = db.query(models.Plant).filter(models.Plant.id == plant_id).first()
     if not plant or plant.owner_id != user_id:
-        return [] # 빈 리스트 반환
+        return [], None # 빈 리스트 반환
 
-    return db.query(models.Diary)\
-        .filter(models.Diary.plant_id == plant_id)\
-        .order_by(models.Diary.created_at.desc())\
-        .offset(skip)\
-        .limit(limit)\
-        .all()
+    query = db.query(models.Diary).filter(models.Diary.plant_id == plant_id)
+    return keyset_paginate(query, models.Diary.created_at, models.Diary.id, cursor, limit, desc=True)
 
 def get_diary_entry(db: Session, diary_id: int, user_id: int) -> Optional[models.Diary]:
     """특정 일지 항목 1개를 조회합니다."""
@@ -511,42 +759,26 @@ def delete_manual_diary_entry(db: Session, diary_id: int, user_id: int) -> Optio
 # Chat CRUD (신규): 스레드 목록 / 메시지 조회 / 스레드 삭제
 # ==============================================================================
 
+CHAT_PREVIEW_MAX_CHARS = 200
+
 def get_threads_with_summary(
     db: Session,
     user_id: int,
-    skip: int = 0,
+    cursor: Optional[str] = None,
     limit: int = 50,
 ):
     """
-    N+1 없이, 한 번의 쿼리로 대화 스레드 목록 + 메시지 요약 정보를 가져옵니다.
-    반환 컬럼:
+    대화 스레드 목록 + 메시지 요약 정보를 가져옵니다.
+    요약 정보는 ChatThread의 비정규화 컬럼에서 바로 읽으므로
+    (user_id, updated_at) 인덱스 범위 스캔 1회로 끝나며 전체 메시지 양과 무관합니다.
+    반환: (rows, next_cursor)
+    rows 컬럼:
       - id, title, created_at, updated_at
       - message_count
-      - last_message
+      - last_message (미리보기, 최대 CHAT_PREVIEW_MAX_CHARS자)
       - last_message_at
     """
     Thread = models.ChatThread
-    Message = models.ChatMessage
-
-    # 각 스레드별 메시지 개수
-    count_sub = (
-        db.query(
-            Message.thread_id.label("thread_id"),
-            func.count(Message.id).label("message_count"),
-        )
-        .group_by(Message.thread_id)
-        .subquery()
-    )
-
-    # 각 스레드별 마지막 메시지 ID
-    last_id_sub = (
-        db.query(
-            Message.thread_id.label("thread_id"),
-            func.max(Message.id).label("last_msg_id"),
-        )
-        .group_by(Message.thread_id)
-        .subquery()
-    )
 
     query = (
         db.query(
@@ -554,20 +786,76 @@ def get_threads_with_summary(
             Thread.title,
             Thread.created_at,
             Thread.updated_at,
-            func.coalesce(count_sub.c.message_count, 0).label("message_count"),
-            Message.content.label("last_message"),
-            Message.created_at.label("last_message_at"),
+            Thread.message_count,
+            Thread.last_message_preview.label("last_message"),
+            Thread.last_message_at,
         )
-        .outerjoin(count_sub, count_sub.c.thread_id == Thread.id)
-        .outerjoin(last_id_sub, last_id_sub.c.thread_id == Thread.id)
-        .outerjoin(Message, Message.id == last_id_sub.c.last_msg_id)
         .filter(Thread.user_id == user_id)
-        .order_by(Thread.updated_at.desc(), Thread.id.desc())
-        .offset(skip)
-        .limit(limit)
     )
 
-    return query.all()
+    return keyset_paginate(query, Thread.updated_at, Thread.id, cursor, limit, desc=True)
+
+def record_chat_message(db: Session, message: models.ChatMessage) -> None:
+    """
+    새 메시지(flush 완료 상태)를 스레드 요약 컬럼에 반영합니다. commit은 호출자가 합니다.
+    message_count는 SQL 식으로 증가시켜 동시 요청에도 누락이 없고,
+    updated_at(onupdate)도 함께 갱신되어 목록 최신순 정렬에 반영됩니다.
+    """
+    Thread = models.ChatThread
+    db.query(Thread).filter(Thread.id == message.thread_id).update(
+        {
+            Thread.message_count: Thread.message_count + 1,
+            Thread.last_message_id: message.id,
+            Thread.last_message_preview: (message.content or "")[:CHAT_PREVIEW_MAX_CHARS],
+            Thread.last_message_at: func.now(),
+        },
+        synchronize_session=False,
+    )
+
+def recount_thread_stats(db: Session, thread_ids: List[int]) -> int:
+    """
+    chat_messages를 기준으로 지정한 스레드들의 요약 컬럼을 다시 계산합니다.
+    (메시지 삭제 후 보정, 백필 스크립트에서 사용) commit은 호출자가 합니다.
+    """
+    if not thread_ids:
+        return 0
+    Thread = models.ChatThread
+    Message = models.ChatMessage
+
+    stats = dict(
+        (row.thread_id, row)
+        for row in db.query(
+            Message.thread_id.label("thread_id"),
+            func.count(Message.id).label("message_count"),
+            func.max(Message.id).label("last_msg_id"),
+        )
+        .filter(Message.thread_id.in_(thread_ids))
+        .group_by(Message.thread_id)
+        .all()
+    )
+    last_ids = [row.last_msg_id for row in stats.values()]
+    last_msgs = {
+        m.id: m
+        for m in db.query(Message.id, Message.content, Message.created_at)
+        .filter(Message.id.in_(last_ids))
+        .all()
+    } if last_ids else {}
+
+    for thread_id in thread_ids:
+        row = stats.get(thread_id)
+        last = last_msgs.get(row.last_msg_id) if row else None
+        db.query(Thread).filter(Thread.id == thread_id).update(
+            {
+                Thread.message_count: row.message_count if row else 0,
+                Thread.last_message_id: last.id if last else None,
+                Thread.last_message_preview: (last.content or "")[:CHAT_PREVIEW_MAX_CHARS] if last else None,
+                Thread.last_message_at: last.created_at if last else None,
+                # 백필은 대화 활동이 아니므로 목록 정렬 기준은 유지
+                Thread.updated_at: Thread.updated_at,
+            },
+            synchronize_session=False,
+        )
+    return len(thread_ids)
 
 def get_threads_by_user(db: Session, user_id: int, skip: int = 0, limit: int = 50) -> List[models.ChatThread]:
     """
@@ -0,0 +1,118 @@
+# crud_async.py
+# async def 라우터(진단/챗봇/리메디)에서 쓰는 CRUD의 AsyncSession 버전입니다.
+# 동작은 crud.py의 같은 이름 함수와 동일하게 유지합니다. (동기 라우터는 계속 crud.py 사용)
+from datetime import datetime
+from typing import Optional, List
+
+from sqlalchemy import select, update, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+import models
+from crud import CHAT_PREVIEW_MAX_CHARS
+
+# --- Plant ---
+
+async def get_plant_by_id(db: AsyncSession, plant_id: int) -> Optional[models.Plant]:
+    result = await db.execute(
+        select(models.Plant)
+        .options(joinedload(models.Plant.master_info))
+        .where(models.Plant.id == plant_id)
+    )
+    return result.scalars().first()
+
+# --- Diary ---
+
+async def create_diary_log(
+    db: AsyncSession,
+    plant_id: int,
+    log_type: str,
+    log_message: Optional[str] = None,
+    image_url: Optional[str] = None,
+    reference_id: Optional[int] = None
+) -> models.Diary:
+    """[자동 기록용] 시스템 이벤트(물주기, 진단 등)를 Diary에 기록합니다."""
+    db_diary_log = models.Diary(
+        plant_id=plant_id,
+        log_type=log_type,
+        log_message=log_message,
+        image_url=image_url,
+        reference_id=reference_id
+    )
+    db.add(db_diary_log)
+    await db.commit()
+    await db.refresh(db_diary_log)
+    return db_diary_log
+
+# --- Diagnosis ---
+
+async def get_recent_diagnosis_by_hash(
+    db: AsyncSession, user_id: int, image_hash: int, since: datetime
+) -> Optional[models.Diagnosis]:
+    """같은 사용자 + 같은 이미지(pHash)의 since 이후 최신 진단 (진단 결과 캐시용)"""
+    result = await db.execute(
+        select(models.Diagnosis)
+        .where(
+            models.Diagnosis.user_id == user_id,
+            models.Diagnosis.image_hash == image_hash,
+            models.Diagnosis.created_at >= since,
+        )
+        .order_by(models.Diagnosis.created_at.desc())
+        .limit(1)
+    )
+    return result.scalars().first()
+
+async def get_diagnosis_for_user(db: AsyncSession, diag_id: int, user_id: int) -> Optional[models.Diagnosis]:
+    result = await db.execute(
+        select(models.Diagnosis).where(
+            models.Diagnosis.id == diag_id,
+            models.Diagnosis.user_id == user_id,
+        )
+    )
+    return result.scalars().first()
+
+# --- Chat ---
+
+async def get_chat_thread(db: AsyncSession, thread_id: int, user_id: int) -> Optional[models.ChatThread]:
+    result = await db.execute(
+        select(models.ChatThread).where(
+            models.ChatThread.id == thread_id,
+            models.ChatThread.user_id == user_id,
+        )
+    )
+    return result.scalars().first()
+
+async def get_recent_chat_messages(
+    db: AsyncSession, thread_id: int, after_id: Optional[int], limit: int
+) -> List[models.ChatMessage]:
+    """최신 → 과거 순으로 최대 limit개 (after_id 이하 = 이미 요약된 메시지는 제외)"""
+    stmt = select(models.ChatMessage).where(models.ChatMessage.thread_id == thread_id)
+    if after_id:
+        stmt = stmt.where(models.ChatMessage.id > after_id)
+    result = await db.execute(stmt.order_by(models.ChatMessage.id.desc()).limit(limit))
+    return list(result.scalars().all())
+
+async def get_unsummarized_chat_messages(
+    db: AsyncSession, thread_id: int, after_id: Optional[int], limit: int
+) -> List[models.ChatMessage]:
+    """과거 → 최신 순으로 after_id 이후 메시지 최대 limit개 (롤링 요약 대상)"""
+    stmt = select(models.ChatMessage).where(models.ChatMessage.thread_id == thread_id)
+    if after_id:
+        stmt = stmt.where(models.ChatMessage.id > after_id)
+    result = await db.execute(stmt.order_by(models.ChatMessage.id.asc()).limit(limit))
+    return list(result.scalars().all())
+
+async def record_chat_message(db: AsyncSession, message: models.ChatMessage) -> None:
+    """crud.record_chat_message와 동일: 스레드 요약 컬럼 갱신 (commit은 호출자가)"""
+    Thread = models.ChatThread
+    await db.execute(
+        update(Thread)
+        .where(Thread.id == message.thread_id)
+        .values(
+            message_count=Thread.message_count + 1,
+            last_message_id=message.id,
+            last_message_preview=(message.content or "")[:CHAT_PREVIEW_MAX_CHARS],
+            last_message_at=func.now(),
+        )
+        .execution_options(synchronize_session=False)
+    )
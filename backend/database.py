@@ -1,9 +1,138 @@
+import threading
+import time
+from typing import Any, Dict, Optional
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
 from core.config import settings
 
-engine = create_engine(settings.DB_URL)
+# --- 커넥션 풀 계측 ---
+# 한 프로세스 안의 모든 엔진은 create_db_engine()으로만 만들고, 풀별 대기 시간/사용량을 여기 모읍니다.
+# (GET /admin/ops/db-pool 에서 조회)
+class PoolMetrics:
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+
+    def record(self, wait_ms: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total_ms += wait_ms
+            self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": round(self.wait_total_ms / attempts, 3) if attempts else 0.0,
+                "wait_max_ms": round(self.wait_max_ms, 3),
+            }
+
+_pool_metrics: Dict[str, PoolMetrics] = {}
+_engines: Dict[str, Any] = {}
+
+class _InstrumentedPoolMixin:
+    """풀에서 커넥션을 꺼낼 때(대기 포함) 걸린 시간을 PoolMetrics에 기록"""
+    _metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        t0 = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except Exception:
+            if self._metrics is not None:
+                self._metrics.record((time.perf_counter() - t0) * 1000, timed_out=True)
+            raise
+        if self._metrics is not None:
+            self._metrics.record((time.perf_counter() - t0) * 1000)
+        return conn
+
+    def recreate(self):
+        # engine.dispose() 등으로 풀이 다시 만들어져도 같은 지표를 이어서 기록
+        new_pool = super().recreate()
+        new_pool._metrics = self._metrics
+        return new_pool
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+def _pool_kwargs(url) -> Dict[str, Any]:
+    kwargs: Dict[str, Any] = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    # SQLite(로컬/테스트)는 기본 풀을 그대로 사용
+    if make_url(url).get_backend_name() != "sqlite":
+        kwargs.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+    return kwargs
+
+def _register(name: str, engine):
+    pool = engine.pool
+    if isinstance(pool, _InstrumentedPoolMixin):
+        pool._metrics = _pool_metrics.setdefault(name, PoolMetrics(name))
+    _engines[name] = engine
+    return engine
+
+def create_db_engine(name: str = "default", url: Optional[str] = None, **overrides):
+    """
+    프로세스 공용 엔진 팩토리. 풀 설정(DB_POOL_*)과 계측을 일괄 적용합니다.
+    새 엔진을 직접 create_engine()으로 만들지 말고 이 함수를 쓰거나 database.engine을 재사용하세요.
+    """
+    url = url or settings.DB_URL
+    kwargs = _pool_kwargs(url)
+    if "pool_size" in kwargs:
+        kwargs["poolclass"] = InstrumentedQueuePool
+    kwargs.update(overrides)
+    return _register(name, create_engine(url, **kwargs))
+
+def create_async_db_engine(name: str = "async", url: Optional[str] = None, **overrides):
+    url = url or async_db_url()
+    kwargs = _pool_kwargs(url)
+    if "pool_size" in kwargs:
+        kwargs["poolclass"] = InstrumentedAsyncQueuePool
+    kwargs.update(overrides)
+    async_engine = create_async_engine(url, **kwargs)
+    _register(name, async_engine.sync_engine)
+    return async_engine
+
+def pool_status() -> Dict[str, Any]:
+    """풀별 현재 사용량 + 누적 대기 지표"""
+    result: Dict[str, Any] = {}
+    for name, eng in _engines.items():
+        pool = eng.pool
+        info: Dict[str, Any] = {"pool": type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            info.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=pool.overflow(),
+                max_overflow=pool._max_overflow,
+            )
+        if name in _pool_metrics:
+            info.update(_pool_metrics[name].snapshot())
+        result[name] = info
+    return result
+
+engine = create_db_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base() # Base는 여기에 한번만 정의합니다.
 
@@ -12,4 +141,43 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# --- 비동기(async def) 라우터용 엔진/세션 ---
+# 동기 Session을 async 핸들러에서 쓰면 쿼리마다 이벤트 루프가 멈추므로 별도 async 드라이버를 사용합니다.
+# 스케줄러/스크립트가 async 드라이버 없이도 database를 import할 수 있도록 처음 사용할 때 생성합니다.
+_ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+}
+_async_engine = None
+_async_sessionmaker = None
+
+def async_db_url() -> str:
+    """ASYNC_DB_URL이 있으면 그대로, 없으면 DB_URL의 드라이버만 async 드라이버로 바꿔서 사용"""
+    if settings.ASYNC_DB_URL:
+        return settings.ASYNC_DB_URL
+    url = make_url(settings.DB_URL)
+    driver = _ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver:
+        url = url.set(drivername=driver)
+    return url.render_as_string(hide_password=False)
+
+def get_async_engine():
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_db_engine()
+    return _async_engine
+
+def get_async_sessionmaker() -> async_sessionmaker:
+    global _async_sessionmaker
+    if _async_sessionmaker is None:
+        # expire_on_commit=False: commit 후 속성 접근 시 암묵적 lazy load(=await 불가) 방지
+        _async_sessionmaker = async_sessionmaker(
+            bind=get_async_engine(), autoflush=False, expire_on_commit=False
+        )
+    return _async_sessionmaker
+
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        yield db
@@ -7,24 +7,35 @@ from sqlalchemy.orm import Session
 
 import crud, database, models
 from core import security
+from services import auth_cache
 
 # tokenUrl은 실제 토큰을 발급해주는 API의 주소를 가리킵니다.
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(database.get_db)):
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(database.get_db)) -> auth_cache.Principal:
     """
     요청 헤더의 토큰을 검증하고, 유효하다면 현재 로그인된 사용자 정보를 반환합니다.
     이 함수를 통과하지 못하면 API가 실행되지 않습니다.
+    같은 토큰의 반복 요청은 프로세스 캐시(services/auth_cache.py)에서 바로 응답하므로
+    JWT 디코딩과 users 테이블 조회가 생략됩니다. 반환값은 ORM 객체가 아닌 스냅샷(Principal)입니다.
     """
+    principal = auth_cache.get(token)
+    if principal is not None:
+        return principal
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    email = security.verify_token(token)
+    payload = security.decode_token(token)
+    email = payload.get("sub") if payload else None
     if email is None:
         raise credentials_exception
+    seen_generation = auth_cache.generation()
     user = crud.get_user_by_email(db, email=email)
     if user is None:
         raise credentials_exception
-    return user
\ No newline at end of file
+    principal = auth_cache.Principal.from_user(user)
+    auth_cache.put(token, principal, expires_at=payload.get("exp"), seen_generation=seen_generation)
+    return principal
\ No newline at end of file
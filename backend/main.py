@@ -5,6 +5,7 @@ from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 import models
 import database
+from services import autocomplete, catalog, fuzzy, ml_artifacts
 from routers import auth, plants, recommendations, identify, encyclopedia, diagnose_v2, diagnose_v3, media, remedy, admin,chat,diary,community,diagnose_llm
 
 
@@ -36,6 +37,19 @@ app.include_router(community.router)
 app.include_router(diagnose_llm.router)
 
 
+@app.on_event("startup")
+def load_catalog():
+    # 도감을 메모리에 올리고, 이후 버전 변경만 백그라운드에서 확인
+    catalog.load()
+    catalog.start_refresher()
+    # 자동완성 접두사 배열 / 오타 교정 사전도 미리 만들어 둠 (이후 카탈로그가 바뀌면 다음 요청에서 다시 만듦)
+    autocomplete.warm()
+    fuzzy.warm()
+    # ML 추천 번들을 로드(조회 테이블까지 미리 계산)하고, 새 번들이 활성화되면 재시작 없이 교체
+    ml_artifacts.reload()
+    ml_artifacts.start_watcher()
+
+
 @app.get("/")
 def read_root():
     return {"message": "Welcome to Green Day API Server"}
\ No newline at end of file
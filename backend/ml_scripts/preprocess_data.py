@@ -1,6 +1,5 @@
 import os
 import pandas as pd
-from sqlalchemy import create_engine
 from sklearn.preprocessing import OneHotEncoder
 import sys, joblib
 
@@ -8,6 +7,7 @@ import sys, joblib
 # 경로가 맞지 않으면 '..' 등을 추가하여 상위 폴더를 참조해야 할 수 있습니다.
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from core.config import settings
+from database import engine
 
 DATABASE_URL = settings.DB_URL
 
@@ -20,7 +20,6 @@ def preprocess_plant_data():
         raise ValueError("DB_URL이 .env 파일에 설정되지 않았습니다.")
         
     print("DB에서 식물 데이터를 로드합니다...")
-    engine = create_engine(DATABASE_URL)
     
     # pandas를 이용해 plants_master 테이블 전체를 DataFrame으로 읽어옵니다.
     df = pd.read_sql("SELECT id, name_ko, difficulty, light_requirement, pet_safe FROM plants_master", engine)
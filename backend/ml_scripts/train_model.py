@@ -3,6 +3,11 @@ from sklearn.cluster import KMeans
 import matplotlib.pyplot as plt
 import joblib
 import json
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from services.ml_artifacts import publish_bundle
 
 def train_clustering_model():
     """
@@ -65,6 +70,17 @@ def train_clustering_model():
         json.dump(cluster_map, f, ensure_ascii=False, indent=4)
     print(f"클러스터 맵이 '{map_path}' 파일로 저장되었습니다.")
     
+    # (3) 인코더와 함께 버전 번들로 발행 → 실행 중인 API 워커들이 재시작 없이 새 모델로 교체
+    version = publish_bundle(
+        {
+            "model": model_path,
+            "encoder": "ml_scripts/plant_encoder.joblib",
+            "cluster_map": map_path,
+        },
+        metadata={"k": optimal_k, "n_plants": len(df)},
+    )
+    print(f"모델 번들 '{version}'을 발행하고 활성 버전으로 지정했습니다.")
+
     print("-" * 50)
     print("✅ 모델 학습이 완료되었습니다.")
     print("클러스터별 식물 개수:")
@@ -0,0 +1,168 @@
+"""
+ML 추천 모델 학습 파이프라인 (추출 → K 선택 → 학습 → 번들 발행)
+
+preprocess_data.py + train_model.py를 대체하는 CLI입니다.
+1. plants_master를 id 키셋으로 chunk-size행씩 읽어 특성 행렬을 채웁니다. (pandas.read_sql 없이)
+   특성 = [pet_safe] + one-hot(difficulty) + one-hot(light_requirement)
+2. 특성은 범주형이라 서로 다른 행이 최대 18개뿐이므로, 고유 행 + 개수(sample_weight)로 압축해 학습합니다.
+3. 후보 K들을 joblib으로 병렬 학습(MiniBatchKMeans)하고, 표본 실루엣 점수가 가장 높은 K를 고릅니다.
+   (점수가 비슷하면 작은 K — 실루엣 차이가 --tolerance 이내)
+4. 모델 / 인코더 / cluster_map을 버전 번들로 발행하고 활성 버전으로 지정합니다. (services/ml_artifacts.py)
+
+사용법 (backend 디렉터리에서):
+  python ml_scripts/train_pipeline.py
+  python ml_scripts/train_pipeline.py --k-min 2 --k-max 12 --n-jobs 4 --no-activate
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+import joblib
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.metrics import silhouette_score
+from sklearn.preprocessing import OneHotEncoder
+from sqlalchemy import select
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import models
+from database import SessionLocal
+from services.ml_artifacts import BUNDLE_FILES, publish_bundle
+from services.recommender import DIFFICULTY_CODES, LIGHT_CODES
+
+# 인코더 범주 (OneHotEncoder를 데이터로 fit했을 때와 같은 정렬 순서)
+CATEGORIES = [sorted(DIFFICULTY_CODES), sorted(LIGHT_CODES)]
+
+
+def build_encoder() -> OneHotEncoder:
+    encoder = OneHotEncoder(categories=CATEGORIES, sparse_output=False, handle_unknown="ignore")
+    encoder.fit(np.array([[CATEGORIES[0][0], CATEGORIES[1][0]]], dtype=object))
+    return encoder
+
+
+def extract_features(chunk_size: int):
+    """(식물 id 배열, 특성 행렬) — 도감을 id 순으로 chunk_size행씩 읽음"""
+    difficulty_index = {c: i for i, c in enumerate(CATEGORIES[0])}
+    light_index = {c: i for i, c in enumerate(CATEGORIES[1])}
+    width = 1 + len(CATEGORIES[0]) + len(CATEGORIES[1])
+
+    ids, blocks = [], []
+    last_id = 0
+    with SessionLocal() as db:
+        while True:
+            rows = db.execute(
+                select(models.PlantMaster.id, models.PlantMaster.difficulty,
+                       models.PlantMaster.light_requirement, models.PlantMaster.pet_safe)
+                .where(models.PlantMaster.id > last_id)
+                .order_by(models.PlantMaster.id)
+                .limit(chunk_size)
+            ).all()
+            if not rows:
+                break
+            block = np.zeros((len(rows), width), dtype=np.float32)
+            for r, (plant_id, difficulty, light, pet_safe) in enumerate(rows):
+                block[r, 0] = 1.0 if pet_safe else 0.0
+                if difficulty in difficulty_index:
+                    block[r, 1 + difficulty_index[difficulty]] = 1.0
+                if light in light_index:
+                    block[r, 1 + len(CATEGORIES[0]) + light_index[light]] = 1.0
+                ids.append(plant_id)
+            blocks.append(block)
+            last_id = rows[-1][0]
+            print(f"  - {len(ids):,}행 추출 (마지막 id={last_id})")
+
+    features = np.vstack(blocks) if blocks else np.zeros((0, width), dtype=np.float32)
+    return np.array(ids, dtype=np.int64), features
+
+
+def fit_candidate(unique, counts, sample, k: int, seed: int, batch_size: int):
+    """K 하나 학습 + 평가 (joblib 작업 단위)"""
+    model = MiniBatchKMeans(n_clusters=k, random_state=seed, batch_size=batch_size, n_init=3)
+    model.fit(unique, sample_weight=counts)
+    labels = model.predict(sample)
+    silhouette = silhouette_score(sample, labels) if 1 < len(set(labels)) < len(sample) else -1.0
+    return k, model, float(silhouette), float(model.inertia_)
+
+
+def choose_k(results, tolerance: float):
+    """실루엣이 최고점과 tolerance 이내인 K 중 가장 작은 값"""
+    best = max(silhouette for _, _, silhouette, _ in results)
+    for k, model, silhouette, _ in sorted(results, key=lambda r: r[0]):
+        if silhouette >= best - tolerance:
+            return k, model
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ML 추천 모델 학습 파이프라인")
+    parser.add_argument("--k-min", type=int, default=2)
+    parser.add_argument("--k-max", type=int, default=10)
+    parser.add_argument("--tolerance", type=float, default=0.01, help="이 차이 이내의 실루엣이면 작은 K 선택")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="후보 K 병렬 학습 프로세스 수 (-1 = 모든 코어)")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="도감 추출 단위 (행)")
+    parser.add_argument("--batch-size", type=int, default=1024, help="MiniBatchKMeans 미니배치 크기")
+    parser.add_argument("--sample-size", type=int, default=10000, help="실루엣 점수 계산에 쓸 표본 수")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-activate", action="store_true", help="번들만 발행하고 CURRENT는 바꾸지 않음")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    print("도감 특성을 추출합니다...")
+    plant_ids, features = extract_features(args.chunk_size)
+    if len(plant_ids) == 0:
+        print("도감 데이터가 없습니다.")
+        return
+
+    unique, inverse, counts = np.unique(features, axis=0, return_inverse=True, return_counts=True)
+    inverse = inverse.reshape(-1)
+    rng = np.random.default_rng(args.seed)
+    sample = features[rng.choice(len(features), size=min(args.sample_size, len(features)), replace=False)]
+    print(f"  - {len(features):,}행 → 고유 특성 {len(unique)}개")
+
+    # 고유 특성 수보다 많은 클러스터는 의미가 없으므로 후보에서 제외
+    candidates = [k for k in range(args.k_min, args.k_max + 1) if k <= len(unique)] or [min(len(unique), args.k_min)]
+    print(f"후보 K {candidates}를 병렬 학습합니다...")
+    results = Parallel(n_jobs=args.n_jobs)(
+        delayed(fit_candidate)(unique, counts, sample, k, args.seed, args.batch_size) for k in candidates
+    )
+    for k, _, silhouette, inertia in sorted(results, key=lambda r: r[0]):
+        print(f"  - K={k}: 실루엣 {silhouette:.4f}, inertia {inertia:.1f}")
+    k, model = choose_k(results, args.tolerance)
+    print(f"K={k}를 선택했습니다.")
+
+    # 식물별 클러스터 = 고유 특성 행의 클러스터
+    unique_labels = model.predict(unique)
+    cluster_map = defaultdict(list)
+    for plant_id, label in zip(plant_ids.tolist(), unique_labels[inverse].tolist()):
+        cluster_map[str(label)].append(plant_id)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {role: os.path.join(tmp, name) for role, name in BUNDLE_FILES.items()}
+        joblib.dump(model, paths["model"])
+        joblib.dump(build_encoder(), paths["encoder"])
+        with open(paths["cluster_map"], "w", encoding="utf-8") as f:
+            json.dump(cluster_map, f, ensure_ascii=False, indent=4)
+        version = publish_bundle(
+            paths,
+            metadata={
+                "k": k,
+                "n_plants": len(plant_ids),
+                "candidates": {str(r[0]): {"silhouette": r[2], "inertia": r[3]} for r in results},
+            },
+            make_current=not args.no_activate,
+        )
+
+    print("-" * 50)
+    print(f"✅ 모델 번들 '{version}' 발행 완료 ({time.perf_counter() - t0:.1f}s)")
+    print("클러스터별 식물 개수:", {label: len(ids) for label, ids in sorted(cluster_map.items())})
+    if args.no_activate:
+        print(f"활성화하려면: python scripts/activate_ml_bundle.py {version}")
+    print("-" * 50)
+
+
+if __name__ == "__main__":
+    main()
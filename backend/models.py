@@ -1,7 +1,7 @@
 from datetime import datetime
 from sqlalchemy import (
     Column, Integer, String, Boolean, TIMESTAMP, ForeignKey, func,
-    Text, Enum, JSON, BigInteger, DateTime, Index, Numeric, Date
+    Text, Enum, JSON, BigInteger, DateTime, Index, Numeric, Date, SmallInteger, UniqueConstraint, Float
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.mysql import LONGBLOB, MEDIUMBLOB, BIGINT as MYSQL_BIGINT
@@ -45,9 +45,19 @@ class Plant(Base):
     is_notification_enabled = Column(Boolean, nullable=False, default=True)
     notification_time = Column(String(5), nullable=True, default="09:00")
     notification_snoozed_until = Column(Date, nullable=True)
+    # 물주기 예정일 (마지막 물 준 날 + 주기, 미루기 반영). services/watering.py 참고
+    next_watering_at = Column(Date, nullable=True)
+    # notification_time(HH:MM, Asia/Seoul)을 하루 중 분(0~1439)으로 저장. 분 단위 스케줄러의 버킷 키
+    notification_minute = Column(SmallInteger, nullable=False, default=540, server_default="540")
 
     diaries = relationship("Diary", back_populates="plant", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index("idx_plants_notify_bucket", "is_notification_enabled", "next_watering_at", "notification_minute"), # 스케줄러 분 단위 버킷 조회
+        Index("idx_plants_owner_next", "owner_id", "next_watering_at"), # 사용자별 물주기 예정 목록
+        Index("idx_plants_owner_master", "owner_id", "plant_master_id"), # 함께 키우는 식물 집계 (사용자 구간별 스캔)
+    )
+
 class PlantMaster(Base):
     __tablename__ = "plants_master"
 
@@ -65,6 +75,10 @@ class PlantMaster(Base):
     tags = Column(JSON, nullable=True)
     created_at = Column(TIMESTAMP, server_default=func.now())
 
+    __table_args__ = (
+        Index("idx_plants_master_name_ko", "name_ko"), # 도감 이름순 커서 페이지네이션
+    )
+
 # ==============================================================================
 # Asset & Diagnosis Models
 # ==============================================================================
@@ -139,10 +153,23 @@ class ChatThread(Base):
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     title = Column(String(120), nullable=True)
+    # 롤링 요약: summary_upto_id 이하의 메시지는 summary 한 덩어리로 압축되어 프롬프트에 들어감
+    summary = Column(Text, nullable=True)
+    summary_upto_id = Column(BigInteger, nullable=True)
+    # 목록 조회용 비정규화 컬럼 (메시지 INSERT 시 같은 트랜잭션에서 갱신, scripts/backfill_chat_threads.py로 재계산)
+    message_count = Column(Integer, nullable=False, default=0, server_default="0")
+    last_message_id = Column(BigInteger, nullable=True)
+    last_message_preview = Column(String(200), nullable=True)
+    last_message_at = Column(DateTime, nullable=True)
     # ★ 기본값 추가(없어서 1364 에러 발생했었음)
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
 
+    __table_args__ = (
+        # /chat/threads: WHERE user_id=? ORDER BY updated_at DESC → 인덱스 범위 스캔 1회
+        Index("idx_chat_threads_user_updated", "user_id", "updated_at"),
+    )
+
 class ChatMessage(Base):
     __tablename__ = "chat_messages"
     id = Column(BigInteger, primary_key=True, autoincrement=True)
@@ -186,6 +213,11 @@ class Diary(Base):
 
     plant = relationship("Plant", back_populates="diaries")
 
+    __table_args__ = (
+        # 식물별 타임라인 커서 페이지네이션 (plant_id, created_at DESC, id DESC)
+        Index("idx_diaries_plant_created", "plant_id", "created_at", "id"),
+    )
+
 # ==============================================================================
 # Community Models (게시판 기능)
 # ==============================================================================
@@ -206,6 +238,10 @@ class Post(Base):
     # Post 객체에서 .comments로 댓글 목록 접근 (게시글 삭제 시 댓글도 자동 삭제)
     comments = relationship("Comment", back_populates="post", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index("idx_posts_created", "created_at", "id"), # 최신순 커서 페이지네이션
+    )
+
 class Comment(Base):
     __tablename__ = "comments"
 
@@ -220,4 +256,82 @@ class Comment(Base):
     # Comment 객체에서 .owner로 작성자 User 정보 접근
     owner = relationship("User")
     # Comment 객체에서 .post로 부모 Post 정보 접근
-    post = relationship("Post", back_populates="comments")
\ No newline at end of file
+    post = relationship("Post", back_populates="comments")
+
+    __table_args__ = (
+        Index("idx_comments_post_created", "post_id", "created_at", "id"), # 게시글별 댓글 커서 페이지네이션
+    )
+
+# --- ⬇️ 알림 스케줄러 분산 실행 ⬇️ ---
+class SchedulerLease(Base):
+    """파티션별 실행 권한(리스). 만료 전까지 owner 워커만 해당 파티션을 처리합니다."""
+    __tablename__ = "scheduler_leases"
+
+    name = Column(String(100), primary_key=True) # 예: "watering:4:0" (잡:파티션 수:파티션 번호)
+    owner = Column(String(100), nullable=False)  # 워커 ID (호스트명-pid)
+    expires_at = Column(DateTime, nullable=False)
+
+class SchedulerRun(Base):
+    """(날짜, 알림 분 버킷, 파티션)별 처리 진행 상황. 워커가 죽으면 다음 리스 보유자가 last_owner_id부터 이어서 처리"""
+    __tablename__ = "scheduler_runs"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    job = Column(String(50), nullable=False)
+    run_date = Column(Date, nullable=False)
+    minute = Column(SmallInteger, nullable=False)        # 하루 중 분 (notification_minute 버킷)
+    partition_count = Column(SmallInteger, nullable=False)
+    partition_no = Column(SmallInteger, nullable=False)
+    status = Column(Enum('running', 'done', name='scheduler_run_status'), nullable=False, default='running')
+    worker_id = Column(String(100), nullable=True)
+    last_owner_id = Column(Integer, nullable=False, default=0) # 이 사용자까지 발송 완료
+    users_notified = Column(Integer, nullable=False, default=0)
+    sent = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    started_at = Column(DateTime, server_default=func.now())
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint("job", "run_date", "minute", "partition_count", "partition_no", name="uq_scheduler_runs_bucket"),
+    )
+
+# --- ⬇️ 발송 아웃박스 (이메일/푸시) ⬇️ ---
+class OutboxMessage(Base):
+    """
+    발송할 이메일/푸시를 도메인 변경과 같은 트랜잭션에 기록해 두는 테이블.
+    outbox_worker.py가 available_at이 지난 pending 행을 가져가(FOR UPDATE SKIP LOCKED) 발송합니다.
+    """
+    __tablename__ = "outbox_messages"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    channel = Column(Enum('email', 'push', name='outbox_channel'), nullable=False)
+    payload = Column(JSON, nullable=False) # email: {to, subject, html} / push: {token, title, body, user_id, data}
+    status = Column(Enum('pending', 'sent', 'failed', name='outbox_status'), nullable=False, default='pending')
+    attempts = Column(Integer, nullable=False, default=0)
+    available_at = Column(DateTime, nullable=False) # 이 시각 이후 발송 가능 (가져간 워커의 처리 기한 / 재시도 백오프)
+    claimed_by = Column(String(100), nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    sent_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("idx_outbox_status_available", "status", "available_at", "id"),
+    )
+
+# --- ⬇️ 인메모리 카탈로그 버전 ⬇️ ---
+class CatalogVersion(Base):
+    """도감처럼 프로세스 메모리에 캐시하는 데이터의 버전. 변경 시 +1 → 각 프로세스가 감지해 다시 읽습니다."""
+    __tablename__ = "catalog_versions"
+
+    name = Column(String(50), primary_key=True) # 예: "plants_master"
+    version = Column(BigInteger, nullable=False, default=0)
+
+# --- ⬇️ 함께 키우는 식물 (아이템-아이템 추천) ⬇️ ---
+class PlantSimilarity(Base):
+    """scripts/build_similar_plants.py가 계산한 도감 식물별 유사 식물 상위 N개 (전체 교체)"""
+    __tablename__ = "plant_similarities"
+
+    plant_master_id = Column(Integer, ForeignKey("plants_master.id", ondelete="CASCADE"), primary_key=True)
+    rank = Column(SmallInteger, primary_key=True)  # 1부터 (점수 내림차순)
+    similar_master_id = Column(Integer, ForeignKey("plants_master.id", ondelete="CASCADE"), nullable=False)
+    score = Column(Float, nullable=False)           # 코사인 유사도 (함께 키우는 사용자 수 / sqrt(각 식물 사용자 수 곱))
+    co_owners = Column(Integer, nullable=False)     # 두 식물을 모두 키우는 사용자 수
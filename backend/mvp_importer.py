@@ -18,9 +18,12 @@ from typing import Dict, Any, List, Optional
 
 import httpx
 from dotenv import load_dotenv
-from sqlalchemy import create_engine, select
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from models import PlantMaster, Base # models.py에서 직접 import
+from database import engine # 공용 엔진 (풀 설정 일괄 적용)
+from services.catalog import bump_version
+from services import search_index
 
 # ------------------------- 환경설정 -------------------------
 load_dotenv()
@@ -108,7 +111,6 @@ def generate_one_liner_ko(data: Dict[str, Any]) -> str:
 # ------------------------- MAIN 로직 -------------------------
 def run(dry_run: bool = False):
     if not DATABASE_URL: raise RuntimeError(".env 파일에 DB_URL이 설정되어야 합니다.")
-    engine = create_engine(DATABASE_URL)
     Base.metadata.create_all(engine)
 
     initial_plants = fetch_manual_species_list_from_csv()
@@ -116,6 +118,7 @@ def run(dry_run: bool = False):
     logger.info(f"CSV 파일에서 {len(initial_plants)}개의 식물을 로드했습니다.")
 
     with Session(engine) as session:
+        touched: List[PlantMaster] = [] # 검색 인덱스에 반영할 식물
         for plant_data in initial_plants:
             species = plant_data["species"]
             logger.info(f"--- {species} ({plant_data['name_ko']}) 처리 중 ---")
@@ -152,9 +155,12 @@ def run(dry_run: bool = False):
                 # final_row에서 description과 created_at을 제외한 모든 키를 업데이트
                 update_data = {k: v for k, v in final_row.items() if k not in ['created_at']}
                 for key, value in update_data.items(): setattr(existing, key, value)
+                touched.append(existing)
             else:
                 logger.info(f"[INSERT] {species}")
-                session.add(PlantMaster(**final_row))
+                new_plant = PlantMaster(**final_row)
+                session.add(new_plant)
+                touched.append(new_plant)
             
             time.sleep(1) # API Rate Limit 회피를 위한 대기
 
@@ -162,8 +168,14 @@ def run(dry_run: bool = False):
             session.rollback()
             logger.info("Dry-run 모드입니다. DB 변경사항을 롤백했습니다.")
         else:
+            bump_version(session) # 실행 중인 API 서버들이 도감 카탈로그를 다시 읽도록
             session.commit()
             logger.info(f"{len(initial_plants)}개의 식물 데이터가 DB에 저장되었습니다.")
+            # 바뀐 식물만 검색 인덱스에 반영 (전체 재빌드 불필요)
+            ix = search_index.open_index()
+            if ix is not None and touched:
+                search_index.apply_changes(ix, [search_index.plant_document(p) for p in touched])
+                logger.info(f"검색 인덱스에 {len(touched)}개 문서를 반영했습니다.")
 
 # ------------------------- CLI -------------------------
 if __name__ == "__main__":
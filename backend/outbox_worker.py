@@ -0,0 +1,160 @@
+"""
+발송 아웃박스 워커 (API 서버/스케줄러와 별도 프로세스로 실행)
+
+outbox_messages에서 발송 가능한 행을 배치로 가져가(FOR UPDATE SKIP LOCKED) 이메일/푸시를 보냅니다.
+- 이메일: SMTP 연결 OUTBOX_SMTP_CONCURRENCY개를 유지하며 동시에 발송, 한 건 보낼 때마다 바로 sent로 확정
+- 푸시: PushDispatcher로 FCM 배치(send_each) + 동시 발송
+- 처리하는 동안 아직 끝나지 않은 행의 리스를 주기적으로 연장 (느린 배치 도중 다른 워커가 다시 가져가지 않도록)
+- DB 쓰기는 건마다 짧은 세션으로 스레드에서 실행 (이벤트 루프를 막지 않고, 코루틴끼리 트랜잭션을 섞지 않음)
+여러 개를 띄우면 처리량이 늘어나며, 같은 행을 두 워커가 동시에 보내지 않습니다.
+
+사용법: python outbox_worker.py
+"""
+import asyncio
+import os
+import signal
+import socket
+from datetime import datetime
+
+import crud
+from core.config import settings
+from database import SessionLocal
+from services import outbox
+from services.mailer import SmtpPool, is_permanent_smtp_error
+from services.push_sender import PushDispatcher, PushMessage, SENT, UNREGISTERED, RETRY
+
+WORKER_ID = f"outbox-{socket.gethostname()}-{os.getpid()}"
+
+
+def _write(fn, *args):
+    """짧은 세션 하나로 fn(db, *args)를 실행하고 commit (워커 스레드에서 실행)"""
+    with SessionLocal() as db:
+        result = fn(db, *args)
+        db.commit()
+        return result
+
+
+async def write(fn, *args):
+    """
+    DB 쓰기는 모두 이 함수로: 스레드에서 자기 세션으로 실행하므로
+    - 동기 DB I/O가 이벤트 루프를 막지 않음 (그동안 다른 SMTP 발송은 계속 진행)
+    - 동시에 도는 코루틴끼리 세션/트랜잭션을 공유하지 않음 (한 commit이 다른 쓰기를 함께 확정하지 않음)
+    """
+    return await asyncio.to_thread(_write, fn, *args)
+
+
+async def send_emails(messages, smtp: SmtpPool, inflight: set):
+    async def send_one(message):
+        payload = message.payload
+        try:
+            await smtp.send(payload["to"], payload["subject"], payload["html"])
+        except Exception as e:
+            await write(outbox.mark_failed, message, f"{type(e).__name__}: {e}", not is_permanent_smtp_error(e))
+            sent = False
+        else:
+            # 한 건씩 바로 확정 → 배치 도중 워커가 죽어도 이미 보낸 메일은 다시 보내지 않음
+            await write(outbox.mark_sent, [message.id])
+            sent = True
+        inflight.discard(message.id)
+        return sent
+
+    # 동시 발송 수는 SmtpPool의 연결 수로 제한됨
+    results = await asyncio.gather(*(send_one(m) for m in messages))
+    return sum(results)
+
+
+def record_push_results(db, messages, statuses):
+    """FCM 결과를 한 트랜잭션으로 기록 (commit은 호출자가)"""
+    sent_ids = []
+    for message, status in zip(messages, statuses):
+        if status == SENT:
+            sent_ids.append(message.id)
+        elif status == UNREGISTERED:
+            outbox.mark_failed(db, message, "UNREGISTERED", retryable=False)
+        else:
+            outbox.mark_failed(db, message, f"FCM {status}", retryable=(status == RETRY))
+    outbox.mark_sent(db, sent_ids)
+    return len(sent_ids)
+
+
+async def send_pushes(messages, dispatcher: PushDispatcher, inflight: set):
+    if not messages:
+        return 0, []
+    push_messages = [
+        PushMessage(
+            token=m.payload["token"],
+            title=m.payload["title"],
+            body=m.payload["body"],
+            user_id=m.payload.get("user_id"),
+            data=m.payload.get("data"),
+        )
+        for m in messages
+    ]
+    # FCM 호출은 블로킹이므로 스레드에서 실행 (그동안 이메일 발송은 계속 진행)
+    report = await asyncio.to_thread(dispatcher.dispatch, push_messages)
+    sent = await write(record_push_results, messages, report.statuses)
+    inflight.difference_update(m.id for m in messages)
+    return sent, report.unregistered_tokens
+
+
+async def keep_leases(inflight: set):
+    """OUTBOX_LEASE_SECONDS의 1/3마다 아직 처리 중인 행의 리스를 연장 (process_batch가 끝나면 취소됨)"""
+    while True:
+        await asyncio.sleep(settings.OUTBOX_LEASE_SECONDS / 3)
+        if inflight:
+            await write(outbox.extend_lease, list(inflight), WORKER_ID)
+
+
+async def process_batch(batch, smtp: SmtpPool, dispatcher: PushDispatcher):
+    """batch: claim_batch가 돌려준 ClaimedMessage (세션과 분리된 값이므로 읽을 때 DB 조회 없음)"""
+    emails = [m for m in batch if m.channel == outbox.EMAIL]
+    pushes = [m for m in batch if m.channel == outbox.PUSH]
+    inflight = {m.id for m in batch}
+
+    keeper = asyncio.create_task(keep_leases(inflight))
+    try:
+        email_sent, (push_sent, unregistered) = await asyncio.gather(
+            send_emails(emails, smtp, inflight),
+            send_pushes(pushes, dispatcher, inflight),
+        )
+    finally:
+        keeper.cancel()
+    pruned = await write(crud.clear_push_tokens, unregistered)
+    print(f"[{datetime.now()}] {len(batch)}건 처리: 이메일 {email_sent}/{len(emails)}, 푸시 {push_sent}/{len(pushes)}, 만료 토큰 정리 {pruned}")
+
+
+async def run_worker(stop: asyncio.Event):
+    smtp = SmtpPool(settings.OUTBOX_SMTP_CONCURRENCY)
+    dispatcher = PushDispatcher()
+    print(f"아웃박스 워커를 시작합니다. ({WORKER_ID}, 배치 {settings.OUTBOX_BATCH_SIZE}건)")
+    try:
+        while not stop.is_set():
+            batch = await write(outbox.claim_batch, WORKER_ID, settings.OUTBOX_BATCH_SIZE)
+            if batch:
+                await process_batch(batch, smtp, dispatcher)
+                continue
+            # 대기열이 비어 있으면 잠시 쉬었다가 다시 확인
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=settings.OUTBOX_POLL_INTERVAL_SEC)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        await smtp.close()
+
+
+def main():
+    loop = asyncio.new_event_loop()
+    stop = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError: # Windows
+            pass
+    try:
+        loop.run_until_complete(run_worker(stop))
+    finally:
+        loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,11 @@ from sqlalchemy.orm import Session
 
 import schemas
 import crud
+import database
 from database import get_db
 from services import importer # ⭐️ services/importer.py를 import
+from services import outbox
+from services import ml_artifacts
 
 router = APIRouter(
     prefix="/admin",
@@ -50,4 +53,62 @@ def add_new_plant_master(
             detail=f"An error occurred while creating the plant: {e}"
         )
 
-    return new_plant
\ No newline at end of file
+    return new_plant
+
+@router.patch(
+    "/plants/{plant_id}/watering-type",
+    response_model=schemas.PlantMasterInfo,
+    summary="식물 도감 물주기 유형 변경",
+    description="PlantMaster의 watering_type을 바꾸고, 해당 종을 키우는 모든 식물의 물주기 예정일을 다시 계산합니다."
+)
+def update_plant_watering_type(
+    plant_id: int,
+    body: schemas.WateringTypeUpdate,
+    db: Session = Depends(get_db)
+):
+    master = crud.update_master_watering_type(db, master_id=plant_id, watering_type=body.watering_type)
+    if not master:
+        raise HTTPException(status_code=404, detail="PlantMaster not found")
+    return master
+
+
+@router.get(
+    "/ops/db-pool",
+    summary="DB 커넥션 풀 상태 조회",
+    description="이 워커 프로세스의 엔진별 풀 사용량(checked_out/overflow)과 커넥션 대기 시간·타임아웃 누적치를 반환합니다."
+)
+def get_db_pool_status():
+    return database.pool_status()
+
+
+@router.get(
+    "/ops/outbox",
+    summary="발송 아웃박스 상태 조회",
+    description="outbox_messages의 상태별(pending/sent/failed) 건수를 반환합니다."
+)
+def get_outbox_status(db: Session = Depends(get_db)):
+    return outbox.stats(db)
+
+
+
+@router.get(
+    "/ml/status",
+    summary="ML 추천 모델 번들 상태 조회",
+    description="이 워커에서 활성화된 번들 버전/manifest와 마지막 로드 오류, 저장된 번들 목록을 반환합니다."
+)
+def get_ml_status():
+    return ml_artifacts.status()
+
+
+
+@router.post(
+    "/ml/reload",
+    summary="ML 추천 모델 번들 다시 로드",
+    description="CURRENT가 가리키는 번들을 이 워커에서 즉시 다시 검증·로드해 재시작 없이 교체합니다. "
+                "활성 버전 변경은 CURRENT로만 합니다. (학습 파이프라인 또는 scripts/activate_ml_bundle.py)"
+)
+def reload_ml_bundle():
+    result = ml_artifacts.reload(force=True)
+    if result["last_error"]:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=result["last_error"])
+    return result
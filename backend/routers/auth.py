@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig
 
-import crud, schemas, models, database
+import crud, schemas, database
 from core import security
-from core.config import settings
+from services import mailer, outbox
+# 토큰 검증 + 현재 사용자 조회는 공용 의존성(캐시 적용)을 사용합니다.
+from dependencies import get_current_user
+from services.auth_cache import Principal
 
 import random  
 import string
@@ -16,25 +18,11 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 # 이 방식을 사용하면 /docs 페이지에서 편리한 자물쇠 UI를 사용할 수 있습니다.
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-# --- 이메일 설정 ---
-conf = ConnectionConfig(
-    MAIL_USERNAME = settings.MAIL_USERNAME,
-    MAIL_PASSWORD = settings.MAIL_PASSWORD,
-    MAIL_FROM = settings.MAIL_FROM,
-    MAIL_PORT = settings.MAIL_PORT,
-    MAIL_SERVER = settings.MAIL_SERVER,
-    MAIL_STARTTLS = settings.MAIL_STARTTLS,
-    MAIL_SSL_TLS = settings.MAIL_SSL_TLS,
-    USE_CREDENTIALS = True
-)
-async def send_verification_code_email(email: str, code: str):
-    html = f"""<p>안녕하세요! Green Day에 오신 것을 환영합니다.</p>
-             <p>계정 인증을 완료하려면 아래 인증번호를 앱에 입력해주세요.</p>
-             <p style="font-size: 24px; font-weight: bold; color: #28a745;">{code}</p>
-             <p>이 인증번호는 10분간 유효합니다.</p>"""
-    message = MessageSchema(subject="[Green Day] 계정 인증번호 안내", recipients=[email], body=html, subtype="html")
-    fm = FastMail(conf)
-    await fm.send_message(message)
+# --- 이메일 발송 ---
+# 메일은 API 워커에서 직접 보내지 않고 아웃박스에 적재합니다. (실제 발송: outbox_worker.py)
+def send_verification_code_email(db: Session, email: str, code: str):
+    subject, html = mailer.render_verification_code_email(code)
+    outbox.enqueue_email(db, to=email, subject=subject, html=html)
 
 #async def send_verification_email(email: str, token: str):
 #    html = f"""<p>안녕하세요! Green Day에 오신 것을 환영합니다.</p>
@@ -47,26 +35,10 @@ async def send_verification_code_email(email: str, code: str):
 #    fm = FastMail(conf)
 #    await fm.send_message(message)
 
-# --- 의존성 함수 (Dependency) ---
-# 이 함수는 토큰을 검증하고, 유효하다면 현재 로그인된 사용자 정보를 반환합니다.
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(database.get_db)):
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    email = security.verify_token(token)
-    if email is None:
-        raise credentials_exception
-    user = crud.get_user_by_email(db, email=email)
-    if user is None:
-        raise credentials_exception
-    return user
-
 # --- API 엔드포인트 ---
 
 @router.post("/signup", status_code=status.HTTP_201_CREATED)
-async def signup(user: schemas.UserCreate, background_tasks: BackgroundTasks, db: Session = Depends(database.get_db)):
+def signup(user: schemas.UserCreate, db: Session = Depends(database.get_db)):
     if crud.get_user_by_email(db, email=user.email):
         raise HTTPException(status_code=409, detail="이미 사용 중인 이메일입니다.")
     if crud.get_user_by_username(db, username=user.username):
@@ -76,10 +48,9 @@ async def signup(user: schemas.UserCreate, background_tasks: BackgroundTasks, db
     
     # --- ⬇️ 토큰 생성 대신 인증번호 생성 및 저장 로직으로 변경 ⬇️ ---
     verification_code = "".join(random.choices(string.digits, k=6)) # 6자리 숫자 코드 생성
+    # 인증 메일을 아웃박스에 적재 → set_verification_code의 commit에 코드 저장과 함께 반영됨
+    send_verification_code_email(db, created_user.email, verification_code)
     crud.set_verification_code(db=db, user_id=created_user.id, code=verification_code) # DB에 코드 저장
-    
-    # 이메일 발송 함수 호출 (변경된 함수 이름 사용)
-    background_tasks.add_task(send_verification_code_email, created_user.email, verification_code)
     # --- ⬆️ 변경 완료 ⬆️ ---
     
     return {"message": "회원가입이 완료되었습니다. 이메일로 발송된 인증번호를 확인해주세요.", "userId": created_user.id}
@@ -125,7 +96,7 @@ def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db:
 
 # --- 로그인 필수 API 예시 ---
 @router.get("/users/me", response_model=schemas.UserInfo)
-def read_users_me(current_user: models.User = Depends(get_current_user)):
+def read_users_me(current_user: Principal = Depends(get_current_user)):
     """
     ### 내 정보 조회 (로그인 필요)
     - **설명**: 현재 로그인된 사용자의 정보를 반환합니다.
@@ -134,7 +105,7 @@ def read_users_me(current_user: models.User = Depends(get_current_user)):
     return current_user
 
 @router.post("/forgot-password", status_code=status.HTTP_200_OK)
-async def forgot_password(request: schemas.ForgotPasswordRequest, background_tasks: BackgroundTasks, db: Session = Depends(database.get_db)):
+def forgot_password(request: schemas.ForgotPasswordRequest, db: Session = Depends(database.get_db)):
     """
     ### 비밀번호 재설정 이메일 발송
     - **설명**: 사용자가 입력한 이메일로 비밀번호를 재설정할 수 있는 링크를 보냅니다.
@@ -142,29 +113,16 @@ async def forgot_password(request: schemas.ForgotPasswordRequest, background_tas
     user = crud.get_user_by_email(db, email=request.email)
     # 가입되지 않은 이메일이라도, 보안을 위해 성공 메시지를 보냅니다.
     if user:
-        # 토큰을 생성하고 이메일을 백그라운드에서 보냅니다.
+        # 토큰을 생성하고 이메일을 아웃박스에 적재합니다. (발송은 outbox_worker가)
         token = security.create_verification_token(email=user.email)
-        background_tasks.add_task(send_password_reset_email, user.email, token)
+        send_password_reset_email(db, user.email, token)
+        db.commit()
     
     return {"message": "비밀번호 재설정 이메일을 발송했습니다. 메일함을 확인해주세요."}
 
-async def send_password_reset_email(email: str, token: str):
-    html = f"""
-    <p>안녕하세요! Green Day 비밀번호 재설정 요청을 받았습니다.</p>
-    <p>아래 버튼을 클릭하여 비밀번호를 다시 설정해주세요.</p>
-    <a href="http://localhost:3000/reset-password?token={token}" 
-       style="display:inline-block; padding:10px 20px; color:white; background-color:#28a745; text-decoration:none; border-radius:5px;">
-       비밀번호 재설정하기
-    </a>
-    """
-    message = MessageSchema(
-        subject="[Green Day] 비밀번호 재설정 안내",
-        recipients=[email],
-        body=html,
-        subtype="html"
-    )
-    fm = FastMail(conf)
-    await fm.send_message(message)
+def send_password_reset_email(db: Session, email: str, token: str):
+    subject, html = mailer.render_password_reset_email(token)
+    outbox.enqueue_email(db, to=email, subject=subject, html=html)
 
 @router.post("/reset-password", status_code=status.HTTP_200_OK)
 def reset_password(request: schemas.ResetPasswordRequest, db: Session = Depends(database.get_db)):
@@ -193,7 +151,7 @@ def reset_password(request: schemas.ResetPasswordRequest, db: Session = Depends(
 def update_push_token(
     token_data: schemas.PushTokenUpdateRequest,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(get_current_user) # ⭐️ 스키마 대신 모델을 사용
+    current_user: Principal = Depends(get_current_user) # ⭐️ 스키마 대신 모델을 사용
 ):
     
     crud.update_user_push_token(
@@ -206,7 +164,7 @@ def update_push_token(
 # ⭐️ 회원 탈퇴
 @router.delete("/users/me", response_model=schemas.UserDeleteResponse)
 def delete_current_user(
-    current_user: models.User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(database.get_db)
 ):
     """
@@ -4,15 +4,19 @@ from __future__ import annotations
 import base64
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, Query, Path
+from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, HTTPException, UploadFile, Query, Path, Response
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 import models, schemas
-from database import get_db
+from database import get_db, get_async_db
 from dependencies import get_current_user
-from services.media import save_image_to_db
+from services.auth_cache import Principal
+from services.media import save_image_to_db_async
 from services.openai_chat import openai_chat_complete
-import crud
+from services.chat_context import build_chat_messages, refresh_thread_summary
+import crud, crud_async
+from utils.pagination import set_next_cursor
 
 router = APIRouter(
     prefix="/chat",
@@ -28,11 +32,12 @@ def _db_message_to_chatmessageout(m: models.ChatMessage) -> schemas.ChatMessageO
 # ---------------------------------------------------------------------
 @router.post("/send", response_model=schemas.ChatSendResponse)
 async def chat_send(
+    background_tasks: BackgroundTasks,
     message: str = Form(...),
     thread_id: Optional[int] = Form(None),
     image: Optional[UploadFile] = File(None),
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user),
 ):
     # 1) 스레드 확보(없으면 생성)
     if not thread_id or thread_id == 0:
@@ -40,13 +45,10 @@ async def chat_send(
             user_id=current_user.id,
             title=None,
         )
-        db.add(th); db.flush()
+        db.add(th); await db.flush()
         thread_id = th.id
     else:
-        th = db.query(models.ChatThread).filter(
-            models.ChatThread.id == thread_id,
-            models.ChatThread.user_id == current_user.id
-        ).first()
+        th = await crud_async.get_chat_thread(db, thread_id=thread_id, user_id=current_user.id)
         if not th:
             raise HTTPException(404, "THREAD_NOT_FOUND")
 
@@ -58,7 +60,7 @@ async def chat_send(
         raw = await image.read()
         if not image.content_type or not image.content_type.startswith("image/"):
             raise HTTPException(400, "이미지 파일만 업로드할 수 있습니다.")
-        img_url, thumb_url, _ = save_image_to_db(
+        img_url, thumb_url, _ = await save_image_to_db_async(
             db, user_id=current_user.id, raw=raw, mime=image.content_type
         )
         saved_image_url = img_url
@@ -74,30 +76,13 @@ async def chat_send(
         tokens_in=None,
         tokens_out=None,
     )
-    db.add(user_msg); db.flush()
-
-    # 3) 히스토리 구성 (최근 10개)
-    hist: List[models.ChatMessage] = db.query(models.ChatMessage)\
-        .filter(models.ChatMessage.thread_id == thread_id)\
-        .order_by(models.ChatMessage.id.asc())\
-        .limit(10).all()
-
-    # OpenAI용 messages 변환
-    messages: List[Dict[str, Any]] = [{"role": "system", "content": "당신은 식물 도우미 챗봇입니다. 한국어로 답하세요."}]
-    for m in hist:
-        if m.role == "user":
-            if m.image_url and m.id == user_msg.id and data_uri:
-                messages.append({
-                    "role": "user",
-                    "content": [
-                        {"type": "text", "text": m.content},
-                        {"type": "image_url", "image_url": {"url": data_uri}},
-                    ]
-                })
-            else:
-                messages.append({"role": "user", "content": m.content})
-        else:
-            messages.append({"role": "assistant", "content": m.content})
+    db.add(user_msg); await db.flush()
+    await crud_async.record_chat_message(db, user_msg)
+    # LLM 응답을 기다리는 동안 스레드 행 잠금을 잡고 있지 않도록 먼저 커밋
+    await db.commit()
+
+    # 3) 히스토리 구성: 롤링 요약 + 토큰 예산 안의 최근 메시지 (services/chat_context.py)
+    messages: List[Dict[str, Any]] = await build_chat_messages(db, th, user_msg, data_uri=data_uri)
 
     # 4) LLM 호출
     try:
@@ -115,7 +100,12 @@ async def chat_send(
             tokens_in=(result.get("usage") or {}).get("prompt_tokens"),
             tokens_out=(result.get("usage") or {}).get("completion_tokens"),
         )
-        db.add(asst_msg); db.commit(); db.refresh(asst_msg)
+        db.add(asst_msg); await db.flush()
+        await crud_async.record_chat_message(db, asst_msg)
+        await db.commit(); await db.refresh(asst_msg)
+
+        # 오래된 대화가 충분히 쌓였으면 응답 후 요약 갱신 (응답 지연에 포함되지 않음)
+        background_tasks.add_task(refresh_thread_summary, thread_id)
 
         return {
             "thread_id": thread_id,
@@ -123,6 +113,7 @@ async def chat_send(
         }
     except Exception as e:
         # 실패시에도 assistant 메시지로 남겨 UX 유지
+        await db.rollback()
         asst_msg = models.ChatMessage(
             thread_id=thread_id,
             role="assistant",
@@ -130,7 +121,9 @@ async def chat_send(
             image_url=saved_image_url,
             provider_resp=None,
         )
-        db.add(asst_msg); db.commit(); db.refresh(asst_msg)
+        db.add(asst_msg); await db.flush()
+        await crud_async.record_chat_message(db, asst_msg)
+        await db.commit(); await db.refresh(asst_msg)
 
         return {
             "thread_id": thread_id,
@@ -142,21 +135,24 @@ async def chat_send(
 # ---------------------------------------------------------------------
 @router.get("/threads")
 def list_threads(
-    skip: int = Query(0, ge=0),
+    response: Response,
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 헤더 값"),
     limit: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """
     대화방 목록을 빠르고 효율적으로 반환합니다.
-    N+1 쿼리 없이 1쿼리만 실행됨.
+    ChatThread의 비정규화 컬럼만 읽는 인덱스 범위 스캔 1쿼리로 실행됨.
+    다음 페이지가 있으면 X-Next-Cursor 헤더로 커서를 돌려줍니다.
     """
-    rows = crud.get_threads_with_summary(
+    rows, next_cursor = crud.get_threads_with_summary(
         db=db,
         user_id=current_user.id,
-        skip=skip,
+        cursor=cursor,
         limit=limit,
     )
+    set_next_cursor(response, next_cursor)
 
     results = []
     for row in rows:
@@ -183,7 +179,7 @@ def get_thread_messages(
     after_id: Optional[int] = Query(None, description="해당 ID보다 큰 메시지들(미래/최근 방향)"),
     asc: bool = Query(True, description="오름차순 정렬 여부(True=오름차순)"),
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     msgs = crud.get_messages_by_thread(
         db=db,
@@ -205,7 +201,7 @@ def get_thread_messages(
 def delete_thread(
     thread_id: int = Path(..., description="삭제할 대화방 ID"),
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     ok = crud.delete_chat_thread(db=db, thread_id=thread_id, user_id=current_user.id)
     if not ok:
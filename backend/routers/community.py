@@ -1,12 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 import crud
 import schemas
-import models
 from database import get_db
 from dependencies import get_current_user
+from services.auth_cache import Principal
+from utils.pagination import set_next_cursor
 
 router = APIRouter(
     prefix="/community",
@@ -22,7 +23,7 @@ router = APIRouter(
 def create_new_post(
     post: schemas.PostCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     ### 새 게시글 작성
@@ -33,7 +34,8 @@ def create_new_post(
 
 @router.get("/posts/", response_model=List[schemas.PostSimple])
 def read_all_posts(
-    skip: int = 0,
+    response: Response,
+    cursor: Optional[str] = None,
     limit: int = 20, # 게시판은 보통 한 페이지에 20개 정도 표시
     db: Session = Depends(get_db)
 ):
@@ -41,9 +43,11 @@ def read_all_posts(
     ### 전체 게시글 목록 조회
     - 최신순으로 정렬됩니다.
     - **응답**: 댓글을 제외한 게시글 목록이 반환됩니다.
+    - **페이지네이션**: 다음 페이지가 있으면 `X-Next-Cursor` 헤더 값을 `cursor`로 다시 보내세요.
     - **인증**: 필수
     """
-    posts = crud.get_posts(db=db, skip=skip, limit=limit)
+    posts, next_cursor = crud.get_posts(db=db, cursor=cursor, limit=limit)
+    set_next_cursor(response, next_cursor)
     return posts
 
 @router.get("/posts/{post_id}", response_model=schemas.Post)
@@ -66,7 +70,7 @@ def update_existing_post(
     post_id: int,
     post_update: schemas.PostUpdate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     ### 게시글 수정
@@ -82,7 +86,7 @@ def update_existing_post(
 def delete_existing_post(
     post_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     ### 게시글 삭제
@@ -104,7 +108,7 @@ def create_new_comment(
     post_id: int,
     comment: schemas.CommentCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     ### 새 댓글 작성
@@ -121,13 +125,15 @@ def create_new_comment(
 @router.get("/posts/{post_id}/comments/", response_model=List[schemas.Comment])
 def read_all_comments_for_post(
     post_id: int,
-    skip: int = 0,
+    response: Response,
+    cursor: Optional[str] = None,
     limit: int = 100,
     db: Session = Depends(get_db)
 ):
     """
     ### 특정 게시글의 댓글 목록 조회
     - 오래된 순(오름차순)으로 정렬됩니다.
+    - **페이지네이션**: 다음 페이지가 있으면 `X-Next-Cursor` 헤더 값을 `cursor`로 다시 보내세요.
     - **인증**: 필수
     """
     # 게시글 존재 여부 확인 (선택 사항이지만, 명확성을 위해)
@@ -135,7 +141,8 @@ def read_all_comments_for_post(
     if db_post is None:
         raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다.")
 
-    comments = crud.get_comments_by_post(db=db, post_id=post_id, skip=skip, limit=limit)
+    comments, next_cursor = crud.get_comments_by_post(db=db, post_id=post_id, cursor=cursor, limit=limit)
+    set_next_cursor(response, next_cursor)
     return comments
 
 @router.put("/comments/{comment_id}", response_model=schemas.Comment)
@@ -143,7 +150,7 @@ def update_existing_comment(
     comment_id: int,
     comment_update: schemas.CommentUpdate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     ### 댓글 수정
@@ -159,7 +166,7 @@ def update_existing_comment(
 def delete_existing_comment(
     comment_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     ### 댓글 삭제
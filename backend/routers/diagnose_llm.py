@@ -6,13 +6,13 @@ import re
 from typing import Dict, Any
 
 from fastapi import APIRouter, Depends, HTTPException, Path
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-import models
-import crud
+import crud_async
 import schemas
-from database import get_db
+from database import get_async_db
 from dependencies import get_current_user
+from services.auth_cache import Principal
 from core import config
 from services.remedy import get_remedy
 from services import openai_chat, media as media_service, remedy as remedy_service
@@ -117,8 +117,8 @@ async def _call_vision_api(
 async def diagnose_by_llm_for_plant(
     request: schemas.DiagnosisLLMRequest,
     plant_id: int = Path(..., description="진단할 식물의 ID"),
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user),
 ):
     """
     ### LLM 기반 병해충 진단 (일지 기록 연동)
@@ -137,7 +137,7 @@ async def diagnose_by_llm_for_plant(
         )
 
     # 1) 식물 소유권 확인
-    plant = crud.get_plant_by_id(db, plant_id=plant_id)
+    plant = await crud_async.get_plant_by_id(db, plant_id=plant_id)
     if not plant or plant.owner_id != current_user.id:
         raise HTTPException(status_code=404, detail="식물을 찾을 수 없거나 소유자가 아닙니다.")
 
@@ -151,7 +151,7 @@ async def diagnose_by_llm_for_plant(
     # 3) '성장 일지' 자동 기록 (정상 진단인 경우에만)
     if diagnosis_result.get("disease_key") != "unknown":
         try:
-            crud.create_diary_log(
+            await crud_async.create_diary_log(
                 db=db,
                 plant_id=plant_id,
                 log_type="DIAGNOSIS",
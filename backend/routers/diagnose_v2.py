@@ -12,11 +12,9 @@ import numpy as np
 from PIL import Image, ImageOps, UnidentifiedImageError
 
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Query
-from sqlalchemy.orm import Session
 
-import models
-from database import get_db
 from dependencies import get_current_user
+from services.auth_cache import Principal
 
 from transformers import pipeline, AutoImageProcessor
 
@@ -241,8 +239,7 @@ async def diagnose_v2(
     use_tta: bool = Query(USE_TTA_DEFAULT, description="반전/회전 TTA 평균"),
     include_per_model: bool = Query(True, description="모델별 원시 예측 포함"),
     include_clip: bool = Query(USE_CLIP_DEFAULT, description="CLIP 보조 점수 포함"),
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     # 0) 파일 검증
     if not image.content_type or not image.content_type.startswith("image/"):
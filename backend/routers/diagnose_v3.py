@@ -13,12 +13,12 @@ import numpy as np
 from PIL import Image, ImageOps, UnidentifiedImageError
 
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy.ext.asyncio import AsyncSession
 
-import models
-from database import get_db
+import models, crud_async
+from database import get_async_db
 from dependencies import get_current_user
+from services.auth_cache import Principal
 
 from transformers import pipeline, AutoImageProcessor
 
@@ -248,8 +248,8 @@ async def diagnose_auto(
     use_tta: bool = Query(USE_TTA_DEFAULT, description="반전/회전 TTA 평균"),
     include_per_model: bool = Query(True, description="모델별 원시 예측 포함"),
     include_clip: bool = Query(USE_CLIP_DEFAULT, description="CLIP 제로샷 보조 포함"),
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user),
 ):
     # 0) 파일 검증
     if not image.content_type or not image.content_type.startswith("image/"):
@@ -271,17 +271,11 @@ async def diagnose_auto(
     img_hash = compute_phash64(pil0)
     if DIAG_CACHE_TTL_SECONDS > 0:
         since = datetime.now(timezone.utc) - timedelta(seconds=DIAG_CACHE_TTL_SECONDS)
-        cached = (
-            db.query(models.Diagnosis)
-            .filter(
-                and_(
-                    models.Diagnosis.user_id == current_user.id,
-                    models.Diagnosis.image_hash == img_hash,
-                    models.Diagnosis.created_at >= since.replace(tzinfo=None)  # DB가 naive일 수 있음
-                )
-            )
-            .order_by(models.Diagnosis.created_at.desc())
-            .first()
+        cached = await crud_async.get_recent_diagnosis_by_hash(
+            db,
+            user_id=current_user.id,
+            image_hash=img_hash,
+            since=since.replace(tzinfo=None),  # DB가 naive일 수 있음
         )
         if cached:
             return build_response_from_row(cached)
@@ -296,7 +290,7 @@ async def diagnose_auto(
         original=raw,
         thumb=thumb_bytes,
     )
-    db.add(img_row); db.flush()  # id 확보
+    db.add(img_row); await db.flush()  # id 확보
 
     image_url = f"/media/{img_row.id}/orig"
     thumb_url = f"/media/{img_row.id}/thumb"
@@ -361,7 +355,7 @@ async def diagnose_auto(
             thresholds={"threshold": THRESHOLD, "llm_low": LLM_LOW, "llm_high": LLM_HIGH},
             per_model=None, clip_votes=None,
         )
-        db.add(diag); db.commit(); db.refresh(diag)
+        db.add(diag); await db.commit(); await db.refresh(diag)
         return {
             "label": "Unknown",
             "label_ko": "불확실",
@@ -423,7 +417,7 @@ async def diagnose_auto(
             for k, v in sorted(disease_scores_clip.items(), key=lambda x: -x[1])
         ] if disease_scores_clip else None,
     )
-    db.add(diag); db.commit(); db.refresh(diag)
+    db.add(diag); await db.commit(); await db.refresh(diag)
 
     # 9) 응답
     resp: Dict[str, Any] = {
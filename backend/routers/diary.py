@@ -1,14 +1,15 @@
 # routers/diary.py (새로운 전체 코드)
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 import crud
 import schemas
-import models
 from database import get_db
 from dependencies import get_current_user
+from services.auth_cache import Principal
+from utils.pagination import set_next_cursor
 
 router = APIRouter(
     prefix="/diary",
@@ -21,7 +22,7 @@ def create_manual_diary(
     plant_id: int,
     entry: schemas.DiaryCreateManual,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     ### 수동 성장 일지 작성 (메모 또는 사진)
@@ -38,19 +39,22 @@ def create_manual_diary(
 @router.get("/{plant_id}", response_model=List[schemas.Diary])
 def read_diaries_for_plant(
     plant_id: int,
-    skip: int = 0,
+    response: Response,
+    cursor: Optional[str] = None,
     limit: int = 50,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     ### 특정 식물의 전체 성장 일지(타임라인) 조회
     - '물주기', '진단', '수동 메모' 등 모든 기록이 최신순으로 반환됩니다.
+    - **페이지네이션**: 다음 페이지가 있으면 `X-Next-Cursor` 헤더 값을 `cursor`로 다시 보내세요.
     - **인증**: 필수
     """
-    diaries = crud.get_diaries_by_plant(
-        db=db, plant_id=plant_id, user_id=current_user.id, skip=skip, limit=limit
+    diaries, next_cursor = crud.get_diaries_by_plant(
+        db=db, plant_id=plant_id, user_id=current_user.id, cursor=cursor, limit=limit
     )
+    set_next_cursor(response, next_cursor)
     return diaries
 
 @router.put("/{diary_id}/manual", response_model=schemas.Diary)
@@ -58,7 +62,7 @@ def update_manual_diary(
     diary_id: int,
     entry_update: schemas.DiaryCreateManual,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     ### 수동 작성 일지(메모/사진) 수정
@@ -77,7 +81,7 @@ def update_manual_diary(
 def delete_manual_diary(
     diary_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     ### 수동 작성 일지(메모/사진) 삭제
@@ -16,6 +16,7 @@ import models
 import schemas
 from database import get_db
 from dependencies import get_current_user
+from services.auth_cache import Principal
 
 # 해시/썸네일 유틸
 from utils.image_meta import compute_phash64, make_thumbnail_bytes
@@ -91,7 +92,7 @@ def _save_image_to_db(
 async def upload_image(
     image: UploadFile = File(..., description="업로드할 이미지 파일"),
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """이미지 업로드"""
     if not image.content_type or not image.content_type.startswith("image/"):
@@ -128,7 +129,7 @@ async def upload_image(
 def get_original_image(
     image_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """원본 이미지 조회 (본인 인증 필요)"""
     asset = _get_image_asset_or_404(db, image_id, user_id=current_user.id)
@@ -139,7 +140,7 @@ def get_original_image(
 def get_thumbnail_image(
     image_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """썸네일 이미지 조회 (본인 인증 필요)"""
     asset = _get_image_asset_or_404(db, image_id, user_id=current_user.id)
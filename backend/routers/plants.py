@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from typing import List # List 타입을 명시적으로 import
+from datetime import date, timedelta
 import logging
 
-import schemas, models, crud
+import schemas, crud
 from database import get_db
 from dependencies import get_current_user # 수정: dependencies에서 get_current_user를 가져옵니다.
+from services.auth_cache import Principal
+from services import catalog
 
 logger = logging.getLogger(__name__)
 router = APIRouter(
@@ -19,10 +22,10 @@ router = APIRouter(
 @router.post("/", response_model=schemas.Plant, status_code=status.HTTP_201_CREATED)
 def create_plant_for_user(
     plant_create: schemas.PlantCreate,
-    current_user: models.User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    master_plant = crud.get_master_plant_by_id(db, plant_id=plant_create.plant_master_id)
+    master_plant = catalog.get_catalog().get(plant_create.plant_master_id)
     if not master_plant:
         raise HTTPException(status_code=404, detail="PlantMaster not found")
 
@@ -51,7 +54,7 @@ def create_plant_for_user(
 
 
 @router.get("/", response_model=List[schemas.Plant])
-def read_plants_for_user(current_user: models.User = Depends(get_current_user), db: Session = Depends(get_db)):
+def read_plants_for_user(current_user: Principal = Depends(get_current_user), db: Session = Depends(get_db)):
     db_plants = crud.get_plants_by_owner(db=db, user_id=current_user.id)
 
     results = []
@@ -67,8 +70,35 @@ def read_plants_for_user(current_user: models.User = Depends(get_current_user),
     return results
 
 
+@router.get(
+    "/watering/upcoming",
+    response_model=List[schemas.UpcomingWatering],
+    summary="물주기 예정 목록",
+    description="오늘부터 days일 이내에 물 줄 예정인 내 식물을 예정일 순으로 반환합니다."
+)
+def read_upcoming_waterings(
+    days: int = Query(7, ge=0, le=60),
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    today = date.today()
+    plants = crud.get_upcoming_waterings(db, user_id=current_user.id, start=today, end=today + timedelta(days=days))
+    return [
+        schemas.UpcomingWatering(
+            plant_id=plant.id,
+            name=plant.name,
+            species=plant.species,
+            master_image_url=plant.master_info.image_url if plant.master_info else None,
+            watering_type=plant.master_info.watering_type if plant.master_info else None,
+            next_watering_at=plant.next_watering_at,
+            is_notification_enabled=plant.is_notification_enabled,
+        )
+        for plant in plants
+    ]
+
+
 @router.get("/{plant_id}", response_model=schemas.Plant)
-def read_plant_by_id(plant_id: int, current_user: models.User = Depends(get_current_user), db: Session = Depends(get_db)):
+def read_plant_by_id(plant_id: int, current_user: Principal = Depends(get_current_user), db: Session = Depends(get_db)):
     db_plant = crud.get_plant_by_id(db=db, plant_id=plant_id)
     if db_plant is None:
         raise HTTPException(status_code=404, detail="Plant not found")
@@ -88,7 +118,7 @@ def read_plant_by_id(plant_id: int, current_user: models.User = Depends(get_curr
 
 
 @router.put("/{plant_id}", response_model=schemas.Plant)
-def update_user_plant(plant_id: int, plant_update: schemas.PlantCreate, current_user: models.User = Depends(get_current_user), db: Session = Depends(get_db)):
+def update_user_plant(plant_id: int, plant_update: schemas.PlantCreate, current_user: Principal = Depends(get_current_user), db: Session = Depends(get_db)):
     """
     ### 특정 반려식물 정보 수정
     - **설명**: 특정 반려식물의 정보를 수정합니다. 자신의 식물이 아니면 수정할 수 없습니다.
@@ -105,7 +135,7 @@ def update_user_plant(plant_id: int, plant_update: schemas.PlantCreate, current_
 
 
 @router.delete("/{plant_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user_plant(plant_id: int, current_user: models.User = Depends(get_current_user), db: Session = Depends(get_db)):
+def delete_user_plant(plant_id: int, current_user: Principal = Depends(get_current_user), db: Session = Depends(get_db)):
     """
     ### 특정 반려식물 삭제
     - **설명**: 특정 반려식물을 삭제합니다. 자신의 식물이 아니면 삭제할 수 없습니다.
@@ -131,7 +161,7 @@ def delete_user_plant(plant_id: int, current_user: models.User = Depends(get_cur
 def record_watering(
     plant_id: int,
     db: Session = Depends(get_db),
-    current_user: schemas.UserInfo = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     plant = crud.get_plant_by_id(db, plant_id)
     if not plant:
@@ -151,6 +181,26 @@ def record_watering(
         logger.error(f"물주기 일지 기록 실패 (Plant ID: {plant_id}): {e}")
     return
 
+@router.patch(
+    "/{plant_id}/notification",
+    response_model=schemas.Plant,
+    summary="물주기 알림 설정 변경",
+    description="특정 식물의 알림 켜기/끄기와 알림 시각(HH:MM, 한국 시간)을 변경합니다."
+)
+def update_watering_notification(
+    plant_id: int,
+    settings_update: schemas.PlantNotificationUpdate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    plant = crud.get_plant_by_id(db, plant_id)
+    if not plant:
+        raise HTTPException(status_code=404, detail="Plant not found")
+    if plant.owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to update this plant")
+
+    return crud.update_plant_notification(db, plant_id=plant_id, settings_update=settings_update)
+
 @router.post(
     "/{plant_id}/snooze",
     status_code=status.HTTP_204_NO_CONTENT,
@@ -160,7 +210,7 @@ def record_watering(
 def snooze_watering_notification(
     plant_id: int,
     db: Session = Depends(get_db),
-    current_user: schemas.UserInfo = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     plant = crud.get_plant_by_id(db, plant_id)
     if not plant:
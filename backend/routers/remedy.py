@@ -2,11 +2,12 @@
 from __future__ import annotations
 import os
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-import models, schemas
-from database import get_db
+import schemas, crud_async
+from database import get_async_db
 from dependencies import get_current_user
+from services.auth_cache import Principal
 from services.remedy import get_remedy, normalize_disease_key, DISEASE_KO
 from services.llm_advice import get_llm_remedy
 
@@ -22,8 +23,7 @@ def _use_llm() -> bool:
 @router.post("/remedy", response_model=schemas.RemedyAdvice)
 async def build_remedy(
     req: schemas.RemedyRequest,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     key = normalize_disease_key(req.disease_key or "unknown")
     sev = (req.severity or "MEDIUM").upper()
@@ -45,13 +45,10 @@ async def build_remedy(
 @router.get("/diagnoses/{diag_id}/remedy", response_model=schemas.RemedyAdvice)
 async def build_remedy_from_diag(
     diag_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    diag = db.query(models.Diagnosis).filter(
-        models.Diagnosis.id == diag_id,
-        models.Diagnosis.user_id == current_user.id
-    ).first()
+    diag = await crud_async.get_diagnosis_for_user(db, diag_id=diag_id, user_id=current_user.id)
     if not diag:
         raise HTTPException(status_code=404, detail="진단 결과를 찾을 수 없습니다.")
 
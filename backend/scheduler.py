@@ -1,80 +1,228 @@
+import math
 import os
-from datetime import datetime, date
+import socket
+import zlib
+from dataclasses import asdict
+from datetime import datetime
+from zoneinfo import ZoneInfo
 from apscheduler.schedulers.blocking import BlockingScheduler
-from sqlalchemy import create_engine, and_
-from sqlalchemy.orm import Session
+import crud
+from core.config import settings
+from database import SessionLocal
+from services import outbox
+from services.push_sender import PushDispatcher, PushMessage # ⭐️ FCM 배치 발송
 
+CHUNK_SIZE = 1000 # 한 번에 읽어올 물주기 대상 식물 수
+SCHEDULER_TZ = ZoneInfo("Asia/Seoul") # notification_time 기준 시간대
+MAX_CATCHUP_MINUTES = 10 # 실행 지연/워커 장애 시 되짚어 처리할 최대 분
+MAX_PLANT_ID = 2**31 - 1 # 재개 시 (owner_id, plant_id) 키셋에서 해당 사용자 전체를 건너뛰기 위한 값
 
-from core.config import settings
-from models import Plant, User, PlantMaster
-from services.push_sender import send_push_notification # ⭐️ 푸시 발송 서비스 (별도 구현 필요)
-from core.constants import WATERING_CYCLE_MAP # ⭐️ 우리가 정의한 물주기 주기 맵
-
-DATABASE_URL = settings.DB_URL
-engine = create_engine(DATABASE_URL)
-
-def check_watering_schedules():
-    """매일 실행될 메인 스케줄러 함수"""
-    today = date.today()
-    print(f"[{datetime.now()}] 스케줄러 실행: 오늘 날짜 - {today}")
-    
-    notifications_to_send = {} # {user_id: [plant_name_1, plant_name_2, ...]}
-
-    with Session(engine) as db:
-        # 1. 알림이 켜져 있고, 미루기 상태가 아닌 모든 식물을 조회
-        plants_to_check = db.query(Plant).filter(
-            Plant.is_notification_enabled == True,
-            and_(
-                Plant.notification_snoozed_until == None,
-                Plant.notification_snoozed_until < today
-            )
-        ).all()
-
-        for plant in plants_to_check:
-            # 2. PlantMaster 정보를 join하여 watering_type 가져오기
-            master_info = db.query(PlantMaster).filter(PlantMaster.species == plant.species).first()
-            if not master_info or not master_info.watering_type:
-                continue
+class LeaseLost(Exception):
+    """처리 중 파티션 리스를 잃음 (만료 후 다른 워커가 인계) → 이 파티션 처리를 즉시 중단"""
+
+def iter_due_notifications(db, today, minute_range=None, partition=None, after_owner_id=0):
+    """
+    오늘 물 줄 식물을 청크 단위로 읽어 사용자별로 묶어서 내보냅니다.
+    결과가 (owner_id, plant_id) 순으로 정렬되어 있으므로 청크 경계에 걸친 사용자만 이어 붙이면 됩니다.
+    after_owner_id: 이 사용자까지는 이미 발송 완료 (중단된 파티션 재개용)
+    yield: (user_id, push_token, [plant_name, ...])
+    """
+    current_user_id, current_token, plant_names = None, None, []
+    after = (after_owner_id, MAX_PLANT_ID) if after_owner_id else None
+    while True:
+        rows = crud.get_due_watering_rows(
+            db, today, after=after, limit=CHUNK_SIZE, minute_range=minute_range, partition=partition
+        )
+        for user_id, plant_id, plant_name, push_token in rows:
+            if user_id != current_user_id:
+                if plant_names:
+                    yield current_user_id, current_token, plant_names
+                current_user_id, current_token, plant_names = user_id, push_token, []
+            plant_names.append(plant_name)
+        if len(rows) < CHUNK_SIZE:
+            break
+        after = (rows[-1][0], rows[-1][1])
+    if plant_names:
+        yield current_user_id, current_token, plant_names
+
+def build_watering_message(user_id, push_token, plant_names):
+    plant_list_str = ", ".join(plant_names)
+    body = (
+        f"오늘은 {plant_list_str} 물 주는 날이에요! 💧\n"
+        "※ 흙 상태를 먼저 확인하고, 축축하다면 1~2일 뒤에 주세요."
+    )
+    return PushMessage(token=push_token, title="Green Day 물주기 알림", body=body, user_id=user_id)
+
+def _hold_lease(db, lease):
+    """리스를 아직 보유 중인지 확인하며 연장 (commit 전까지 리스 행 잠금). 잃었으면 LeaseLost"""
+    if lease is None:
+        return
+    if not crud.renew_scheduler_lease(db, lease, WORKER_ID, settings.SCHEDULER_LEASE_SECONDS):
+        db.rollback()
+        raise LeaseLost(lease)
+
+def _flush(db, dispatcher, messages, totals, run=None, lease=None):
+    """
+    모아 둔 메시지를 발송합니다. run이 있으면 진행 상황(마지막 사용자)도 기록합니다.
+    - dispatcher 없음(아웃박스 모드): outbox_messages에 적재 → 진행 기록과 같은 트랜잭션으로 commit되므로 중복/유실 없음
+    - dispatcher 있음: 직접 배치 발송하고 만료 토큰 정리
+    - lease: 파티션 리스. 발송 전/진행 기록 commit 전에 보유 여부를 확인하고, 잃었으면 발송하지 않고 LeaseLost
+    """
+    if not messages:
+        return
+    _hold_lease(db, lease)
+    if dispatcher is None:
+        outbox.enqueue_pushes(db, [asdict(m) for m in messages])
+        totals["queued"] += len(messages)
+        sent = failed = 0
+        print(f"  - {len(messages)}건 발송 대기열 적재")
+    else:
+        db.commit() # 연장한 리스를 확정 (FCM 호출 동안 리스 행을 잠그고 있지 않도록)
+        report = dispatcher.dispatch(messages)
+        pruned = crud.clear_push_tokens(db, report.unregistered_tokens)
+        sent, failed = report.sent, report.failed
+        totals["pruned"] += pruned
+        print(f"  - {len(messages)}건 발송 ({report.elapsed_sec:.2f}s): 성공 {report.sent}, 실패 {report.failed}, 만료 토큰 정리 {pruned}")
+    totals["sent"] += sent
+    totals["failed"] += failed
+    if dispatcher is not None:
+        _hold_lease(db, lease)
+    if run is not None:
+        run.last_owner_id = messages[-1].user_id
+        run.users_notified += len(messages)
+        run.sent += sent
+        run.failed += failed
+    db.commit()
+    messages.clear()
+
+def check_watering_schedules(dispatcher=None, today=None, minute_range=None, partition=None, run=None, db=None, lease=None):
+    """
+    물주기 알림 발송.
+    - minute_range=(start, end): 알림 시각이 그 구간(하루 중 분)에 속한 식물만 (None이면 오늘 대상 전체)
+    - partition=(index, count): owner_id % count == index 인 사용자만
+    - run: SchedulerRun 진행 기록. last_owner_id 다음 사용자부터 처리하고, 발송할 때마다 갱신
+    - lease: 파티션 리스 이름. 발송 묶음마다 보유 여부를 확인 (잃으면 LeaseLost)
+    """
+    today = today or datetime.now(SCHEDULER_TZ).date()
+    print(f"[{datetime.now()}] 스케줄러 실행: 오늘 날짜 - {today}, 알림 시각 구간 - {minute_range or '전체'}, 파티션 - {partition or '전체'}")
+
+    if dispatcher is None and not settings.NOTIFICATIONS_VIA_OUTBOX:
+        dispatcher = PushDispatcher()
+    # 한 번에 발송할 메시지 수 = 배치 크기 × 동시 배치 수 (메모리는 이 크기로 제한됨)
+    flush_size = dispatcher.batch_size * dispatcher.max_concurrency if dispatcher else CHUNK_SIZE
+    totals = {"users": 0, "queued": 0, "sent": 0, "failed": 0, "pruned": 0}
+    messages = []
+    own_session = db is None
+    db = db or SessionLocal()
+    try:
+        after_owner_id = run.last_owner_id if run is not None else 0
+        # 알림 켜짐 + 미루기 아님 + 오늘이 물 주는 날 + 알림 시각 구간 + 푸시 토큰 있음 → DB에서 한 번에 필터링
+        for user_id, push_token, plant_names in iter_due_notifications(db, today, minute_range, partition, after_owner_id):
+            messages.append(build_watering_message(user_id, push_token, plant_names))
+            totals["users"] += 1
+            if len(messages) >= flush_size:
+                _flush(db, dispatcher, messages, totals, run, lease)
+        _flush(db, dispatcher, messages, totals, run, lease)
+    finally:
+        if own_session:
+            db.close()
+
+    print(f"알림 발송 대상: {totals['users']}명 (대기열 {totals['queued']}, 성공 {totals['sent']}, 실패 {totals['failed']}, 만료 토큰 정리 {totals['pruned']})")
+    return totals
+
+# --- 분산 실행 (여러 워커) ---
+# 사용자를 owner_id % SCHEDULER_PARTITIONS 로 나누고, 파티션마다 DB 리스를 잡은 워커만 처리합니다.
+# (날짜, 분, 파티션)별 진행 상황은 scheduler_runs에 남기므로, 워커가 죽으면 리스 만료 후 다른 워커가
+# 완료되지 않은 분을 last_owner_id 다음 사용자부터 이어서 처리합니다.
+# 발송 묶음마다 리스 보유를 확인·연장하므로 리스를 잃은 워커는 다음 묶음을 보내기 전에 멈춥니다.
+# 워커마다 멤버십 리스(watering:worker:<id>)를 두어 살아 있는 워커 수를 세고, 파티션을 균등하게 나눠 가집니다.
+WORKER_ID = settings.SCHEDULER_WORKER_ID or f"{socket.gethostname()}-{os.getpid()}"
+JOB_NAME = "watering"
+WORKER_LEASE_PREFIX = f"{JOB_NAME}:worker:"
+
+def _lease_name(partition):
+    index, count = partition
+    return f"{JOB_NAME}:{count}:{index}"
+
+def _partition_limit(db, count):
+    """워커 1개가 맡을 파티션 수 (설정값이 0이면 ceil(파티션 수 / 살아 있는 워커 수))"""
+    if settings.SCHEDULER_MAX_PARTITIONS_PER_WORKER:
+        return settings.SCHEDULER_MAX_PARTITIONS_PER_WORKER
+    crud.acquire_scheduler_lease(db, WORKER_LEASE_PREFIX + WORKER_ID, WORKER_ID, settings.SCHEDULER_LEASE_SECONDS)
+    live_workers = max(1, crud.count_live_scheduler_leases(db, WORKER_LEASE_PREFIX))
+    return math.ceil(count / live_workers)
+
+def _partition_order(count):
+    """워커마다 다른 파티션부터 시도해 한 워커가 모든 파티션을 먼저 가져가는 것을 줄임"""
+    offset = zlib.crc32(WORKER_ID.encode("utf-8")) % count
+    return [(offset + i) % count for i in range(count)]
+
+def process_partition(db, dispatcher, today, minute_range, partition):
+    """리스를 보유한 파티션에서 아직 완료되지 않은 분 버킷을 순서대로 처리 (리스를 잃으면 LeaseLost)"""
+    lease = _lease_name(partition)
+    done = crud.get_done_scheduler_minutes(db, JOB_NAME, today, minute_range, partition)
+    for minute in range(minute_range[0], minute_range[1] + 1):
+        if minute in done:
+            continue
+        _hold_lease(db, lease) # 진행 기록 인계도 리스 보유 확인과 같은 트랜잭션으로
+        run = crud.start_scheduler_run(db, JOB_NAME, today, minute, partition, WORKER_ID)
+        check_watering_schedules(
+            dispatcher, today=today, minute_range=(minute, minute), partition=partition, run=run, db=db, lease=lease
+        )
+        _hold_lease(db, lease)
+        run.status = "done"
+        run.finished_at = datetime.utcnow()
+        db.commit()
+
+def run_minute_bucket():
+    """매분 실행: 리스를 잡은 파티션마다 최근 MAX_CATCHUP_MINUTES분 중 완료되지 않은 버킷을 발송"""
+    now = datetime.now(SCHEDULER_TZ)
+    today, minute = now.date(), now.hour * 60 + now.minute
+    minute_range = (max(0, minute - MAX_CATCHUP_MINUTES), minute)
+    count = max(1, settings.SCHEDULER_PARTITIONS)
 
-            # 3. 다음 물 줄 날짜 계산
-            cycle_days = WATERING_CYCLE_MAP.get(master_info.watering_type, 7) # 기본값 7일
-            if not plant.last_watered_at:
+    dispatcher = None if settings.NOTIFICATIONS_VIA_OUTBOX else PushDispatcher()
+    held = 0
+    with SessionLocal() as db:
+        limit = _partition_limit(db, count)
+        for index in _partition_order(count):
+            partition = (index, count)
+            if held >= limit:
+                # 몫보다 많이 잡고 있던 파티션은 반납 → 새로 뜬 워커가 다음 실행에서 가져감
+                crud.release_scheduler_lease(db, _lease_name(partition), WORKER_ID)
                 continue
-                
-            next_watering_date = plant.last_watered_at.date() + timedelta(days=cycle_days)
-
-            # 4. 오늘이 물 주는 날인지 확인
-            if next_watering_date == today:
-                user_id = plant.owner_id
-                if user_id not in notifications_to_send:
-                    notifications_to_send[user_id] = []
-                notifications_to_send[user_id].append(plant.name)
-
-    print(f"알림 발송 대상: {len(notifications_to_send)}명")
-    
-    # 5. 사용자별로 그룹화된 알림 발송
-    with Session(engine) as db:
-        for user_id, plant_names in notifications_to_send.items():
-            user = db.query(User).filter(User.id == user_id).first()
-            if not user or not user.push_token: # ⭐️ User 모델에 push_token 컬럼이 있다고 가정
+            if not crud.acquire_scheduler_lease(db, _lease_name(partition), WORKER_ID, settings.SCHEDULER_LEASE_SECONDS):
                 continue
+            held += 1
+            try:
+                process_partition(db, dispatcher, today, minute_range, partition)
+            except LeaseLost:
+                print(f"  - 파티션 {partition} 리스를 잃어 처리를 중단합니다. (다른 워커가 이어서 처리)")
+            except Exception as e:
+                # 리스는 유지 → 다음 실행(또는 만료 후 다른 워커)이 진행 기록부터 재개
+                db.rollback()
+                print(f"  - 파티션 {partition} 처리 실패: {e}")
 
-            plant_list_str = ", ".join(plant_names)
-            message = (
-                f"오늘은 {plant_list_str} 물 주는 날이에요! 💧\n"
-                "※ 흙 상태를 먼저 확인하고, 축축하다면 1~2일 뒤에 주세요."
-            )
-            
-            # 실제 푸시 알림 발송 로직 호출
-            send_push_notification(user.push_token, "Green Day 물주기 알림", message)
-            print(f"  - User {user_id}에게 푸시 발송 완료: {plant_list_str}")
+def shutdown():
+    """정상 종료 시 보유한 리스를 반납해 다른 워커가 바로 인계받도록 함"""
+    count = max(1, settings.SCHEDULER_PARTITIONS)
+    with SessionLocal() as db:
+        for index in range(count):
+            crud.release_scheduler_lease(db, _lease_name((index, count)), WORKER_ID)
+        crud.release_scheduler_lease(db, WORKER_LEASE_PREFIX + WORKER_ID, WORKER_ID)
 
 # --- 스케줄러 설정 및 실행 ---
-scheduler = BlockingScheduler(timezone='Asia/Seoul')
+scheduler = BlockingScheduler(timezone=SCHEDULER_TZ)
 
-# 매일 오전 9시에 check_watering_schedules 함수 실행
-scheduler.add_job(check_watering_schedules, 'cron', hour=9, minute=0)
+# 매분 0초에 실행해 각 식물의 알림 시각(notification_time)에 맞춰 발송 (09:00 일괄 발송 대신 하루에 분산)
+# 같은 스크립트를 여러 프로세스/노드에서 실행하면 파티션 리스로 작업을 나눠 가짐
+scheduler.add_job(run_minute_bucket, 'cron', minute='*', second=0, max_instances=1, coalesce=True)
 
 if __name__ == "__main__":
-    print("스케줄러를 시작합니다. (매일 오전 9시 실행)")
-    scheduler.start()
+    print(f"스케줄러를 시작합니다. (매분 실행, 식물별 알림 시각 기준, 워커 {WORKER_ID})")
+    try:
+        scheduler.start()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        shutdown()
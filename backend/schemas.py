@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, ConfigDict, Field, HttpUrl
-from datetime import datetime
+from datetime import datetime, date
 from typing import Optional, List
 
 # --- User Schemas ---
@@ -57,9 +57,25 @@ class Plant(BaseModel):
     last_watered_at: Optional[datetime] = None
     is_notification_enabled: bool
     notification_time: Optional[str] = None
+    next_watering_at: Optional[date] = None
 
     model_config = ConfigDict(from_attributes=True)
 
+# [입력용] 물주기 알림 설정 변경 (보낸 필드만 반영)
+class PlantNotificationUpdate(BaseModel):
+    is_notification_enabled: Optional[bool] = None
+    notification_time: Optional[str] = Field(None, pattern=r"^([01]\d|2[0-3]):[0-5]\d$") # HH:MM (Asia/Seoul)
+
+# [출력용] 물주기 예정 목록
+class UpcomingWatering(BaseModel):
+    plant_id: int
+    name: str
+    species: str
+    master_image_url: Optional[str] = None
+    watering_type: Optional[str] = None
+    next_watering_at: date
+    is_notification_enabled: bool
+
 # --- Recommendation Schemas ---
 
 # 추천 요청 시 프론트엔드로부터 받을 설문 데이터 양식
@@ -100,7 +116,18 @@ class PlantMasterInfo(BaseModel):
     tags: Optional[List] = None # JSON 필드는 보통 List나 Dict로 받습니다.
     model_config = ConfigDict(from_attributes=True)
 
+# 자동완성 항목 (입력 중 목록에 필요한 최소 필드)
+class PlantSuggestion(BaseModel):
+    id: int
+    name_ko: str
+    name_en: Optional[str] = None
+    image_url: Optional[str] = None
+    model_config = ConfigDict(from_attributes=True)
+
 # ⭐️ 관리자용 스키마
+class WateringTypeUpdate(BaseModel):
+    watering_type: str
+
 class PlantCreateRequest(BaseModel):
     species: str
     name_ko: str
@@ -0,0 +1,44 @@
+"""
+ML 추천 모델 번들 활성 버전 변경 (CURRENT 교체)
+
+저장된 번들 중 하나를 체크섬 검증 후 CURRENT로 지정합니다.
+API 워커들은 ML_ARTIFACT_POLL_SEC 안에 CURRENT를 확인해 재시작 없이 교체합니다. (services/ml_artifacts.py)
+이전 버전으로 되돌릴 때도 같은 방법을 씁니다.
+바로 반영하려면 각 워커에 POST /admin/ml/reload (CURRENT를 다시 읽음)
+
+사용법 (backend 디렉터리에서):
+  python scripts/activate_ml_bundle.py                  # 번들 목록 + 현재 버전 출력
+  python scripts/activate_ml_bundle.py 20261019-153000  # 해당 버전 활성화
+"""
+import argparse
+import os
+import sys
+
+# 프로젝트 루트 경로 설정
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core.config import settings
+from services import ml_artifacts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ML 추천 모델 번들 활성 버전 변경")
+    parser.add_argument("version", nargs="?", help="활성화할 번들 버전 (비우면 목록만 출력)")
+    args = parser.parse_args()
+
+    if args.version:
+        try:
+            ml_artifacts.activate(args.version)
+        except ml_artifacts.ArtifactError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        print(f"✅ 번들 '{args.version}'을 활성 버전으로 지정했습니다. (워커 반영까지 최대 {settings.ML_ARTIFACT_POLL_SEC:.0f}초)")
+
+    current = ml_artifacts.current_version()
+    print("-" * 50)
+    for version in ml_artifacts.list_versions():
+        print(f"  {'*' if version == current else ' '} {version}")
+    print("-" * 50)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import os
+import sys
+
+# 프로젝트 루트 경로 설정
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import crud, models
+from database import SessionLocal
+
+BATCH_SIZE = 1000 # 한 번에 재계산할 스레드 수
+
+def backfill_chat_threads():
+    """
+    chat_threads의 비정규화 컬럼(message_count, last_message_*)을
+    chat_messages 기준으로 다시 계산합니다. 스레드 id 순서로 배치 처리하므로 몇 번 실행해도 안전합니다.
+    """
+    db = SessionLocal()
+    try:
+        last_id = 0
+        total = 0
+        while True:
+            thread_ids = [
+                row.id for row in db.query(models.ChatThread.id)
+                .filter(models.ChatThread.id > last_id)
+                .order_by(models.ChatThread.id.asc())
+                .limit(BATCH_SIZE)
+                .all()
+            ]
+            if not thread_ids:
+                break
+            total += crud.recount_thread_stats(db, thread_ids)
+            db.commit()
+            last_id = thread_ids[-1]
+            print(f"  - {total}개 스레드 처리 (마지막 id={last_id})")
+    finally:
+        db.close()
+
+    print("-" * 50)
+    print(f"✅ 대화 스레드 요약 컬럼 백필 완료: 총 {total}개")
+    print("-" * 50)
+
+if __name__ == "__main__":
+    backfill_chat_threads()
@@ -0,0 +1,46 @@
+import os
+import sys
+
+# 프로젝트 루트 경로 설정
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import crud, models
+from database import SessionLocal
+
+BATCH_SIZE = crud.NEXT_WATERING_BATCH_SIZE # 한 번에 재계산할 식물 수
+
+def backfill_next_watering():
+    """
+    plants.next_watering_at(물주기 예정일)을 last_watered_at / 도감 물주기 유형 / 미루기 상태로 다시 계산하고,
+    notification_minute(알림 시각 버킷)을 notification_time 기준으로 맞춥니다.
+    식물 id 순서로 배치 처리하므로 몇 번 실행해도 안전합니다.
+    """
+    db = SessionLocal()
+    try:
+        last_id = 0
+        total = 0
+        while True:
+            plant_ids = [
+                row.id for row in db.query(models.Plant.id)
+                .filter(models.Plant.id > last_id)
+                .order_by(models.Plant.id.asc())
+                .limit(BATCH_SIZE)
+                .all()
+            ]
+            if not plant_ids:
+                break
+            total += crud.recompute_next_watering(db, plant_ids)
+            db.commit()
+            last_id = plant_ids[-1]
+            print(f"  - {total}개 식물 처리 (마지막 id={last_id})")
+        # 알림 시각 버킷(notification_minute)도 함께 맞춰 둠
+        minute_total = crud.recompute_notification_minutes(db)
+        print(f"  - 알림 시각 버킷 {minute_total}개 갱신")
+    finally:
+        db.close()
+
+    print("-" * 50)
+    print(f"✅ 물주기 예정일 백필 완료: 총 {total}개")
+    print("-" * 50)
+
+if __name__ == "__main__":
+    backfill_next_watering()
@@ -0,0 +1,165 @@
+"""
+검색어 오타 교정(services/fuzzy.py) 벤치마크 — 도감 크기별 지연 시간
+
+도감 크기마다 가상 식물 이름(한글 이름 + 라틴 학명)으로 사전을 만들고,
+사전 단어에 오타 1~2개를 넣은 검색어로 Corrector.lookup()을 반복 실행해
+빌드 시간 / 최대 메모리 / 삭제 키 수 / 조회 지연(p50, p95, p99, 최대) / 교정 성공률을 출력합니다.
+--naive-max 이하 크기에서는 사전 전체를 편집 거리로 훑는 방식과 비교합니다. (도감이 커질수록 차이가 벌어짐)
+DB 없이 실행됩니다.
+
+사용법:
+  python scripts/bench_fuzzy.py
+  python scripts/bench_fuzzy.py --sizes 1000,10000,100000 --queries 2000 --naive-max 10000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+# 프로젝트 루트 경로 설정
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from services.fuzzy import Corrector, edit_distance, tokenize
+from utils.hangul import decompose
+
+KO_SYLLABLES = "가나다라마바사아자차카타파하고노도로모보소오조초코토포호구누두루무부수우주추쿠투푸후스테리몬세베킨답서브"
+LATIN_SYLLABLES = ["ca", "lo", "mon", "ste", "ra", "fi", "cus", "del", "ic", "io", "sa", "an", "the", "ri", "um", "pho",
+                   "tos", "sce", "lla", "phi", "den", "dron", "al", "ba", "tri", "fas", "ci", "ata", "pe", "per", "o"]
+# 헷갈리기 쉬운 모음 (ㅔ↔ㅐ 등) — 한글 오타는 음절 하나의 모음을 바꿔서 만듦
+KO_VOWEL_SWAPS = {1: 5, 5: 1, 4: 8, 8: 4, 13: 18, 18: 13, 20: 18, 0: 4}
+
+
+def make_names(n: int, rng: random.Random):
+    """(한글 이름, 학명) n개 — 중복 없이"""
+    seen = set()
+    names = []
+    while len(names) < n:
+        ko = "".join(rng.choice(KO_SYLLABLES) for _ in range(rng.randint(2, 6)))
+        genus = "".join(rng.choice(LATIN_SYLLABLES) for _ in range(rng.randint(2, 4)))
+        epithet = "".join(rng.choice(LATIN_SYLLABLES) for _ in range(rng.randint(2, 4)))
+        species = f"{genus.capitalize()} {epithet}"
+        if (ko, species) in seen:
+            continue
+        seen.add((ko, species))
+        names.append((ko, species))
+    return names
+
+
+def ko_typo(word: str, rng: random.Random) -> str:
+    positions = [i for i, ch in enumerate(word) if 0xAC00 <= ord(ch) <= 0xD7A3]
+    i = rng.choice(positions)
+    offset = ord(word[i]) - 0xAC00
+    cho, rest = divmod(offset, 21 * 28)
+    jung, jong = divmod(rest, 28)
+    jung = KO_VOWEL_SWAPS.get(jung, (jung + 1) % 21)
+    return word[:i] + chr(0xAC00 + (cho * 21 + jung) * 28 + jong) + word[i + 1:]
+
+
+def latin_typo(word: str, rng: random.Random) -> str:
+    i = rng.randrange(len(word))
+    op = rng.choice(["delete", "insert", "substitute", "transpose"])
+    if op == "delete" and len(word) > 4:
+        return word[:i] + word[i + 1:]
+    if op == "transpose" and i < len(word) - 1:
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    letter = rng.choice("abcdefghijklmnopqrstuvwxyz")
+    if op == "insert":
+        return word[:i] + letter + word[i:]
+    return word[:i] + letter + word[i + 1:]
+
+
+def make_queries(terms, count: int, max_typos: int, rng: random.Random):
+    """(오타 단어, 원래 단어) 목록 — 오타 2개까지 교정하는 자모 7글자 이상 단어만 사용"""
+    pool = [t for t in terms if len(decompose(t)) >= 7]
+    queries = []
+    for _ in range(count):
+        word = rng.choice(pool)
+        typo = word
+        for _ in range(rng.randint(1, max_typos)):
+            typo = ko_typo(typo, rng) if "가" <= typo[0] <= "힣" else latin_typo(typo, rng)
+        queries.append((typo, word))
+    return queries
+
+
+def naive_lookup(keys, word: str, max_edit: int):
+    """비교용: 사전 전체를 편집 거리로 훑음"""
+    key = decompose(word)
+    best = None
+    for candidate in keys:
+        distance = edit_distance(key, candidate, max_edit)
+        if distance <= max_edit and (best is None or distance < best[0]):
+            best = (distance, candidate)
+    return best
+
+
+def percentile(values, p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+def run(size: int, args):
+    rng = random.Random(args.seed + size)
+    counts = Counter()
+    for ko, species in make_names(size, rng):
+        counts.update(set(tokenize(ko) + tokenize(species)))
+
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    corrector = Corrector(counts, max_edit=args.max_edit, prefix_length=args.prefix_length,
+                          max_candidates=args.max_candidates)
+    build_sec = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    queries = make_queries(list(counts), args.queries, args.max_typos, rng)
+    timings = []
+    hits = 0
+    for typo, word in queries:
+        t0 = time.perf_counter()
+        found = corrector.lookup(typo)
+        timings.append((time.perf_counter() - t0) * 1e6)
+        hits += found == word
+
+    naive_us = None
+    if size <= args.naive_max:
+        keys = [decompose(t) for t in counts]
+        sample = queries[:args.naive_queries]
+        t0 = time.perf_counter()
+        for typo, _ in sample:
+            naive_lookup(keys, typo, args.max_edit)
+        naive_us = (time.perf_counter() - t0) / len(sample) * 1e6
+
+    print(
+        f"{size:>9,} | {len(corrector):>8,} | {corrector.delete_count:>10,} | {build_sec:>7.2f}s | {peak / 1024 / 1024:>7.1f} | "
+        f"{statistics.median(timings):>7.1f} | {percentile(timings, 0.95):>7.1f} | {percentile(timings, 0.99):>7.1f} | "
+        f"{max(timings):>8.1f} | {hits / len(queries):>6.1%} | "
+        + (f"{naive_us:>10.1f}" if naive_us is not None else f"{'-':>10}")
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="검색어 오타 교정 벤치마크 (도감 크기별)")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="쉼표로 구분한 도감 크기(식물 수)")
+    parser.add_argument("--queries", type=int, default=2000, help="크기별 오타 검색어 수")
+    parser.add_argument("--max-typos", type=int, default=2, help="검색어 하나에 넣을 최대 오타 수")
+    parser.add_argument("--max-edit", type=int, default=2)
+    parser.add_argument("--prefix-length", type=int, default=8)
+    parser.add_argument("--max-candidates", type=int, default=100)
+    parser.add_argument("--naive-max", type=int, default=10_000, help="이 크기 이하에서만 전체 탐색과 비교")
+    parser.add_argument("--naive-queries", type=int, default=100, help="전체 탐색 비교에 쓸 검색어 수")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"오타 교정 벤치마크 (최대 편집 거리 {args.max_edit}, prefix {args.prefix_length}, 후보 상한 {args.max_candidates})")
+    print("   식물 수 |   단어 수 |    삭제 키 |    빌드 |    MiB |  p50 µs |  p95 µs |  p99 µs |   max µs | 교정률 | 전체탐색 µs")
+    print("-" * 118)
+    for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+        run(size, args)
+    print("-" * 118)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+물주기 알림 스케줄러 부하 시뮬레이션
+
+가상 사용자/식물/도감 데이터를 로컬 DB(기본: 임시 SQLite 파일, --db-url로 테스트용 MySQL 지정 가능)에 채운 뒤
+check_watering_schedules()의 대상 조회 + 발송을 가짜 FCM 전송기(FakeTransport)로 실행하고
+소요 시간 / 실행한 SQL 수 / 최대 메모리를 출력합니다.
+
+사용법:
+  python scripts/bench_scheduler.py --users 10000 --plants 100000
+  python scripts/bench_scheduler.py --plants 1000000 --mode outbox --db-url mysql+mysqlconnector://.../greenday_bench
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# 프로젝트 루트 경로 설정
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import models
+from core.constants import WATERING_CYCLE_MAP
+from database import Base, create_db_engine
+from services.push_sender import FakeTransport, PushDispatcher
+from services.watering import compute_next_watering_date
+import scheduler
+
+# 벤치마크에 필요한 테이블만 생성 (MySQL 전용 타입을 쓰는 다른 테이블은 SQLite에서 만들 수 없음)
+BENCH_TABLES = [
+    models.User.__table__,
+    models.PlantMaster.__table__,
+    models.Plant.__table__,
+    models.SchedulerLease.__table__,
+    models.SchedulerRun.__table__,
+    models.OutboxMessage.__table__,
+]
+INSERT_BATCH = 5000
+
+
+def seed(db: Session, args, today: date):
+    rng = random.Random(args.seed)
+    watering_types = list(WATERING_CYCLE_MAP) + [None] # 일부 도감은 물주기 정보 없음
+
+    masters = [
+        {
+            "id": i + 1,
+            "name_ko": f"식물{i + 1}",
+            "species": f"Plantus benchmarkii {i + 1}",
+            "difficulty": rng.choice(["상", "중", "하"]),
+            "light_requirement": rng.choice(["음지", "반음지", "양지"]),
+            "watering_type": rng.choice(watering_types),
+        }
+        for i in range(args.species)
+    ]
+    db.bulk_insert_mappings(models.PlantMaster, masters)
+
+    for start in range(0, args.users, INSERT_BATCH):
+        db.bulk_insert_mappings(models.User, [
+            {
+                "id": i + 1,
+                "username": f"user{i + 1}",
+                "email": f"user{i + 1}@bench.local",
+                "name": f"사용자{i + 1}",
+                "hashed_password": "x",
+                "is_verified": True,
+                # 일부 사용자는 푸시 토큰 없음
+                "push_token": f"token-{i + 1}" if rng.random() >= args.no_token_ratio else None,
+            }
+            for i in range(start, min(start + INSERT_BATCH, args.users))
+        ])
+
+    max_cycle = max(WATERING_CYCLE_MAP.values())
+    for start in range(0, args.plants, INSERT_BATCH):
+        rows = []
+        for i in range(start, min(start + INSERT_BATCH, args.plants)):
+            master = masters[rng.randrange(args.species)]
+            last_watered_at = datetime.combine(today, datetime.min.time()) - timedelta(
+                days=rng.randint(0, max_cycle), minutes=rng.randint(0, 1439)
+            )
+            rows.append({
+                "id": i + 1,
+                "name": f"반려식물{i + 1}",
+                "species": master["species"],
+                "owner_id": rng.randint(1, args.users),
+                "plant_master_id": master["id"],
+                "last_watered_at": last_watered_at,
+                "is_notification_enabled": rng.random() >= args.disabled_ratio,
+                "notification_time": "09:00",
+                "notification_minute": 540 if not args.spread_minutes else rng.randrange(1440),
+                "next_watering_at": compute_next_watering_date(last_watered_at, master["watering_type"]),
+            })
+        db.bulk_insert_mappings(models.Plant, rows)
+    db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="물주기 알림 스케줄러 부하 시뮬레이션")
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--plants", type=int, default=100_000)
+    parser.add_argument("--species", type=int, default=500)
+    parser.add_argument("--no-token-ratio", type=float, default=0.1, help="푸시 토큰이 없는 사용자 비율")
+    parser.add_argument("--disabled-ratio", type=float, default=0.1, help="알림을 끈 식물 비율")
+    parser.add_argument("--spread-minutes", action="store_true", help="알림 시각을 하루 전체에 분산 (기본: 모두 09:00)")
+    parser.add_argument("--dead-token-ratio", type=float, default=0.01, help="FCM이 만료로 응답할 토큰 비율")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="가짜 FCM 배치 호출 1회 지연")
+    parser.add_argument("--mode", choices=["direct", "outbox"], default="direct",
+                        help="direct: 스케줄러가 직접 발송 / outbox: 아웃박스 적재까지만 측정")
+    parser.add_argument("--db-url", default="", help="비우면 임시 SQLite 파일 사용")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    db_url = args.db_url
+    tmp_path = None
+    if not db_url:
+        fd, tmp_path = tempfile.mkstemp(suffix=".sqlite3", prefix="bench_scheduler_")
+        os.close(fd)
+        db_url = f"sqlite:///{tmp_path}"
+
+    engine = create_db_engine("bench", url=db_url)
+    Base.metadata.drop_all(engine, tables=BENCH_TABLES)
+    Base.metadata.create_all(engine, tables=BENCH_TABLES)
+    today = date.today()
+
+    print(f"데이터 생성: 사용자 {args.users:,} / 식물 {args.plants:,} / 도감 {args.species:,} ({db_url.split('://')[0]})")
+    t0 = time.perf_counter()
+    with Session(engine) as db:
+        seed(db, args, today)
+    print(f"  - 생성 완료 ({time.perf_counter() - t0:.1f}s)")
+
+    rng = random.Random(args.seed + 1)
+    dead_tokens = {f"token-{i + 1}" for i in range(args.users) if rng.random() < args.dead_token_ratio}
+    transport = FakeTransport(latency_sec=args.latency_ms / 1000, unregistered_tokens=dead_tokens)
+    dispatcher = PushDispatcher(transport=transport, backoff_base_sec=0) if args.mode == "direct" else None
+    if dispatcher is None:
+        # dispatcher 없이 호출하면 .env 설정과 무관하게 아웃박스 적재 경로를 타도록 고정
+        scheduler.settings.NOTIFICATIONS_VIA_OUTBOX = True
+
+    query_count = 0
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count_query(conn, cursor, statement, parameters, context, executemany):
+        nonlocal query_count
+        query_count += 1
+
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    with Session(engine) as db:
+        totals = scheduler.check_watering_schedules(dispatcher, today=today, db=db)
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print("-" * 50)
+    print(f"✅ 모드: {args.mode}")
+    print(f"  - 소요 시간: {elapsed:.2f}s")
+    print(f"  - SQL 실행 수: {query_count:,}")
+    print(f"  - 최대 메모리(tracemalloc): {peak / 1024 / 1024:.1f} MiB")
+    print(f"  - 알림 대상 사용자: {totals['users']:,} (대기열 {totals['queued']:,}, 성공 {totals['sent']:,}, 실패 {totals['failed']:,}, 만료 토큰 정리 {totals['pruned']:,})")
+    if dispatcher is not None:
+        print(f"  - FCM 배치 호출 수: {transport.batches:,}")
+    print("-" * 50)
+
+    engine.dispose()
+    if tmp_path:
+        os.remove(tmp_path)
+
+
+if __name__ == "__main__":
+    main()
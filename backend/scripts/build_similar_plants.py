@@ -0,0 +1,127 @@
+"""
+"함께 키우는 식물" 표(plant_similarities) 생성
+
+plants(owner_id, plant_master_id)를 사용자 id 구간별로 읽어 사용자×도감식물 희소 행렬(SciPy CSR)을 만들고,
+구간마다 Xᵀ·X를 누적해 도감식물×도감식물 동시 보유 행렬을 계산합니다. (전체 행을 메모리에 올리지 않음)
+유사도는 코사인(함께 키우는 사용자 수 / sqrt(각 식물 사용자 수 곱))이며, 식물별 상위 N개만 저장합니다.
+저장 후 도감 카탈로그 버전을 올려 실행 중인 API 서버들이 새 표를 다시 읽게 합니다.
+
+사용법:
+  python scripts/build_similar_plants.py --top-n 20 --min-co-owners 3
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import scipy.sparse as sp
+from sqlalchemy import delete, func, select
+
+# 프로젝트 루트 경로 설정
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import models
+from database import SessionLocal
+from services.catalog import bump_version
+
+INSERT_BATCH = 5000
+
+
+def build_co_ownership(db, user_chunk: int):
+    """(도감 id 배열, 동시 보유 행렬 CSR) — 대각 성분은 각 식물을 키우는 사용자 수"""
+    master_ids = np.array(sorted(db.scalars(select(models.PlantMaster.id))), dtype=np.int64)
+    n = len(master_ids)
+    co = sp.csr_matrix((n, n), dtype=np.int64)
+    if n == 0:
+        return master_ids, co
+    max_owner = db.scalar(select(func.max(models.Plant.owner_id))) or 0
+
+    total_rows = 0
+    for lo in range(0, max_owner, user_chunk):
+        rows = db.execute(
+            select(models.Plant.owner_id, models.Plant.plant_master_id)
+            .where(models.Plant.owner_id > lo, models.Plant.owner_id <= lo + user_chunk)
+            .distinct()
+        ).all()
+        if not rows:
+            continue
+        total_rows += len(rows)
+        pairs = np.array(rows, dtype=np.int64)
+        cols = np.searchsorted(master_ids, pairs[:, 1])
+        known = (cols < n) & (master_ids[np.minimum(cols, n - 1)] == pairs[:, 1])
+        users = pairs[known, 0] - lo - 1
+        x = sp.csr_matrix(
+            (np.ones(int(known.sum()), dtype=np.int64), (users, cols[known])),
+            shape=(user_chunk, n),
+        )
+        x.data[:] = 1 # 같은 종을 여러 그루 키워도 1
+        co = co + (x.T @ x).tocsr()
+        print(f"  - 사용자 id {lo + 1:,}~{lo + user_chunk:,} 처리 (누적 {total_rows:,}건)")
+    return master_ids, co
+
+
+def top_neighbors(master_ids: np.ndarray, co: sp.csr_matrix, top_n: int, min_co_owners: int):
+    """식물별 상위 top_n 유사 식물 행 목록"""
+    owners = co.diagonal().astype(np.float64)
+    co = co.tolil()
+    co.setdiag(0)
+    co = co.tocsr()
+    co.data[co.data < min_co_owners] = 0
+    co.eliminate_zeros()
+
+    # 코사인 유사도: 행/열을 각각 sqrt(보유 사용자 수)로 나눔 (co와 같은 희소 구조 유지)
+    inv = np.zeros_like(owners)
+    np.divide(1.0, np.sqrt(owners), out=inv, where=owners > 0)
+    row_of = np.repeat(np.arange(co.shape[0]), np.diff(co.indptr))
+    sim_data = co.data * inv[row_of] * inv[co.indices]
+
+    rows = []
+    for i in range(co.shape[0]):
+        start, end = co.indptr[i], co.indptr[i + 1]
+        if start == end:
+            continue
+        cols, scores, counts = co.indices[start:end], sim_data[start:end], co.data[start:end]
+        k = min(top_n, len(cols))
+        top = np.argpartition(-scores, k - 1)[:k] if len(cols) > k else np.arange(len(cols))
+        # 점수 내림차순, 동률이면 함께 키우는 사용자 수가 많은 순
+        top = top[np.lexsort((-counts[top], -scores[top]))]
+        for rank, j in enumerate(top, start=1):
+            rows.append({
+                "plant_master_id": int(master_ids[i]),
+                "rank": rank,
+                "similar_master_id": int(master_ids[cols[j]]),
+                "score": round(float(scores[j]), 6),
+                "co_owners": int(counts[j]),
+            })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="함께 키우는 식물(아이템-아이템) 추천 표 생성")
+    parser.add_argument("--top-n", type=int, default=20, help="식물별 저장할 유사 식물 수")
+    parser.add_argument("--min-co-owners", type=int, default=2, help="이보다 적은 사용자가 함께 키우는 쌍은 제외")
+    parser.add_argument("--user-chunk", type=int, default=50_000, help="한 번에 읽을 사용자 id 구간 크기")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    db = SessionLocal()
+    try:
+        master_ids, co = build_co_ownership(db, args.user_chunk)
+        rows = top_neighbors(master_ids, co, args.top_n, args.min_co_owners)
+
+        # 표 전체 교체 + 카탈로그 버전 증가를 한 트랜잭션으로
+        db.execute(delete(models.PlantSimilarity))
+        for i in range(0, len(rows), INSERT_BATCH):
+            db.bulk_insert_mappings(models.PlantSimilarity, rows[i:i + INSERT_BATCH])
+        bump_version(db)
+        db.commit()
+    finally:
+        db.close()
+
+    print("-" * 50)
+    print(f"✅ 함께 키우는 식물 표 생성 완료: 도감 {len(master_ids):,}종, {len(rows):,}행 ({time.perf_counter() - t0:.1f}s)")
+    print("-" * 50)
+
+
+if __name__ == "__main__":
+    main()
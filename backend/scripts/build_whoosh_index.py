@@ -1,83 +1,99 @@
+"""
+도감 검색 인덱스 전체 빌드 (블루/그린)
+
+1. SEARCH_INDEX_DIR 아래 새 버전 디렉터리(v-YYYYmmdd-HHMMSS-ffffff)를 만들고
+2. plants_master를 id 순으로 batch-size행씩 읽어 Whoosh 멀티프로세스 writer(procs, limitmb)로 색인한 뒤
+3. `current` 심볼릭 링크를 새 버전으로 원자적으로 바꿉니다. (API 워커들은 다음 refresh 때 새 인덱스로 교체)
+4. 빌드 중 증분 갱신은 이전 버전에 기록되었으므로, 전환 직후 DB와 대조(reconcile)해 빠진 변경을 맞춥니다.
+검색 중인 인덱스에는 손대지 않으므로 빌드 도중에도 반쯤 만들어진 인덱스가 노출되지 않습니다.
+
+사용법:
+  python scripts/build_whoosh_index.py --procs 4 --limitmb 256 --keep 2
+"""
+import argparse
 import os
 import sys
-from sqlalchemy import create_engine
-import pandas as pd
-from whoosh.index import create_in, open_dir
-from whoosh.fields import Schema, TEXT, ID, KEYWORD, BOOLEAN
-from whoosh.analysis import NgramTokenizer # 한글 검색을 위한 분석기
+import time
+
+from whoosh.index import create_in
 
 # 프로젝트 루트 경로 설정
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import models
 from core.config import settings
+from database import SessionLocal
+from services import search_index
+
+
+def iter_plant_rows(db, batch_size: int):
+    """plants_master를 id 키셋으로 나눠 읽음 (ORM 객체 대신 필요한 컬럼만)"""
+    columns = [models.PlantMaster.id] + [getattr(models.PlantMaster, f) for f in search_index.DOCUMENT_FIELDS]
+    last_id = 0
+    while True:
+        rows = (
+            db.query(*columns)
+            .filter(models.PlantMaster.id > last_id)
+            .order_by(models.PlantMaster.id.asc())
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            break
+        yield from rows
+        last_id = rows[-1].id
+
+
+def build_index(procs: int, limitmb: int, batch_size: int, keep: int):
+    """새 버전 디렉터리에 인덱스를 만들고 current를 전환합니다."""
+    os.makedirs(settings.SEARCH_INDEX_DIR, exist_ok=True)
+    path = search_index.new_version_dir()
+    t0 = time.perf_counter()
 
-DATABASE_URL = settings.DB_URL
-INDEX_DIR = "indexdir" # Whoosh 인덱스 파일이 저장될 폴더 이름
-
-def define_schema():
-    """Whoosh 인덱스 스키마 (검색할 필드 정의)"""
-    # NgramTokenizer: '몬스테라'를 '몬스', '스테', '테라', '라' 등으로 분리하여 부분 검색 지원
-    ngram_analyzer = NgramTokenizer(minsize=1, maxsize=3) # 1~3글자 단위로 분리
-
-    return Schema(
-        id=ID(stored=True, unique=True), # DB ID (결과 반환용)
-        name_ko=TEXT(stored=True, analyzer=ngram_analyzer), # 한글 이름 (검색 대상)
-        name_en=TEXT(stored=True),
-        species=KEYWORD(stored=True), # 학명 (정확히 일치)
-        description=TEXT(analyzer=ngram_analyzer), # 설명 (검색 대상)
-        # 검색 필터링에 사용할 수 있는 필드들
-        difficulty=KEYWORD(stored=True),
-        light_requirement=KEYWORD(stored=True),
-        pet_safe=BOOLEAN(stored=True)
-    )
-
-def build_index():
-    """DB 데이터를 읽어 Whoosh 인덱스를 생성/업데이트합니다."""
-    if not DATABASE_URL:
-        raise ValueError(".env 파일에 DB_URL이 설정되어야 합니다.")
-
-    print("DB에서 식물 데이터를 로드합니다...")
-    engine = create_engine(DATABASE_URL)
-    df = pd.read_sql("SELECT * FROM plants_master", engine)
-    print(f"{len(df)}개의 식물 데이터를 로드했습니다.")
-
-    # 인덱스 디렉토리 생성
-    if not os.path.exists(INDEX_DIR):
-        os.mkdir(INDEX_DIR)
-
-    # 스키마 정의 및 인덱스 생성 (기존 파일이 있으면 덮어씀)
-    schema = define_schema()
-    ix = create_in(INDEX_DIR, schema)
-    writer = ix.writer()
-
-    print("Whoosh 인덱스 생성을 시작합니다...")
+    ix = create_in(path, search_index.define_schema())
+    # procs > 1이면 하위 프로세스들이 세그먼트를 나눠 만들고 commit 때 병합
+    writer = ix.writer(procs=procs, limitmb=limitmb, multisegment=procs > 1)
+
+    print(f"Whoosh 인덱스 생성을 시작합니다... ('{path}', procs={procs}, limitmb={limitmb})")
     added_count = 0
-    for index, row in df.iterrows():
-        # NaN 값을 None으로 변환
-        doc = {
-            "id": str(row["id"]), # ID는 문자열로 저장
-            "name_ko": row["name_ko"],
-            "name_en": row["name_en"],
-            "species": row["species"],
-            "description": row["description"],
-            "difficulty": row["difficulty"],
-            "light_requirement": row["light_requirement"],
-            # pet_safe가 None/NaN이면 False로 처리
-            "pet_safe": bool(row["pet_safe"]) if pd.notna(row["pet_safe"]) else False
-        }
-        # None 값 필드 제거
-        doc_cleaned = {k: v for k, v in doc.items() if pd.notna(v)}
-        try:
-            writer.add_document(**doc_cleaned)
-            added_count += 1
-        except Exception as e:
-            print(f"Error adding document ID {row['id']}: {e}")
-
-    print(f"{added_count}개 문서 인덱싱 중...")
-    writer.commit()
+    try:
+        with SessionLocal() as db:
+            for row in iter_plant_rows(db, batch_size):
+                writer.add_document(**search_index.plant_document(row))
+                added_count += 1
+                if added_count % 10000 == 0:
+                    print(f"  - {added_count:,}개 문서 추가")
+        print(f"{added_count:,}개 문서 인덱싱 중...")
+        writer.commit()
+    except BaseException:
+        writer.cancel()
+        raise
+
+    search_index.activate_version(path)
+    print(f"  - 'current' → {os.path.basename(path)} 전환 ({time.perf_counter() - t0:.1f}s)")
+
+    # 빌드 중 들어온 증분 변경 보정
+    with SessionLocal() as db:
+        diff = search_index.reconcile(iter_plant_rows(db, batch_size))
+    print(f"  - 빌드 중 변경 보정: 추가 {len(diff['missing'])}, 수정 {len(diff['changed'])}, 삭제 {len(diff['extra'])}")
+
+    removed = search_index.prune_versions(keep)
+    if removed:
+        print(f"  - 이전 버전 {len(removed)}개 삭제")
 
     print("-" * 50)
-    print(f"✅ Whoosh 인덱스 생성이 완료되었습니다. ('{INDEX_DIR}' 폴더)")
+    print(f"✅ Whoosh 인덱스 생성이 완료되었습니다. ('{path}', {added_count:,}개 문서)")
     print("-" * 50)
 
+
+def main():
+    parser = argparse.ArgumentParser(description="도감 검색 인덱스 전체 빌드 (블루/그린)")
+    parser.add_argument("--procs", type=int, default=max(1, (os.cpu_count() or 1) - 1), help="Whoosh writer 프로세스 수")
+    parser.add_argument("--limitmb", type=int, default=256, help="writer 프로세스당 메모리 한도(MB)")
+    parser.add_argument("--batch-size", type=int, default=2000, help="DB에서 한 번에 읽을 행 수")
+    parser.add_argument("--keep", type=int, default=2, help="남겨 둘 버전 수 (활성 버전 포함)")
+    args = parser.parse_args()
+    build_index(args.procs, args.limitmb, args.batch_size, args.keep)
+
+
 if __name__ == "__main__":
-    build_index()
\ No newline at end of file
+    main()
@@ -0,0 +1,59 @@
+"""
+도감 DB ↔ Whoosh 검색 인덱스 대조
+
+plants_master를 id 순으로 나눠 읽으며 인덱스의 저장 필드(fingerprint)와 비교하고,
+인덱스에 없거나 내용이 다르거나 DB에서 삭제된 문서를 맞춥니다. (전체 재빌드 없이)
+
+사용법:
+  python scripts/reconcile_whoosh_index.py            # 차이를 반영
+  python scripts/reconcile_whoosh_index.py --dry-run  # 차이만 출력
+"""
+import argparse
+import os
+import sys
+
+# 프로젝트 루트 경로 설정
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import models
+from database import SessionLocal
+from services import search_index
+
+BATCH_SIZE = 1000
+
+
+def iter_master_plants(db):
+    last_id = 0
+    while True:
+        rows = (
+            db.query(models.PlantMaster)
+            .filter(models.PlantMaster.id > last_id)
+            .order_by(models.PlantMaster.id.asc())
+            .limit(BATCH_SIZE)
+            .all()
+        )
+        if not rows:
+            break
+        yield from rows
+        last_id = rows[-1].id
+        db.expunge_all() # 이미 넘긴 행은 세션에서 해제
+
+
+def main():
+    parser = argparse.ArgumentParser(description="도감 DB와 검색 인덱스 대조")
+    parser.add_argument("--dry-run", action="store_true", help="인덱스를 바꾸지 않고 차이만 출력")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        diff = search_index.reconcile(iter_master_plants(db), dry_run=args.dry_run)
+
+    print("-" * 50)
+    print(f"{'🔍 (dry-run) ' if args.dry_run else '✅ '}검색 인덱스 대조 완료 ('{search_index.index_dir()}')")
+    for key, label in (("missing", "인덱스에 없음"), ("changed", "내용 다름"), ("extra", "DB에 없음")):
+        ids = diff[key]
+        preview = ", ".join(ids[:20]) + (" ..." if len(ids) > 20 else "")
+        print(f"  - {label}: {len(ids)}건{f' ({preview})' if ids else ''}")
+    print("-" * 50)
+
+
+if __name__ == "__main__":
+    main()
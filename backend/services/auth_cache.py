@@ -0,0 +1,101 @@
+# services/auth_cache.py
+"""
+JWT → 로그인 사용자(Principal) 프로세스 로컬 캐시 (TTL + LRU)
+
+get_current_user가 요청마다 users 테이블을 조회하던 것을 토큰 단위로 캐시합니다.
+- 값은 세션과 분리된 가벼운 스냅샷(Principal)이라 요청/세션이 끝나도 안전하게 재사용됩니다.
+- 엔트리 수명 = min(PRINCIPAL_CACHE_TTL_SECONDS, 토큰 만료 시각)
+- 비밀번호 변경 / 푸시 토큰 변경 / 회원 탈퇴 시 crud에서 invalidate_user()를 호출합니다.
+  (워커가 여러 개면 다른 워커는 TTL이 지나야 반영되므로 TTL은 짧게 유지)
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple
+
+from cachetools import TTLCache
+
+from core.config import settings
+
+
+@dataclass(frozen=True)
+class Principal:
+    """get_current_user가 반환하는 사용자 스냅샷 (ORM 객체 아님)"""
+    id: int
+    email: str
+    username: str
+    name: str
+    is_verified: bool
+    push_token: Optional[str] = None
+
+    @classmethod
+    def from_user(cls, user: Any) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            username=user.username,
+            name=user.name,
+            is_verified=bool(user.is_verified),
+            push_token=user.push_token,
+        )
+
+
+_lock = threading.Lock()
+# key: sha256(token) → (Principal, 토큰 만료 epoch 초)
+_cache: "TTLCache[str, Tuple[Principal, float]]" = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAXSIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+# 무효화가 일어날 때마다 증가. DB 조회 도중 무효화된 사용자가 다시 캐시되는 것을 막음
+_generation = 0
+
+
+def _key(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def generation() -> int:
+    return _generation
+
+
+def get(token: str) -> Optional[Principal]:
+    key = _key(token)
+    with _lock:
+        entry = _cache.get(key)
+        if entry is None:
+            return None
+        principal, expires_at = entry
+        if expires_at <= time.time():
+            _cache.pop(key, None)
+            return None
+        return principal
+
+
+def put(token: str, principal: Principal, expires_at: Optional[float], seen_generation: int) -> None:
+    """seen_generation: DB 조회 전에 읽어 둔 generation() 값"""
+    if expires_at is None:
+        expires_at = time.time() + settings.PRINCIPAL_CACHE_TTL_SECONDS
+    with _lock:
+        if seen_generation != _generation:
+            return
+        _cache[_key(token)] = (principal, float(expires_at))
+
+
+def invalidate_user(user_id: int) -> None:
+    """해당 사용자의 모든 토큰 엔트리를 제거합니다. (쓰기 경로에서만 호출되므로 선형 탐색으로 충분)"""
+    global _generation
+    with _lock:
+        _generation += 1
+        stale = [k for k, (p, _) in _cache.items() if p.id == user_id]
+        for k in stale:
+            _cache.pop(k, None)
+
+
+def clear() -> None:
+    global _generation
+    with _lock:
+        _generation += 1
+        _cache.clear()
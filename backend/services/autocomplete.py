@@ -0,0 +1,119 @@
+"""
+도감 자동완성 (입력 중 추천)
+
+인메모리 카탈로그의 이름들로 키를 만들어 키 길이별 정렬 배열에 담고, 접두사는 bisect로 찾습니다.
+키 (공백 제거, 소문자):
+- name_ko의 자모 분해 ("몬스테라" → "ㅁㅗㄴㅅㅡㅌㅔㄹㅏ") — 입력 중인 "몬ㅅ", "모"도 접두사로 일치
+- name_ko의 초성 ("ㅁㅅㅌㄹ")
+- name_en / species (영문)
+각 키는 이름 전체와 단어 시작 위치부터의 접미사("몬스테라 알보" → "알보")를 모두 넣습니다.
+검색어도 같은 방식(자모 분해)으로 바꾸므로 한글/초성/영문 모두 같은 이진 탐색으로 찾고,
+Whoosh 쿼리 파싱이나 DB 조회는 하지 않습니다. 카탈로그가 바뀌었을 때만 배열을 다시 만듭니다.
+"""
+import heapq
+import logging
+import threading
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from services import catalog
+from services.catalog import Catalog, PlantSnapshot
+from utils.hangul import choseong, decompose
+
+logger = logging.getLogger(__name__)
+
+_KEY_END = "\U0010ffff" # 접두사 + 이 문자 = 그 접두사로 시작하는 모든 키보다 큼
+
+
+def normalize(text: str) -> str:
+    """키/검색어 공통 정규화: 소문자 + 자모 분해 + 공백 제거"""
+    return "".join(decompose(text.lower()).split())
+
+
+def _word_suffixes(name: str) -> List[str]:
+    """"몬스테라 알보" → ["몬스테라 알보", "알보"]"""
+    words = name.split()
+    return [" ".join(words[i:]) for i in range(len(words))]
+
+
+def index_keys(plant: PlantSnapshot) -> Set[str]:
+    keys: Set[str] = set()
+    for suffix in _word_suffixes(plant.name_ko or ""):
+        keys.add(normalize(suffix))
+        keys.add(normalize(choseong(suffix)))
+    for name in (plant.name_en, plant.species):
+        for suffix in _word_suffixes(name or ""):
+            keys.add(normalize(suffix))
+    keys.discard("")
+    return keys
+
+
+class Suggester:
+    """
+    키 길이별로 (키, 식물 id)를 키 순으로 정렬한 배열 — 각 배열에서 접두사 구간은 bisect 두 번으로 찾음
+    짧은 키의 배열부터 보므로 검색어와 정확히 같은 키 → 짧은 키 순서가 되고, 결과가 limit개 차면 멈춤
+    """
+
+    def __init__(self, plants: Iterable[PlantSnapshot]):
+        by_length: Dict[int, List[Tuple[str, int]]] = {}
+        for key, plant_id in {(key, p.id) for p in plants for key in index_keys(p)}:
+            by_length.setdefault(len(key), []).append((key, plant_id))
+        self._lengths: List[int] = sorted(by_length)
+        # 키 길이 → (키 배열, 식물 id 배열)
+        self._buckets: Dict[int, Tuple[List[str], List[int]]] = {}
+        for length, entries in by_length.items():
+            entries.sort()
+            self._buckets[length] = ([key for key, _ in entries], [plant_id for _, plant_id in entries])
+
+    def __len__(self) -> int:
+        return sum(len(keys) for keys, _ in self._buckets.values())
+
+    def suggest(self, q: str, limit: int) -> List[int]:
+        """
+        접두사가 일치하는 식물 id 최대 limit개.
+        순서: 키가 검색어와 정확히 같은 식물 → 일치한 키가 짧은 식물 → 같은 길이면 id 순 (식물마다 가장 짧은 키 기준)
+        """
+        prefix = normalize(q)
+        if not prefix:
+            return []
+        found: List[int] = []
+        seen: Set[int] = set()
+        for length in self._lengths[bisect_left(self._lengths, len(prefix)):]:
+            keys, ids = self._buckets[length]
+            lo = bisect_left(keys, prefix)
+            hi = bisect_left(keys, prefix + _KEY_END, lo)
+            matched = {ids[i] for i in range(lo, hi)} - seen
+            found.extend(heapq.nsmallest(limit - len(found), matched))
+            if len(found) >= limit:
+                break
+            seen |= matched
+        return found
+
+
+# --- 프로세스 로컬 상태 (카탈로그 스냅샷마다 한 번 빌드) ---
+
+_lock = threading.Lock()
+_built: Optional[Tuple[Catalog, Suggester]] = None
+
+
+def get_suggester(current: Catalog) -> Suggester:
+    global _built
+    built = _built
+    if built is not None and built[0] is current:
+        return built[1]
+    with _lock:
+        if _built is None or _built[0] is not current:
+            suggester = Suggester(current.plants)
+            _built = (current, suggester)
+            logger.info("자동완성 키 %d개 생성 (카탈로그 버전 %d)", len(suggester), current.version)
+        return _built[1]
+
+
+def warm() -> None:
+    """서버 시작 시 미리 빌드 (첫 입력에서 빌드 비용을 치르지 않도록)"""
+    get_suggester(catalog.get_catalog())
+
+
+def suggest(q: str, limit: int = 10) -> List[PlantSnapshot]:
+    current = catalog.get_catalog()
+    return [current.by_id[plant_id] for plant_id in get_suggester(current).suggest(q, limit)]
@@ -0,0 +1,287 @@
+# services/catalog.py
+"""
+식물 도감(PlantMaster) 인메모리 카탈로그
+
+plants_master는 수십~수천 행의 거의 읽기 전용 테이블이므로 프로세스마다 한 번 읽어
+불변 스냅샷(PlantSnapshot)과 인덱스(id / 학명 / 난이도 / 채광 / 반려동물 안전)로 들고 있습니다.
+(오프라인으로 계산한 "함께 키우는 식물" 표(plant_similarities)도 같이 읽어 둠)
+- 도감 목록/상세, 추천 API는 DB를 조회하지 않고 get_catalog()만 사용합니다.
+- 도감이 바뀌면 catalog_versions의 버전을 올리고(bump_version, 변경과 같은 트랜잭션),
+  각 프로세스는 백그라운드 스레드가 버전을 주기적으로 확인해 바뀌었을 때만 다시 읽습니다.
+  (같은 프로세스 안의 변경은 invalidate()로 즉시 반영)
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+import models
+from core.config import settings
+from database import SessionLocal
+from utils.pagination import decode_cursor, encode_cursor
+
+logger = logging.getLogger(__name__)
+
+CATALOG_NAME = "plants_master"
+
+# MySQL ENUM은 정의 순서로 정렬되므로 같은 순서를 유지
+_ENUM_ORDER = {
+    "difficulty": {"상": 0, "중": 1, "하": 2},
+    "light_requirement": {"음지": 0, "반음지": 1, "양지": 2},
+}
+SORT_COLUMNS = ("id", "name_ko", "species", "difficulty", "light_requirement", "created_at")
+
+
+@dataclass(frozen=True)
+class PlantSnapshot:
+    """PlantMaster 한 행의 불변 스냅샷 (응답 스키마의 from_attributes로 그대로 직렬화 가능)"""
+    id: int
+    name_ko: str
+    name_en: Optional[str]
+    species: str
+    family: Optional[str]
+    image_url: Optional[str]
+    description: Optional[str]
+    difficulty: str
+    light_requirement: str
+    watering_type: Optional[str]
+    pet_safe: Optional[bool]
+    tags: Optional[Tuple[Any, ...]]
+    created_at: Optional[datetime]
+
+    @classmethod
+    def from_row(cls, row: models.PlantMaster) -> "PlantSnapshot":
+        values = {f.name: getattr(row, f.name) for f in fields(cls)}
+        if isinstance(values["tags"], list):
+            values["tags"] = tuple(values["tags"])
+        return cls(**values)
+
+
+@dataclass(frozen=True)
+class SimilarPlant:
+    """함께 키우는 식물 (plant_similarities 한 행)"""
+    plant_id: int
+    score: float
+    co_owners: int
+
+
+def _sort_key(column: str):
+    order = _ENUM_ORDER.get(column)
+    if order is not None:
+        return lambda value: (order.get(value, len(order)), value)
+    if column == "created_at":
+        return lambda value: value or datetime.min
+    return lambda value: value
+
+
+class Catalog:
+    def __init__(
+        self,
+        plants: List[PlantSnapshot],
+        version: int,
+        similar: Optional[Dict[int, Tuple[SimilarPlant, ...]]] = None,
+    ):
+        self.version = version
+        self.similar: Dict[int, Tuple[SimilarPlant, ...]] = similar or {}
+        self.plants: Tuple[PlantSnapshot, ...] = tuple(sorted(plants, key=lambda p: p.id))
+        self.by_id: Dict[int, PlantSnapshot] = {p.id: p for p in self.plants}
+        self.by_species: Dict[str, PlantSnapshot] = {p.species: p for p in self.plants}
+        self.ids_by_difficulty: Dict[str, FrozenSet[int]] = self._group("difficulty")
+        self.ids_by_light: Dict[str, FrozenSet[int]] = self._group("light_requirement")
+        self.pet_safe_ids: FrozenSet[int] = frozenset(p.id for p in self.plants if p.pet_safe)
+        # 정렬 컬럼별로 (정렬 키, id) 순서를 미리 계산
+        self._sorted: Dict[str, Tuple[PlantSnapshot, ...]] = {
+            column: tuple(sorted(self.plants, key=lambda p, k=_sort_key(column), c=column: (k(getattr(p, c)), p.id)))
+            for column in SORT_COLUMNS
+        }
+
+    def _group(self, attr: str) -> Dict[str, FrozenSet[int]]:
+        groups: Dict[str, set] = {}
+        for p in self.plants:
+            groups.setdefault(getattr(p, attr), set()).add(p.id)
+        return {key: frozenset(ids) for key, ids in groups.items()}
+
+    def get(self, plant_id: int) -> Optional[PlantSnapshot]:
+        return self.by_id.get(plant_id)
+
+    def get_by_species(self, species: str) -> Optional[PlantSnapshot]:
+        return self.by_species.get(species)
+
+    def similar_to(self, plant_id: int) -> Tuple[SimilarPlant, ...]:
+        """함께 키우는 식물 (순위 순, 도감에서 빠진 식물 제외)"""
+        return tuple(s for s in self.similar.get(plant_id, ()) if s.plant_id in self.by_id)
+
+    def filter_ids(
+        self,
+        pet_safe: Optional[bool] = None,
+        difficulty: Optional[str] = None,
+        light_requirement: Optional[str] = None,
+    ) -> Optional[FrozenSet[int]]:
+        """조건에 맞는 id 집합 (조건이 없으면 None = 전체)"""
+        ids: Optional[FrozenSet[int]] = None
+        if pet_safe is True:
+            ids = self.pet_safe_ids
+        if difficulty:
+            group = self.ids_by_difficulty.get(difficulty, frozenset())
+            ids = group if ids is None else ids & group
+        if light_requirement:
+            group = self.ids_by_light.get(light_requirement, frozenset())
+            ids = group if ids is None else ids & group
+        return ids
+
+    def page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        pet_safe: Optional[bool] = None,
+        difficulty: Optional[str] = None,
+        light_requirement: Optional[str] = None,
+        sort_by: Optional[str] = None,
+        order: Optional[str] = "asc",
+    ) -> Tuple[List[PlantSnapshot], Optional[str]]:
+        """crud.get_all_master_plants와 같은 필터/정렬/커서 규칙을 메모리에서 처리"""
+        column = sort_by if sort_by in SORT_COLUMNS else "id"
+        desc = (order or "asc").lower() == "desc"
+        ids = self.filter_ids(pet_safe, difficulty, light_requirement)
+        rows = self._sorted[column]
+        if desc:
+            rows = tuple(reversed(rows))
+
+        key = _sort_key(column)
+        after = None
+        if cursor:
+            value, last_id = decode_cursor(cursor)
+            after = (key(value), last_id)
+
+        result: List[PlantSnapshot] = []
+        for p in rows:
+            if ids is not None and p.id not in ids:
+                continue
+            if after is not None:
+                current = (key(getattr(p, column)), p.id)
+                if (current <= after) if not desc else (current >= after):
+                    continue
+            result.append(p)
+            if len(result) > limit:
+                break
+
+        next_cursor = None
+        if len(result) > limit:
+            result = result[:limit]
+            last = result[-1]
+            next_cursor = encode_cursor(getattr(last, column), last.id)
+        return result, next_cursor
+
+
+# --- 버전 관리 ---
+
+def bump_version(db: Session, name: str = CATALOG_NAME) -> None:
+    """카탈로그 버전 +1 (commit은 호출자가 도감 변경과 함께)"""
+    Version = models.CatalogVersion
+    updated = db.execute(
+        update(Version).where(Version.name == name).values(version=Version.version + 1)
+    ).rowcount
+    if not updated:
+        try:
+            with db.begin_nested():
+                db.add(Version(name=name, version=1))
+        except IntegrityError:
+            db.execute(update(Version).where(Version.name == name).values(version=Version.version + 1))
+
+
+def _read_version(db: Session, name: str = CATALOG_NAME) -> int:
+    row = db.query(models.CatalogVersion.version).filter(models.CatalogVersion.name == name).first()
+    return row.version if row else 0
+
+
+# --- 프로세스 로컬 상태 ---
+
+_lock = threading.Lock()
+_catalog: Optional[Catalog] = None
+_dirty = False
+_last_check = 0.0
+_refresher: Optional[threading.Thread] = None
+
+
+def load(db: Optional[Session] = None) -> Catalog:
+    """DB에서 도감 전체와 버전을 읽어 현재 카탈로그로 교체합니다."""
+    global _catalog, _dirty, _last_check
+    own_session = db is None
+    db = db or SessionLocal()
+    try:
+        version = _read_version(db)
+        plants = [PlantSnapshot.from_row(row) for row in db.query(models.PlantMaster).all()]
+        similar = _load_similar(db)
+    finally:
+        if own_session:
+            db.close()
+    catalog = Catalog(plants, version, similar)
+    with _lock:
+        _catalog, _dirty, _last_check = catalog, False, time.monotonic()
+    logger.info("도감 카탈로그 로드: %d종 (버전 %d)", len(catalog.plants), version)
+    return catalog
+
+
+def _load_similar(db: Session) -> Dict[int, Tuple[SimilarPlant, ...]]:
+    Similarity = models.PlantSimilarity
+    groups: Dict[int, List[SimilarPlant]] = {}
+    rows = db.query(Similarity.plant_master_id, Similarity.similar_master_id, Similarity.score, Similarity.co_owners)\
+        .order_by(Similarity.plant_master_id, Similarity.rank)
+    for plant_id, similar_id, score, co_owners in rows:
+        groups.setdefault(plant_id, []).append(SimilarPlant(similar_id, score, co_owners))
+    return {plant_id: tuple(items) for plant_id, items in groups.items()}
+
+
+def get_catalog() -> Catalog:
+    """
+    현재 카탈로그. 백그라운드 갱신 스레드가 돌고 있으면 DB를 전혀 조회하지 않습니다.
+    (스레드가 없는 프로세스(스크립트 등)는 CATALOG_REFRESH_SEC마다 버전만 확인)
+    """
+    catalog = _catalog
+    if catalog is None or _dirty:
+        return load()
+    if _refresher is None and time.monotonic() - _last_check > settings.CATALOG_REFRESH_SEC:
+        return refresh_if_changed()
+    return catalog
+
+
+def refresh_if_changed() -> Catalog:
+    global _last_check
+    with SessionLocal() as db:
+        version = _read_version(db)
+        if _catalog is None or version != _catalog.version:
+            return load(db)
+    _last_check = time.monotonic()
+    return _catalog
+
+
+def invalidate() -> None:
+    """같은 프로세스에서 도감을 바꾼 직후 호출 → 다음 get_catalog()에서 다시 읽음"""
+    global _dirty
+    _dirty = True
+
+
+def start_refresher() -> None:
+    """CATALOG_REFRESH_SEC마다 버전을 확인하는 데몬 스레드 (API 서버 시작 시 1회)"""
+    global _refresher
+    if _refresher is not None:
+        return
+
+    def _loop():
+        while True:
+            time.sleep(settings.CATALOG_REFRESH_SEC)
+            try:
+                refresh_if_changed()
+            except Exception as e:
+                logger.warning("도감 카탈로그 버전 확인 실패: %s", e)
+
+    _refresher = threading.Thread(target=_loop, name="catalog-refresher", daemon=True)
+    _refresher.start()
@@ -0,0 +1,184 @@
+# services/chat_context.py
+"""
+챗봇 프롬프트 컨텍스트 구성 (토큰 예산 + 롤링 요약)
+
+- 최근 메시지부터 거꾸로 채워 넣되, 토큰 예산(CHAT_CONTEXT_MAX_TOKENS)을 넘지 않게 자릅니다.
+- 예산과 무관하게 최근 CHAT_CONTEXT_MIN_RECENT개 메시지는 항상 포함합니다.
+- 오래된 대화는 ChatThread.summary 에 누적 요약되며, CHAT_SUMMARY_EVERY개가 쌓일 때마다
+  '기존 요약 + 새 메시지'만 LLM에 보내 점진적으로 갱신합니다. (전체 재요약 X)
+=> 스레드가 길어져도 턴당 프롬프트 토큰이 일정하게 유지됩니다.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import models, crud_async
+from core.config import settings
+from database import get_async_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+# tiktoken이 있으면 정확히 세고, 없으면 보수적으로 추정합니다.
+try:
+    import tiktoken  # type: ignore
+    _encoding = tiktoken.get_encoding("o200k_base")
+except Exception:
+    _encoding = None
+
+SYSTEM_PROMPT = "당신은 식물 도우미 챗봇입니다. 한국어로 답하세요."
+
+_SUMMARY_SYSTEM_PROMPT = (
+    "당신은 대화 요약기입니다. '기존 요약'과 '새 대화'를 합쳐 하나의 한국어 요약으로 갱신하세요. "
+    "사용자의 식물 종류/상태, 이미 안내한 조치, 남은 질문 등 이후 답변에 필요한 사실만 남기고 "
+    "인사말이나 반복 내용은 버리세요. 요약문만 출력하세요."
+)
+
+MESSAGE_OVERHEAD_TOKENS = 4      # role/구분자 등 메시지당 고정 비용
+IMAGE_TOKEN_COST = 800           # 비전 입력 1장당 대략적인 비용
+SUMMARY_INPUT_CHARS = 1000       # 요약기에 넘길 메시지 1개당 최대 글자 수
+
+
+def count_tokens(text: Optional[str]) -> int:
+    """텍스트 토큰 수. tiktoken이 없으면 ASCII 4자=1토큰, 그 외(한글 등) 1자=1토큰으로 추정."""
+    if not text:
+        return 0
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def _message_tokens(m: models.ChatMessage) -> int:
+    # assistant 메시지는 응답 당시의 completion_tokens가 곧 본문 토큰 수
+    if m.role == "assistant" and m.tokens_out:
+        return m.tokens_out + MESSAGE_OVERHEAD_TOKENS
+    return count_tokens(m.content) + MESSAGE_OVERHEAD_TOKENS
+
+
+async def build_chat_messages(
+    db: AsyncSession,
+    thread: models.ChatThread,
+    current_msg: models.ChatMessage,
+    data_uri: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    OpenAI Chat 포맷의 messages를 만듭니다.
+    [system] + [system: 이전 대화 요약] + [최근 메시지들(과거→최신)]
+    current_msg는 flush된 상태여야 하며, data_uri가 있으면 이 메시지에만 이미지를 붙입니다.
+    """
+    budget = settings.CHAT_CONTEXT_MAX_TOKENS
+
+    head: List[Dict[str, Any]] = [{"role": "system", "content": SYSTEM_PROMPT}]
+    budget -= count_tokens(SYSTEM_PROMPT) + MESSAGE_OVERHEAD_TOKENS
+    if thread.summary:
+        summary_text = f"[이전 대화 요약]\n{thread.summary}"
+        head.append({"role": "system", "content": summary_text})
+        budget -= count_tokens(summary_text) + MESSAGE_OVERHEAD_TOKENS
+    if data_uri:
+        budget -= IMAGE_TOKEN_COST
+
+    # 최신 → 과거 순으로 필요한 만큼만 읽음 (요약에 포함된 메시지는 제외)
+    recent = await crud_async.get_recent_chat_messages(
+        db, thread.id, after_id=thread.summary_upto_id, limit=settings.CHAT_CONTEXT_FETCH_LIMIT
+    )
+
+    picked: List[models.ChatMessage] = []
+    for m in recent:
+        cost = _message_tokens(m)
+        if len(picked) >= settings.CHAT_CONTEXT_MIN_RECENT and cost > budget:
+            break
+        budget -= cost
+        picked.append(m)
+    picked.reverse()
+
+    messages = head
+    for m in picked:
+        if m.role == "user":
+            if data_uri and m.id == current_msg.id:
+                messages.append({
+                    "role": "user",
+                    "content": [
+                        {"type": "text", "text": m.content},
+                        {"type": "image_url", "image_url": {"url": data_uri}},
+                    ]
+                })
+            else:
+                messages.append({"role": "user", "content": m.content})
+        elif m.role == "assistant":
+            messages.append({"role": "assistant", "content": m.content})
+    return messages
+
+
+async def refresh_thread_summary(thread_id: int) -> None:
+    """
+    요약되지 않은 과거 메시지가 CHAT_SUMMARY_EVERY개 이상 쌓였으면 롤링 요약을 갱신합니다.
+    응답 이후 BackgroundTasks로 실행되므로 별도 세션을 엽니다. 실패해도 대화에는 영향 없음.
+    """
+    # 순환 import 방지 + OPENAI_API_KEY 검사를 실제 호출 시점으로 미룸
+    from services.openai_chat import openai_chat_complete
+
+    every = settings.CHAT_SUMMARY_EVERY
+    keep = settings.CHAT_SUMMARY_KEEP_RECENT
+
+    async with get_async_sessionmaker()() as db:
+        try:
+            thread = await db.get(models.ChatThread, thread_id)
+            if not thread:
+                return
+
+            # 요약 대상(every개) + 원문 유지분(keep개)까지만 읽으면 충분
+            pending = await crud_async.get_unsummarized_chat_messages(
+                db, thread_id, after_id=thread.summary_upto_id, limit=every + keep
+            )
+            if len(pending) < every + keep:
+                return
+
+            to_fold = pending[:every]
+            lines = []
+            for m in to_fold:
+                speaker = "사용자" if m.role == "user" else "도우미"
+                lines.append(f"{speaker}: {(m.content or '')[:SUMMARY_INPUT_CHARS]}")
+
+            prompt = (
+                f"[기존 요약]\n{thread.summary or '(없음)'}\n\n"
+                f"[새 대화]\n" + "\n".join(lines)
+            )
+            result = await openai_chat_complete(
+                [
+                    {"role": "system", "content": _SUMMARY_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt},
+                ],
+                max_tokens=settings.CHAT_SUMMARY_MAX_TOKENS,
+            )
+            summary = (result.get("text") or "").strip()
+            if not summary:
+                return
+
+            # 동시에 다른 요청이 먼저 갱신했으면 덮어쓰지 않음
+            Thread = models.ChatThread
+            result = await db.execute(
+                update(Thread)
+                .where(
+                    Thread.id == thread_id,
+                    Thread.summary_upto_id.is_(None)
+                    if thread.summary_upto_id is None
+                    else Thread.summary_upto_id == thread.summary_upto_id,
+                )
+                .values(
+                    summary=summary,
+                    summary_upto_id=to_fold[-1].id,
+                    # 요약 갱신은 '대화 활동'이 아니므로 목록 정렬 기준(updated_at)은 그대로 둠
+                    updated_at=Thread.updated_at,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+            if result.rowcount:
+                logger.info(f"chat thread {thread_id} 요약 갱신 (upto_id={to_fold[-1].id})")
+        except Exception as e:
+            await db.rollback()
+            logger.warning(f"chat thread {thread_id} 요약 갱신 실패: {e}")
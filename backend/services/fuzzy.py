@@ -0,0 +1,196 @@
+"""
+검색어 오타 교정 (SymSpell 방식 대칭 삭제 사전)
+
+도감 이름(name_ko / name_en / species)과 태그의 단어로 사전을 만들고, 각 단어의 앞 PREFIX_LENGTH글자에서
+최대 MAX_EDIT글자를 지운 문자열 → 원래 단어 목록을 미리 계산해 둡니다.
+검색어 단어도 똑같이 지워 본 문자열로 사전을 찾으면 편집 거리 MAX_EDIT 이내의 후보가 나오고,
+그 후보만 실제 편집 거리(인접 전치 포함)로 확인합니다.
+- 단어당 사전 조회 수는 사전 크기와 무관하게 Σ C(PREFIX_LENGTH, k) (k ≤ MAX_EDIT)
+- 확인하는 후보 수는 SEARCH_FUZZY_MAX_CANDIDATES로 제한
+한글은 자모로 분해해 비교하므로 "몬스태라" → "몬스테라"가 자모 1글자 차이로 잡힙니다.
+교정된 검색어는 원래 검색어와 OR로 묶어 검색합니다. (search_index.search_plants)
+"""
+import logging
+import re
+import threading
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from core.config import settings
+from services import catalog
+from services.catalog import Catalog, PlantSnapshot
+from utils.hangul import decompose
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"[0-9a-zㄱ-ㆎ가-힣]+")
+_MAX_QUERY_TOKENS = 8 # 검색어에서 교정을 시도할 최대 단어 수
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(unicodedata.normalize("NFC", text).lower())
+
+
+def _delete_levels(key: str, max_edit: int) -> List[Set[str]]:
+    """[0글자, 1글자, ..., max_edit글자를 지운 문자열 집합] (빈 문자열 제외)"""
+    levels = [{key}]
+    seen = {key}
+    for _ in range(max_edit):
+        level = {w[:i] + w[i + 1:] for w in levels[-1] if len(w) > 1 for i in range(len(w))} - seen
+        seen |= level
+        levels.append(level)
+    return levels
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """인접 전치를 포함한 편집 거리 (OSA). max_distance를 넘으면 max_distance + 1"""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    before: Optional[List[int]] = None
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if before is not None and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, before[j - 2] + 1)
+            cur[j] = value
+            row_min = min(row_min, value)
+        if row_min > max_distance:
+            return max_distance + 1
+        before, prev = prev, cur
+    return prev[-1] if prev[-1] <= max_distance else max_distance + 1
+
+
+class Corrector:
+    """단어 → 사전에서 가장 가까운 단어 (편집 거리, 같으면 많이 쓰인 단어 우선)"""
+
+    def __init__(
+        self,
+        terms: Mapping[str, int],
+        max_edit: int = 2,
+        prefix_length: int = 8,
+        max_candidates: int = 100,
+    ):
+        self.max_edit = max_edit
+        self.prefix_length = prefix_length
+        self.max_candidates = max_candidates
+        # 비교용 키(자모 분해) → (원래 단어, 빈도)
+        self._terms: Dict[str, Tuple[str, int]] = {}
+        for term, count in terms.items():
+            key = decompose(term)
+            known = self._terms.get(key)
+            if known is None or count > known[1]:
+                self._terms[key] = (term, count)
+        self._deletes: Dict[str, List[str]] = {}
+        for key in self._terms:
+            for level in _delete_levels(key[:prefix_length], max_edit):
+                for deleted in level:
+                    self._deletes.setdefault(deleted, []).append(key)
+
+    @classmethod
+    def from_plants(cls, plants: Iterable[PlantSnapshot], **kwargs) -> "Corrector":
+        """빈도 = 그 단어가 들어간 식물 수"""
+        counts: Counter = Counter()
+        for p in plants:
+            words: Set[str] = set()
+            for name in (p.name_ko, p.name_en, p.species):
+                words.update(tokenize(name or ""))
+            for tag in p.tags or ():
+                if isinstance(tag, str):
+                    words.update(tokenize(tag))
+            counts.update(words)
+        return cls(counts, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    @property
+    def delete_count(self) -> int:
+        return len(self._deletes)
+
+    def _max_edit_for(self, key: str) -> int:
+        # 짧은 단어는 1글자만 바꿔도 다른 단어가 되므로 허용 거리를 줄임 (자모 분해 후 길이 기준)
+        if len(key) < 4:
+            return 0
+        if len(key) < 7:
+            return min(1, self.max_edit)
+        return self.max_edit
+
+    def lookup(self, word: str) -> Optional[str]:
+        """사전 단어면 그대로, 아니면 허용 거리 안에서 가장 가까운 단어, 없으면 None"""
+        key = decompose(word)
+        known = self._terms.get(key)
+        if known is not None:
+            return known[0]
+        max_edit = self._max_edit_for(key)
+        if max_edit == 0:
+            return None
+
+        best: Optional[Tuple[int, int, str]] = None # (거리, -빈도, 단어)
+        checked: Set[str] = set()
+        for deleted_count, level in enumerate(_delete_levels(key[:self.prefix_length], max_edit)):
+            # 검색어에서 더 많이 지워야 닿는 후보는 이미 찾은 것보다 가까울 수 없음
+            if best is not None and deleted_count > best[0]:
+                break
+            for deleted in level:
+                for candidate in self._deletes.get(deleted, ()):
+                    if candidate in checked:
+                        continue
+                    if len(checked) >= self.max_candidates:
+                        return best[2] if best else None
+                    checked.add(candidate)
+                    limit = max_edit if best is None else best[0]
+                    distance = edit_distance(key, candidate, limit)
+                    if distance > limit:
+                        continue
+                    term, count = self._terms[candidate]
+                    rank = (distance, -count, term)
+                    if best is None or rank < best:
+                        best = rank
+        return best[2] if best else None
+
+    def correct(self, q: str) -> Optional[str]:
+        """오타로 보이는 단어를 바꾼 검색어. 바뀐 단어가 없으면 None"""
+        tokens = tokenize(q)[:_MAX_QUERY_TOKENS]
+        corrected = [self.lookup(token) or token for token in tokens]
+        if corrected == tokens:
+            return None
+        return " ".join(corrected)
+
+
+# --- 프로세스 로컬 상태 (카탈로그 스냅샷마다 한 번 빌드) ---
+
+_lock = threading.Lock()
+_built: Optional[Tuple[Catalog, Corrector]] = None
+
+
+def get_corrector(current: Catalog) -> Corrector:
+    global _built
+    built = _built
+    if built is not None and built[0] is current:
+        return built[1]
+    with _lock:
+        if _built is None or _built[0] is not current:
+            corrector = Corrector.from_plants(
+                current.plants,
+                max_edit=settings.SEARCH_FUZZY_MAX_EDIT,
+                prefix_length=settings.SEARCH_FUZZY_PREFIX_LENGTH,
+                max_candidates=settings.SEARCH_FUZZY_MAX_CANDIDATES,
+            )
+            _built = (current, corrector)
+            logger.info("오타 교정 사전: 단어 %d개, 삭제 키 %d개 (카탈로그 버전 %d)",
+                        len(corrector), corrector.delete_count, current.version)
+        return _built[1]
+
+
+def warm() -> None:
+    """서버 시작 시 미리 빌드"""
+    get_corrector(catalog.get_catalog())
+
+
+def correct(q: str) -> Optional[str]:
+    return get_corrector(catalog.get_catalog()).correct(q)
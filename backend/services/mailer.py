@@ -0,0 +1,112 @@
+# services/mailer.py
+"""
+이메일 템플릿 + SMTP 발송기
+
+- render_*(): API에서 아웃박스에 넣을 (제목, HTML)을 만듭니다.
+- SmtpSender: SMTP 연결 하나를 열어 두고 여러 메일에 재사용합니다.
+  (메일마다 접속/로그인하던 FastMail 방식 대비 배치 처리량이 높음)
+- SmtpPool: outbox_worker가 쓰는 발송기. SmtpSender size개를 돌려 쓰며 최대 size통을 동시에 보냅니다.
+"""
+import asyncio
+import logging
+from email.message import EmailMessage
+from typing import Optional, Tuple
+
+import aiosmtplib
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SMTP_TIMEOUT_SEC = 30
+
+
+def render_verification_code_email(code: str) -> Tuple[str, str]:
+    html = f"""<p>안녕하세요! Green Day에 오신 것을 환영합니다.</p>
+             <p>계정 인증을 완료하려면 아래 인증번호를 앱에 입력해주세요.</p>
+             <p style="font-size: 24px; font-weight: bold; color: #28a745;">{code}</p>
+             <p>이 인증번호는 10분간 유효합니다.</p>"""
+    return "[Green Day] 계정 인증번호 안내", html
+
+
+def render_password_reset_email(token: str) -> Tuple[str, str]:
+    html = f"""
+    <p>안녕하세요! Green Day 비밀번호 재설정 요청을 받았습니다.</p>
+    <p>아래 버튼을 클릭하여 비밀번호를 다시 설정해주세요.</p>
+    <a href="http://localhost:3000/reset-password?token={token}"
+       style="display:inline-block; padding:10px 20px; color:white; background-color:#28a745; text-decoration:none; border-radius:5px;">
+       비밀번호 재설정하기
+    </a>
+    """
+    return "[Green Day] 비밀번호 재설정 안내", html
+
+
+class SmtpSender:
+    """연결을 유지하며 재사용하는 SMTP 발송기. 연결이 끊기면 다음 발송 때 다시 접속합니다."""
+
+    def __init__(self):
+        self._smtp: Optional[aiosmtplib.SMTP] = None
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        smtp = aiosmtplib.SMTP(
+            hostname=settings.MAIL_SERVER,
+            port=settings.MAIL_PORT,
+            use_tls=settings.MAIL_SSL_TLS,
+            start_tls=settings.MAIL_STARTTLS,
+            timeout=SMTP_TIMEOUT_SEC,
+        )
+        await smtp.connect()
+        await smtp.login(settings.MAIL_USERNAME, settings.MAIL_PASSWORD)
+        return smtp
+
+    async def send(self, to: str, subject: str, html: str) -> None:
+        message = EmailMessage()
+        message["From"] = settings.MAIL_FROM
+        message["To"] = to
+        message["Subject"] = subject
+        message.set_content(html, subtype="html")
+
+        if self._smtp is None or not self._smtp.is_connected:
+            self._smtp = await self._connect()
+        try:
+            await self._smtp.send_message(message)
+        except aiosmtplib.SMTPServerDisconnected:
+            # 유휴 시간 초과 등으로 끊긴 연결 → 한 번만 다시 접속해서 재시도
+            self._smtp = await self._connect()
+            await self._smtp.send_message(message)
+
+    async def close(self) -> None:
+        if self._smtp is not None and self._smtp.is_connected:
+            try:
+                await self._smtp.quit()
+            except aiosmtplib.SMTPException as e:
+                logger.warning("SMTP 연결 종료 오류: %s", e)
+        self._smtp = None
+
+
+def is_permanent_smtp_error(error: Exception) -> bool:
+    """5xx 응답(수신자 없음 등)은 재시도해도 실패하므로 바로 종료"""
+    code = getattr(error, "code", None)
+    return isinstance(error, aiosmtplib.SMTPResponseException) and code is not None and 500 <= code < 600
+
+
+class SmtpPool:
+    """연결(SmtpSender) size개를 돌려 쓰는 발송기. 동시 발송 수는 size로 제한됩니다."""
+
+    def __init__(self, size: int):
+        self.size = max(1, size)
+        self._senders = [SmtpSender() for _ in range(self.size)]
+        self._idle: "asyncio.Queue[SmtpSender]" = asyncio.Queue()
+        for sender in self._senders:
+            self._idle.put_nowait(sender)
+
+    async def send(self, to: str, subject: str, html: str) -> None:
+        sender = await self._idle.get()
+        try:
+            await sender.send(to, subject, html)
+        finally:
+            self._idle.put_nowait(sender)
+
+    async def close(self) -> None:
+        for sender in self._senders:
+            await sender.close()
@@ -9,28 +9,17 @@ from typing import Tuple, Optional
 
 import httpx
 from PIL import Image
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
 import models
+from database import get_async_sessionmaker
 from utils.image_meta import compute_phash64, make_thumbnail_bytes
 from core import config
 
 logger = logging.getLogger(__name__)
 
-# --- DB engine / SessionLocal for internal DB reads (used only for bypass) ---
-# Note: we create these at module import time to avoid re-creating engine per call.
-_DB_URL = getattr(config.settings, "DB_URL", None)
-if not _DB_URL:
-
-    
-    # It's okay if DB_URL is missing in some dev contexts; DB bypass will fail gracefully.
-    _engine = None
-    SessionLocal = None
-else:
-    _engine = create_engine(_DB_URL, pool_pre_ping=True)
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=_engine)
-
 
 APP_ORIGIN = getattr(config.settings, "APP_ORIGIN", "http://127.0.0.1:8000").rstrip("/")
 
@@ -43,11 +32,8 @@ def build_absolute_url(path: str) -> str:
     return f"{APP_ORIGIN}{path}"
 
 
-def save_image_to_db(db: Session, *, user_id: int, raw: bytes, mime: str) -> Tuple[str, str, int]:
-    """
-    원본 바이트를 읽어 메타 추출(PIL), pHash 계산, 썸네일 생성 후 DB 저장.
-    반환: (image_url, thumb_url, image_hash)
-    """
+def _build_image_asset(*, user_id: int, raw: bytes, mime: str) -> models.ImageAsset:
+    """원본 바이트를 읽어 메타 추출(PIL), pHash 계산, 썸네일 생성 (CPU 작업, DB 접근 없음)"""
     # PIL 로드하여 메타확인
     with Image.open(io.BytesIO(raw)) as pil:
         pil = pil.convert("RGB")
@@ -56,7 +42,7 @@ def save_image_to_db(db: Session, *, user_id: int, raw: bytes, mime: str) -> Tup
     img_hash = compute_phash64(pil)
     thumb = make_thumbnail_bytes(pil, 768, "JPEG", 85)
 
-    img = models.ImageAsset(
+    return models.ImageAsset(
         user_id=user_id,
         image_hash=img_hash,
         mime=mime,
@@ -66,13 +52,29 @@ def save_image_to_db(db: Session, *, user_id: int, raw: bytes, mime: str) -> Tup
         original=raw,
         thumb=thumb,
     )
+
+
+def save_image_to_db(db: Session, *, user_id: int, raw: bytes, mime: str) -> Tuple[str, str, int]:
+    """
+    원본 바이트를 읽어 메타 추출(PIL), pHash 계산, 썸네일 생성 후 DB 저장.
+    반환: (image_url, thumb_url, image_hash)
+    """
+    img = _build_image_asset(user_id=user_id, raw=raw, mime=mime)
     db.add(img)
     db.flush()  # id 확보
 
     image_url = f"/media/{img.id}/orig"
     thumb_url = f"/media/{img.id}/thumb"
     # 절대 URL 쓰고 싶으면 build_absolute_url(image_url) 사용
-    return image_url, thumb_url, img_hash
+    return image_url, thumb_url, img.image_hash
+
+
+async def save_image_to_db_async(db: AsyncSession, *, user_id: int, raw: bytes, mime: str) -> Tuple[str, str, int]:
+    """save_image_to_db의 AsyncSession 버전. 이미지 처리는 스레드풀에서 실행해 이벤트 루프를 막지 않습니다."""
+    img = await run_in_threadpool(_build_image_asset, user_id=user_id, raw=raw, mime=mime)
+    db.add(img)
+    await db.flush()  # id 확보
+    return f"/media/{img.id}/orig", f"/media/{img.id}/thumb", img.image_hash
 
 
 async def get_image_data_uri(
@@ -97,13 +99,12 @@ async def get_image_data_uri(
 
     # ---- 내부 경로 확인: /media/{id}/orig 또는 /media/{id}/thumb ----
     m = re.match(r"^/media/(\d+)/(orig|thumb)$", image_url)
-    if m and SessionLocal is not None:
+    if m:
         image_id = int(m.group(1))
         which = m.group(2)  # "orig" or "thumb"
         try:
-            db: Session = SessionLocal()
-            try:
-                asset = db.query(models.ImageAsset).filter(models.ImageAsset.id == image_id).first()
+            async with get_async_sessionmaker()() as db:
+                asset = await db.get(models.ImageAsset, image_id)
                 if not asset:
                     logger.warning(f"get_image_data_uri: image id {image_id} not found in DB")
                     return None
@@ -121,8 +122,6 @@ async def get_image_data_uri(
 
                 b64 = base64.b64encode(content).decode("ascii")
                 return f"data:{mime};base64,{b64}"
-            finally:
-                db.close()
         except Exception as e:
             logger.exception(f"get_image_data_uri: DB fetch failed for image id {image_id}: {e}")
             # fall back to httpx approach below
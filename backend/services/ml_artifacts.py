@@ -0,0 +1,258 @@
+# services/ml_artifacts.py
+"""
+ML 추천 모델 번들 관리 (버전 + 체크섬 + 무중단 교체)
+
+디렉터리 구조 (settings.ML_ARTIFACT_DIR):
+  <root>/
+    CURRENT                 # 활성 버전 이름 한 줄 (없으면 가장 최근 버전)
+    20261019-153000/
+      manifest.json         # {"version", "created_at", "files": {역할: {"path", "sha256"}}, "metadata"}
+      plant_cluster_model.joblib
+      plant_encoder.joblib
+      cluster_map.json
+
+- publish_bundle(): 학습 스크립트가 산출물을 새 버전 디렉터리로 복사하고 manifest를 쓴 뒤 CURRENT를 교체
+- reload(): 새 번들을 체크섬 검증 → 로드 → 조회 테이블 계산까지 끝낸 다음 참조 하나만 바꿔 끼움
+  (교체 중에도 요청은 이전 번들로 처리되므로 콜드 스타트 지연이 없음)
+- start_watcher(): 워커마다 CURRENT를 주기적으로 확인해 바뀌면 reload → 재시작 없이 전 워커에 반영
+  (활성 버전 변경은 CURRENT로만: 학습 파이프라인 또는 scripts/activate_ml_bundle.py)
+번들이 하나도 없으면 예전 고정 경로(ml_scripts/*.joblib)를 "legacy" 버전으로 로드합니다.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from core.config import settings
+from services.recommender import ML_MODEL_DIR, MlRecommender
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+CURRENT_FILE = "CURRENT"
+LEGACY_VERSION = "legacy"
+# 번들 구성 파일 (역할 → 기본 파일명)
+BUNDLE_FILES = {
+    "model": "plant_cluster_model.joblib",
+    "encoder": "plant_encoder.joblib",
+    "cluster_map": "cluster_map.json",
+}
+
+
+class ArtifactError(Exception):
+    """번들이 없거나 manifest/체크섬이 맞지 않음"""
+
+
+def _root() -> str:
+    return settings.ML_ARTIFACT_DIR
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def list_versions() -> List[str]:
+    """manifest가 있는 버전 디렉터리 이름 (오래된 순)"""
+    root = _root()
+    if not os.path.isdir(root):
+        return []
+    return sorted(
+        name for name in os.listdir(root)
+        if not name.startswith(".") and os.path.isfile(os.path.join(root, name, MANIFEST_FILE))
+    )
+
+
+def current_version() -> Optional[str]:
+    path = os.path.join(_root(), CURRENT_FILE)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            version = f.read().strip()
+        if version:
+            return version
+    except FileNotFoundError:
+        pass
+    versions = list_versions()
+    return versions[-1] if versions else None
+
+
+def _check_version(version: str) -> None:
+    """저장된 번들 디렉터리 이름만 허용 (경로 조작으로 번들 밖의 파일을 언피클하지 않도록)"""
+    if version not in list_versions():
+        raise ArtifactError(f"존재하지 않는 번들 버전입니다: {version!r}")
+
+
+def read_manifest(version: str) -> Dict[str, Any]:
+    _check_version(version)
+    path = os.path.join(_root(), version, MANIFEST_FILE)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        raise ArtifactError(f"번들 '{version}'의 manifest가 없습니다: {path}")
+
+
+def verify_bundle(version: str) -> Dict[str, Any]:
+    """manifest의 모든 파일이 있고 sha256이 일치하는지 확인 후 manifest 반환"""
+    manifest = read_manifest(version)
+    files = manifest.get("files", {})
+    missing_roles = set(BUNDLE_FILES) - set(files)
+    if missing_roles:
+        raise ArtifactError(f"번들 '{version}'에 필요한 파일 정보가 없습니다: {sorted(missing_roles)}")
+    for role, info in files.items():
+        path = os.path.join(_root(), version, info["path"])
+        if not os.path.isfile(path):
+            raise ArtifactError(f"번들 '{version}'의 {role} 파일이 없습니다: {path}")
+        if _sha256(path) != info["sha256"]:
+            raise ArtifactError(f"번들 '{version}'의 {role} 파일 체크섬이 manifest와 다릅니다.")
+    return manifest
+
+
+def load_bundle(version: str) -> MlRecommender:
+    manifest = verify_bundle(version)
+    base = os.path.join(_root(), version)
+    files = manifest["files"]
+    return MlRecommender.from_files(
+        os.path.join(base, files["model"]["path"]),
+        os.path.join(base, files["encoder"]["path"]),
+        os.path.join(base, files["cluster_map"]["path"]),
+        version=version,
+    )
+
+
+def activate(version: str) -> None:
+    """CURRENT를 원자적으로 교체 (모든 워커의 watcher가 다음 확인 때 따라옴)"""
+    verify_bundle(version)
+    root = _root()
+    tmp_path = os.path.join(root, f".{CURRENT_FILE}.{os.getpid()}")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(version + "\n")
+    os.replace(tmp_path, os.path.join(root, CURRENT_FILE))
+
+
+def publish_bundle(
+    files: Dict[str, str],
+    version: Optional[str] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+    make_current: bool = True,
+) -> str:
+    """
+    학습 산출물(역할 → 파일 경로)을 새 버전 번들로 저장합니다.
+    임시 디렉터리에 모두 쓴 뒤 rename하므로 반쯤 복사된 번들이 로드되는 일은 없습니다.
+    """
+    missing_roles = set(BUNDLE_FILES) - set(files)
+    if missing_roles:
+        raise ArtifactError(f"번들에 필요한 파일이 없습니다: {sorted(missing_roles)}")
+
+    root = _root()
+    os.makedirs(root, exist_ok=True)
+    version = version or datetime.now().strftime("%Y%m%d-%H%M%S")
+    final_dir = os.path.join(root, version)
+    if os.path.exists(final_dir):
+        raise ArtifactError(f"이미 존재하는 번들 버전입니다: {version}")
+
+    tmp_dir = os.path.join(root, f".tmp-{version}")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    manifest_files = {}
+    for role, src in files.items():
+        name = BUNDLE_FILES.get(role, os.path.basename(src))
+        dst = os.path.join(tmp_dir, name)
+        shutil.copyfile(src, dst)
+        manifest_files[role] = {"path": name, "sha256": _sha256(dst)}
+
+    manifest = {
+        "version": version,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "files": manifest_files,
+        "metadata": metadata or {},
+    }
+    with open(os.path.join(tmp_dir, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_dir, final_dir)
+
+    if make_current:
+        activate(version)
+    return version
+
+
+# --- 프로세스 로컬 상태 ---
+
+_lock = threading.Lock()
+_active: Optional[MlRecommender] = None
+_state: Dict[str, Any] = {"version": None, "loaded_at": None, "manifest": None, "last_error": None}
+_watcher: Optional[threading.Thread] = None
+
+
+def reload(version: Optional[str] = None, force: bool = False) -> Dict[str, Any]:
+    """
+    지정한 버전(없으면 CURRENT)을 로드해 활성 추천기로 교체합니다.
+    로드/검증에 실패하면 기존 추천기를 그대로 두고 last_error만 기록합니다.
+    """
+    global _active
+    with _lock:
+        target = version or current_version()
+        if not force and _active is not None and _active.version == (target or LEGACY_VERSION):
+            return status()
+        try:
+            t0 = time.perf_counter()
+            if target:
+                recommender = load_bundle(target)
+                manifest = read_manifest(target)
+            else:
+                recommender = MlRecommender.load(ML_MODEL_DIR)
+                manifest = None
+            recommender.warm() # 조회 테이블까지 만든 뒤 교체
+        except (ArtifactError, FileNotFoundError) as e:
+            _state["last_error"] = str(e)
+            logger.error("ML 추천 모델 번들 로드 실패 (%s): %s", target or LEGACY_VERSION, e)
+            return status()
+
+        _active = recommender
+        _state.update(
+            version=recommender.version,
+            loaded_at=datetime.now().isoformat(timespec="seconds"),
+            manifest=manifest,
+            last_error=None,
+        )
+        logger.info("ML 추천 모델 번들 활성화: %s (%.2fs)", recommender.version, time.perf_counter() - t0)
+        return status()
+
+
+def get_active() -> Optional[MlRecommender]:
+    """활성 추천기 (로드된 번들이 없으면 None). 첫 호출 시 한 번 로드"""
+    if _active is None and _state["loaded_at"] is None and _state["last_error"] is None:
+        reload()
+    return _active
+
+
+def status() -> Dict[str, Any]:
+    return {**_state, "available_versions": list_versions(), "current": current_version()}
+
+
+def start_watcher() -> None:
+    """ML_ARTIFACT_POLL_SEC마다 CURRENT를 확인해 바뀌었으면 reload (API 서버 시작 시 1회)"""
+    global _watcher
+    if _watcher is not None:
+        return
+
+    def _loop():
+        while True:
+            time.sleep(settings.ML_ARTIFACT_POLL_SEC)
+            try:
+                target = current_version()
+                if target and target != _state["version"]:
+                    reload(target)
+            except Exception as e:
+                logger.warning("ML 추천 모델 번들 확인 실패: %s", e)
+
+    _watcher = threading.Thread(target=_loop, name="ml-artifact-watcher", daemon=True)
+    _watcher.start()
@@ -0,0 +1,137 @@
+# services/outbox.py
+"""
+발송 아웃박스 (트랜잭셔널 아웃박스 패턴)
+
+- 생산자(API/스케줄러)는 enqueue_*()로 행만 추가하고, 자신의 도메인 변경과 함께 commit합니다.
+  → 메일/FCM이 느리거나 죽어 있어도 API 응답 시간과 무관하고, 프로세스가 죽어도 메시지가 사라지지 않습니다.
+- 실제 발송은 별도 프로세스(outbox_worker.py)가 claim_batch()로 가져가서 처리합니다.
+  가져갈 때 available_at을 리스 기한으로 밀어 두므로, 워커가 처리 중에 죽으면 기한 후 다른 워커가 다시 가져갑니다.
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+import models
+from core.config import settings
+
+EMAIL = "email"
+PUSH = "push"
+
+
+@dataclass(frozen=True)
+class ClaimedMessage:
+    id: int
+    channel: str
+    payload: Dict[str, Any]
+    attempts: int
+
+
+# --- 생산자 (commit은 호출자가) ---
+
+def enqueue_email(db: Session, to: str, subject: str, html: str) -> models.OutboxMessage:
+    message = models.OutboxMessage(
+        channel=EMAIL,
+        payload={"to": to, "subject": subject, "html": html},
+        status="pending",
+        attempts=0,
+        available_at=datetime.utcnow(),
+    )
+    db.add(message)
+    return message
+
+
+def enqueue_pushes(db: Session, pushes: Iterable[Dict[str, Any]]) -> int:
+    """pushes: [{token, title, body, user_id, data}, ...] 를 한 번의 INSERT로 적재"""
+    now = datetime.utcnow()
+    rows = [
+        {"channel": PUSH, "payload": push, "status": "pending", "attempts": 0, "available_at": now}
+        for push in pushes
+    ]
+    if rows:
+        db.bulk_insert_mappings(models.OutboxMessage, rows)
+    return len(rows)
+
+
+# --- 소비자 (outbox_worker.py) ---
+
+def claim_batch(db: Session, worker_id: str, limit: int) -> List[ClaimedMessage]:
+    """
+    발송 가능한 행을 최대 limit개 가져갑니다. (SELECT ... FOR UPDATE SKIP LOCKED)
+    여러 워커가 동시에 호출해도 같은 행을 가져가지 않습니다. 시도 횟수는 가져갈 때 증가시킵니다.
+    이미 OUTBOX_MAX_ATTEMPTS번 가져갔는데도 결과가 남지 않은 행(처리 중 워커를 죽게 하는 메시지 등)은
+    가져가지 않고 failed로 종료합니다.
+    """
+    Outbox = models.OutboxMessage
+    now = datetime.utcnow()
+    rows = (
+        db.query(Outbox)
+        .filter(Outbox.status == "pending", Outbox.available_at <= now)
+        .order_by(Outbox.id.asc())
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    lease_until = now + timedelta(seconds=settings.OUTBOX_LEASE_SECONDS)
+    claimed = []
+    for row in rows:
+        if row.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+            row.status = "failed"
+            row.last_error = row.last_error or "최대 시도 횟수 초과 (처리 중 결과가 기록되지 않음)"
+            continue
+        row.attempts += 1
+        row.claimed_by = worker_id
+        row.available_at = lease_until
+        claimed.append(ClaimedMessage(id=row.id, channel=row.channel, payload=dict(row.payload), attempts=row.attempts))
+    db.commit()
+    return claimed
+
+
+def extend_lease(db: Session, ids: List[int], worker_id: str) -> int:
+    """
+    아직 처리 중인 행의 리스를 OUTBOX_LEASE_SECONDS만큼 연장 (commit은 호출자가)
+    리스가 이미 끝나 다른 워커가 다시 가져간 행(claimed_by가 다름)은 건드리지 않습니다.
+    """
+    if not ids:
+        return 0
+    Outbox = models.OutboxMessage
+    return db.query(Outbox).filter(
+        Outbox.id.in_(ids), Outbox.status == "pending", Outbox.claimed_by == worker_id,
+    ).update(
+        {Outbox.available_at: datetime.utcnow() + timedelta(seconds=settings.OUTBOX_LEASE_SECONDS)},
+        synchronize_session=False,
+    )
+
+
+def mark_sent(db: Session, ids: List[int]) -> None:
+    """발송 완료 처리 (commit은 호출자가)"""
+    if not ids:
+        return
+    Outbox = models.OutboxMessage
+    db.query(Outbox).filter(Outbox.id.in_(ids)).update(
+        {Outbox.status: "sent", Outbox.sent_at: datetime.utcnow(), Outbox.last_error: None},
+        synchronize_session=False,
+    )
+
+
+def mark_failed(db: Session, message: ClaimedMessage, error: str, retryable: bool = True) -> None:
+    """재시도 가능하면 지수 백오프 후 다시 pending, 아니면(또는 최대 시도 초과) failed로 종료 (commit은 호출자가)"""
+    Outbox = models.OutboxMessage
+    values: Dict[Any, Any] = {Outbox.last_error: (error or "")[:2000]}
+    if retryable and message.attempts < settings.OUTBOX_MAX_ATTEMPTS:
+        delay = settings.OUTBOX_RETRY_BASE_SEC * (2 ** (message.attempts - 1))
+        values[Outbox.available_at] = datetime.utcnow() + timedelta(seconds=delay)
+    else:
+        values[Outbox.status] = "failed"
+    db.query(Outbox).filter(Outbox.id == message.id).update(values, synchronize_session=False)
+
+
+def stats(db: Session) -> Dict[str, int]:
+    """상태별 행 수 (모니터링용)"""
+    Outbox = models.OutboxMessage
+    return {
+        status: count
+        for status, count in db.query(Outbox.status, func.count(Outbox.id)).group_by(Outbox.status)
+    }
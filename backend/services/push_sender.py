@@ -1,5 +1,16 @@
+import random
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
 import firebase_admin
-from firebase_admin import credentials, messaging
+from firebase_admin import credentials, messaging, exceptions as firebase_exceptions
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
 
 # 1. Firebase Admin SDK 초기화
 try:
@@ -14,6 +25,7 @@ except Exception as e:
 def send_push_notification(token: str, title: str, body: str):
     """
     Firebase Cloud Messaging(FCM)을 통해 실제 푸시 알림을 발송합니다.
+    (단건 발송용. 대량 발송은 PushDispatcher를 사용하세요)
     """
     if not firebase_admin._apps:
         print("Firebase 앱이 초기화되지 않아 푸시를 보낼 수 없습니다.")
@@ -23,7 +35,7 @@ def send_push_notification(token: str, title: str, body: str):
         notification=messaging.Notification(title=title, body=body),
         token=token,
     )
-    
+
     try:
         response = messaging.send(message)
         print(f"[{token[:10]}...]에게 성공적으로 메시지를 보냈습니다: {response}")
@@ -31,4 +43,173 @@ def send_push_notification(token: str, title: str, body: str):
     except Exception as e:
         print(f"[{token[:10]}...]에게 메시지 보내기 실패: {e}")
         # 예: 토큰이 유효하지 않은 경우 등 다양한 에러 처리 가능
-        return {"status": "error", "message": str(e)}
\ No newline at end of file
+        return {"status": "error", "message": str(e)}
+
+
+# ==============================================================================
+# 대량 발송: FCM 배치(send_each, 최대 500건) + 제한된 동시 실행 + 재시도 + 만료 토큰 정리
+# ==============================================================================
+
+FCM_MAX_BATCH = 500 # FCM send_each 1회 최대 메시지 수
+
+# 전송 결과 상태
+SENT = "sent"
+UNREGISTERED = "unregistered" # 앱 삭제/토큰 만료 → users.push_token 정리 대상
+RETRY = "retry"               # 일시 오류 (5xx, 할당량 초과 등) → 백오프 후 재시도
+FAILED = "failed"             # 재시도해도 소용없는 오류 (잘못된 메시지 등)
+
+
+@dataclass
+class PushMessage:
+    token: str
+    title: str
+    body: str
+    user_id: Optional[int] = None
+    data: Optional[Dict[str, str]] = None
+
+
+@dataclass
+class DispatchReport:
+    sent: int = 0
+    failed: int = 0
+    retried: int = 0
+    unregistered_tokens: List[str] = field(default_factory=list)
+    elapsed_sec: float = 0.0
+    # 입력 순서대로 메시지별 최종 상태 (SENT / UNREGISTERED / FAILED / 재시도 소진 시 RETRY)
+    statuses: List[str] = field(default_factory=list)
+
+
+class FcmTransport:
+    """firebase_admin.messaging.send_each로 한 배치를 보내고 메시지별 상태를 돌려줍니다."""
+
+    _UNREGISTERED_ERRORS = (messaging.UnregisteredError, messaging.SenderIdMismatchError)
+    _RETRY_ERRORS = (
+        messaging.QuotaExceededError,
+        firebase_exceptions.UnavailableError,
+        firebase_exceptions.InternalError,
+        firebase_exceptions.DeadlineExceededError,
+    )
+
+    def send_batch(self, messages: Sequence[PushMessage]) -> List[str]:
+        if not firebase_admin._apps:
+            raise RuntimeError("Firebase 앱이 초기화되지 않아 푸시를 보낼 수 없습니다.")
+        fcm_messages = [
+            messaging.Message(
+                notification=messaging.Notification(title=m.title, body=m.body),
+                data=m.data,
+                token=m.token,
+            )
+            for m in messages
+        ]
+        try:
+            batch = messaging.send_each(fcm_messages)
+        except self._RETRY_ERRORS:
+            return [RETRY] * len(messages)
+        return [self._status(r) for r in batch.responses]
+
+    def _status(self, response) -> str:
+        if response.success:
+            return SENT
+        if isinstance(response.exception, self._UNREGISTERED_ERRORS):
+            return UNREGISTERED
+        if isinstance(response.exception, self._RETRY_ERRORS):
+            return RETRY
+        logger.warning("푸시 발송 실패: %s", response.exception)
+        return FAILED
+
+
+class FakeTransport:
+    """
+    로컬 테스트/벤치마크용 가짜 FCM 전송기. 네트워크 없이 배치당 latency_sec만큼 대기합니다.
+    - unregistered_tokens: 만료 토큰으로 응답할 토큰 집합
+    - transient_failure_rate: 메시지별 일시 오류 확률 (재시도 경로 확인용)
+    """
+
+    def __init__(self, latency_sec: float = 0.05, unregistered_tokens=None, transient_failure_rate: float = 0.0):
+        self.latency_sec = latency_sec
+        self.unregistered_tokens = set(unregistered_tokens or ())
+        self.transient_failure_rate = transient_failure_rate
+        self.batches = 0
+        self.delivered: List[PushMessage] = []
+
+    def send_batch(self, messages: Sequence[PushMessage]) -> List[str]:
+        time.sleep(self.latency_sec)
+        self.batches += 1
+        statuses = []
+        for m in messages:
+            if m.token in self.unregistered_tokens:
+                statuses.append(UNREGISTERED)
+            elif self.transient_failure_rate and random.random() < self.transient_failure_rate:
+                statuses.append(RETRY)
+            else:
+                statuses.append(SENT)
+                self.delivered.append(m)
+        return statuses
+
+
+class PushDispatcher:
+    """
+    메시지를 batch_size개씩 묶어 max_concurrency개의 스레드로 동시에 발송합니다.
+    일시 오류는 지수 백오프(+지터)로 max_retries번까지 재시도하고,
+    만료 토큰은 report.unregistered_tokens로 모아 호출자가 DB에서 정리하도록 돌려줍니다.
+    """
+
+    def __init__(
+        self,
+        transport=None,
+        batch_size: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        backoff_base_sec: Optional[float] = None,
+    ):
+        self.transport = transport or FcmTransport()
+        self.batch_size = min(batch_size or settings.PUSH_BATCH_SIZE, FCM_MAX_BATCH)
+        self.max_concurrency = max_concurrency or settings.PUSH_MAX_CONCURRENCY
+        self.max_retries = settings.PUSH_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_base_sec = settings.PUSH_BACKOFF_BASE_SEC if backoff_base_sec is None else backoff_base_sec
+
+    def dispatch(self, messages: Sequence[PushMessage]) -> DispatchReport:
+        t0 = time.perf_counter()
+        report = DispatchReport()
+        batches = [messages[i:i + self.batch_size] for i in range(0, len(messages), self.batch_size)]
+        if batches:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches))) as pool:
+                for partial in pool.map(self._send_with_retry, batches):
+                    report.sent += partial.sent
+                    report.failed += partial.failed
+                    report.retried += partial.retried
+                    report.unregistered_tokens.extend(partial.unregistered_tokens)
+                    report.statuses.extend(partial.statuses)
+        report.elapsed_sec = time.perf_counter() - t0
+        return report
+
+    def _send_with_retry(self, batch: Sequence[PushMessage]) -> DispatchReport:
+        report = DispatchReport(statuses=[RETRY] * len(batch))
+        pending = list(range(len(batch))) # batch 내 인덱스
+        for attempt in range(self.max_retries + 1):
+            try:
+                statuses = self.transport.send_batch([batch[i] for i in pending])
+            except Exception as e:
+                logger.warning("푸시 배치 발송 오류 (시도 %d): %s", attempt + 1, e)
+                statuses = [RETRY] * len(pending)
+
+            retry = []
+            for i, status in zip(pending, statuses):
+                report.statuses[i] = status
+                if status == SENT:
+                    report.sent += 1
+                elif status == UNREGISTERED:
+                    report.unregistered_tokens.append(batch[i].token)
+                elif status == RETRY:
+                    retry.append(i)
+                else:
+                    report.failed += 1
+            if not retry:
+                return report
+            if attempt < self.max_retries:
+                report.retried += len(retry)
+                time.sleep(self.backoff_base_sec * (2 ** attempt) * (1 + random.random()))
+            pending = retry
+
+        report.failed += len(pending)
+        return report
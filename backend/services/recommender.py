@@ -0,0 +1,220 @@
+# services/recommender.py
+"""
+설문 기반 식물 추천
+
+- 규칙 점수: 카탈로그가 바뀔 때마다 한 번 도감 전체를 NumPy 코드 배열(채광 / 난이도 / 반려동물 안전)로
+  인코딩해 두고, 요청마다 전체 식물의 점수를 벡터 연산 한 번으로 계산한 뒤 argpartition으로 상위 k개만 고릅니다.
+- ML(K-Means) 추천: 설문 입력 공간이 작으므로(난이도 3 × 채광 3 × 반려동물 2) 모델 로드 시 모든 조합의
+  클러스터와 (중심에 가까운 순) 식물 목록을 미리 계산해 두고, 요청은 dict 조회만 합니다.
+  (모델 번들 로드/교체는 services/ml_artifacts.py)
+"""
+import json
+import os
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from services.catalog import Catalog, PlantSnapshot, get_catalog
+
+DIFFICULTY_CODES = {"상": 0, "중": 1, "하": 2}
+LIGHT_CODES = {"음지": 0, "반음지": 1, "양지": 2}
+UNKNOWN_CODE = -1
+
+# 가중치 (기존 규칙 그대로)
+LIGHT_WEIGHT = 4
+DIFFICULTY_WEIGHT = 3
+EXPERIENCE_WEIGHT = 1 # 희망 난이도는 아니지만 경험 수준에는 맞음
+PET_SAFE_WEIGHT = 5
+
+
+@dataclass(frozen=True)
+class SurveyFeatures:
+    """카탈로그(id 순) 식물별 코드 배열"""
+    version: int
+    plants: Tuple[PlantSnapshot, ...]
+    light: np.ndarray      # int8, LIGHT_CODES
+    difficulty: np.ndarray # int8, DIFFICULTY_CODES
+    pet_safe: np.ndarray   # bool
+
+    @classmethod
+    def from_catalog(cls, catalog: Catalog) -> "SurveyFeatures":
+        plants = catalog.plants
+        return cls(
+            version=catalog.version,
+            plants=plants,
+            light=np.fromiter((LIGHT_CODES.get(p.light_requirement, UNKNOWN_CODE) for p in plants), dtype=np.int8, count=len(plants)),
+            difficulty=np.fromiter((DIFFICULTY_CODES.get(p.difficulty, UNKNOWN_CODE) for p in plants), dtype=np.int8, count=len(plants)),
+            pet_safe=np.fromiter((bool(p.pet_safe) for p in plants), dtype=bool, count=len(plants)),
+        )
+
+
+_lock = threading.Lock()
+_features: Optional[SurveyFeatures] = None
+_features_catalog: Optional[Catalog] = None
+
+
+def get_survey_features() -> SurveyFeatures:
+    """현재 카탈로그의 특성 배열 (카탈로그가 교체됐을 때만 다시 인코딩)"""
+    global _features, _features_catalog
+    catalog = get_catalog()
+    if catalog is not _features_catalog:
+        with _lock:
+            if catalog is not _features_catalog:
+                _features, _features_catalog = SurveyFeatures.from_catalog(catalog), catalog
+    return _features
+
+
+def score_survey(
+    features: SurveyFeatures,
+    target_light: str,
+    target_diff: str,
+    exp_diff: str,
+    has_pets: bool,
+    limit: int,
+) -> List[Tuple[PlantSnapshot, int, List[str]]]:
+    """
+    전체 도감의 점수를 한 번에 계산해 상위 limit개를 (식물, 점수, 추천 이유) 목록으로 돌려줍니다.
+    - 반려동물이 있으면 반려동물 안전 식물만 후보
+    - 점수가 0인 식물은 제외, 동점이면 id 순
+    """
+    n = len(features.plants)
+    if n == 0 or limit <= 0:
+        return []
+
+    light_match = features.light == LIGHT_CODES.get(target_light, UNKNOWN_CODE)
+    diff_match = features.difficulty == DIFFICULTY_CODES.get(target_diff, UNKNOWN_CODE)
+    exp_match = ~diff_match & (features.difficulty == DIFFICULTY_CODES.get(exp_diff, UNKNOWN_CODE))
+    pet_match = features.pet_safe if has_pets else np.zeros(n, dtype=bool)
+
+    scores = (
+        LIGHT_WEIGHT * light_match
+        + DIFFICULTY_WEIGHT * diff_match
+        + EXPERIENCE_WEIGHT * exp_match
+        + PET_SAFE_WEIGHT * pet_match
+    ).astype(np.int64)
+    eligible = scores > 0
+    if has_pets:
+        eligible &= features.pet_safe
+
+    candidates = np.flatnonzero(eligible)
+    if candidates.size == 0:
+        return []
+    # (점수 내림차순, id 오름차순)을 정수 하나로 합친 키 → argpartition 경계에서도 순서가 결정적
+    keys = scores[candidates] * n + (n - 1 - candidates)
+    if candidates.size > limit:
+        top = np.argpartition(-keys, limit - 1)[:limit]
+    else:
+        top = np.arange(candidates.size)
+    top = top[np.argsort(-keys[top])]
+
+    results = []
+    for i in candidates[top]:
+        reasons = []
+        if light_match[i]:
+            reasons.append(f"채광 조건('{target_light}')이 잘 맞아요.")
+        if diff_match[i]:
+            reasons.append(f"관리 난이도('{target_diff}')가 적절해요.")
+        if pet_match[i]:
+            reasons.append("반려동물에게 안전해요.")
+        results.append((features.plants[i], int(scores[i]), reasons))
+    return results
+
+
+# ==============================================================================
+# ML(K-Means) 추천: 조합별 조회 테이블
+# ==============================================================================
+
+ML_MODEL_DIR = "ml_scripts"
+SurveyKey = Tuple[str, str, bool] # (난이도, 채광, 반려동물 유무)
+
+
+class MlRecommender:
+    """
+    학습 산출물(KMeans 모델 / OneHotEncoder / cluster_map)에서 요청 처리에 필요한 값만 꺼내 둡니다.
+    특성 벡터 = [pet_safe] + one-hot(difficulty) + one-hot(light_requirement)  (ml_scripts/preprocess_data.py와 동일)
+    """
+
+    def __init__(
+        self,
+        centers: np.ndarray,
+        categories: List[List[str]],
+        cluster_map: Dict[int, List[int]],
+        version: str = "legacy",
+    ):
+        self.version = version
+        self.centers = np.asarray(centers, dtype=np.float64)
+        self.difficulty_categories, self.light_categories = (list(c) for c in categories)
+        self.cluster_map = cluster_map
+        self._table: Dict[SurveyKey, Tuple[int, Tuple[PlantSnapshot, ...]]] = {}
+        self._table_catalog: Optional[Catalog] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_files(cls, model_path: str, encoder_path: str, cluster_map_path: str, version: str = "legacy") -> "MlRecommender":
+        import joblib # 모델 역직렬화에만 필요 (sklearn 객체 → numpy 배열로 변환 후 요청 경로에서는 사용 안 함)
+
+        model = joblib.load(model_path)
+        encoder = joblib.load(encoder_path)
+        with open(cluster_map_path, "r", encoding="utf-8") as f:
+            cluster_map = {int(k): [int(i) for i in v] for k, v in json.load(f).items()}
+        return cls(model.cluster_centers_, encoder.categories_, cluster_map, version=version)
+
+    @classmethod
+    def load(cls, model_dir: str = ML_MODEL_DIR) -> "MlRecommender":
+        """버전 번들 이전의 고정 경로(ml_scripts/*.joblib, cluster_map.json)에서 로드"""
+        return cls.from_files(
+            os.path.join(model_dir, "plant_cluster_model.joblib"),
+            os.path.join(model_dir, "plant_encoder.joblib"),
+            os.path.join(model_dir, "cluster_map.json"),
+        )
+
+    def encode(self, difficulty: str, light_requirement: str, pet_safe: bool) -> np.ndarray:
+        """OneHotEncoder(handle_unknown='ignore')와 같은 규칙: 모르는 값은 모두 0"""
+        return np.array(
+            [1.0 if pet_safe else 0.0]
+            + [1.0 if difficulty == c else 0.0 for c in self.difficulty_categories]
+            + [1.0 if light_requirement == c else 0.0 for c in self.light_categories]
+        )
+
+    def _nearest_cluster(self, features: np.ndarray) -> int:
+        # KMeans.predict와 동일 (가장 가까운 중심)
+        return int(np.argmin(((self.centers - features) ** 2).sum(axis=1)))
+
+    def build_table(self, catalog: Catalog) -> Dict[SurveyKey, Tuple[int, Tuple[PlantSnapshot, ...]]]:
+        # 클러스터별 식물을 중심까지의 거리(동률이면 id) 순으로 정렬
+        ranked: Dict[int, Tuple[PlantSnapshot, ...]] = {}
+        for cluster, plant_ids in self.cluster_map.items():
+            plants = [catalog.by_id[i] for i in plant_ids if i in catalog.by_id]
+            if not plants:
+                ranked[cluster] = ()
+                continue
+            vectors = np.stack([self.encode(p.difficulty, p.light_requirement, bool(p.pet_safe)) for p in plants])
+            distances = ((vectors - self.centers[cluster]) ** 2).sum(axis=1)
+            order = np.lexsort((np.array([p.id for p in plants]), distances))
+            ranked[cluster] = tuple(plants[i] for i in order)
+
+        table = {}
+        for difficulty in DIFFICULTY_CODES:
+            for light in LIGHT_CODES:
+                for has_pets in (False, True):
+                    cluster = self._nearest_cluster(self.encode(difficulty, light, has_pets))
+                    table[(difficulty, light, has_pets)] = (cluster, ranked.get(cluster, ()))
+        return table
+
+    def warm(self) -> None:
+        """현재 카탈로그 기준으로 조회 테이블을 (필요하면) 다시 만듭니다."""
+        catalog = get_catalog()
+        if catalog is not self._table_catalog:
+            with self._lock:
+                if catalog is not self._table_catalog:
+                    self._table, self._table_catalog = self.build_table(catalog), catalog
+
+    def recommend(self, difficulty: str, light_requirement: str, has_pets: bool) -> Tuple[int, Tuple[PlantSnapshot, ...]]:
+        """(예측 클러스터, 중심에 가까운 순 식물 목록)"""
+        self.warm()
+        hit = self._table.get((difficulty, light_requirement, has_pets))
+        if hit is None: # 조합 밖 입력 (정규화 함수가 막고 있어 보통 없음)
+            return self._nearest_cluster(self.encode(difficulty, light_requirement, has_pets)), ()
+        return hit
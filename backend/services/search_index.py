@@ -0,0 +1,439 @@
+# services/search_index.py
+"""
+도감 검색용 Whoosh 인덱스 관리
+
+- define_schema() / plant_document(): 인덱스 스키마와 도감 행 → 문서 변환 (전체 빌드 스크립트와 공용)
+- get_searcher(): 워커마다 searcher 하나를 두고, 인덱스가 바뀌었으면 searcher.refresh()로 새 세그먼트만 반영
+- search_plants(): 응답(PlantMasterInfo)에 필요한 값을 모두 인덱스 저장 필드에서 꺼내 DB 조회 없이 결과를 만들고,
+  난이도/채광/반려동물 필터와 패싯 건수를 한 번의 검색으로 계산합니다.
+  오타로 보이는 단어는 도감 단어 사전(services/fuzzy.py)으로 교정한 검색어를 OR로 함께 검색합니다.
+  (파싱한 쿼리, 필터, 페이지, 인덱스 버전) 키로 LRU 캐시 (인덱스가 바뀌면 키가 달라져 자연히 무효화)
+- enqueue_upsert()/enqueue_delete(): 도감 변경을 큐에 넣으면 백그라운드 writer 스레드 하나가
+  모아서 update_document/delete_by_term 후 commit (요청 스레드는 인덱스 잠금을 기다리지 않음)
+- reconcile(): DB와 인덱스를 비교해 빠지거나 달라진 문서를 맞춤 (scripts/reconcile_whoosh_index.py)
+- 스키마(define_schema)가 바뀌면 기존 인덱스에는 새 필드를 쓸 수 없으므로, 증분 갱신은 인덱스가 아는 필드만 쓰고
+  reconcile은 전체 빌드를 요구합니다. (schema_mismatch)
+
+전체 빌드는 SEARCH_INDEX_DIR 아래 새 버전 디렉터리에 만든 뒤 `current` 심볼릭 링크를 원자적으로 바꿉니다.
+(scripts/build_whoosh_index.py) 각 워커는 링크가 가리키는 곳이 바뀐 것을 보고 새 인덱스로 searcher를 교체합니다.
+"""
+import hashlib
+import json
+import logging
+import os
+import queue
+import shutil
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from cachetools import LRUCache
+from whoosh.analysis import NgramTokenizer # 한글 검색을 위한 분석기
+from whoosh.fields import BOOLEAN, ID, KEYWORD, STORED, TEXT, Schema
+from whoosh.index import LockError, exists_in, open_dir
+from whoosh.qparser import MultifieldParser
+from whoosh.query import And, Or, Term
+from whoosh.sorting import Count, FieldFacet
+
+from core.config import settings
+from services import catalog, fuzzy
+
+logger = logging.getLogger(__name__)
+
+# 검색 문서에 저장하는 도감 필드 (= 변경 감지용 지문에 포함할 값, schemas.PlantMasterInfo의 id 외 필드)
+DOCUMENT_FIELDS = (
+    "name_ko", "name_en", "species", "family", "image_url", "description",
+    "difficulty", "light_requirement", "watering_type", "pet_safe", "tags",
+)
+# 검색어를 찾는 필드
+SEARCH_FIELDS = ("name_ko", "description", "name_en", "species")
+# 검색 필터 + 패싯 건수를 제공하는 필드 (순서 = search_plants 필터 인자 순서)
+FACET_FIELDS = ("difficulty", "light_requirement", "pet_safe")
+# 문서 저장 필드 구성 버전. 이보다 낮거나 없는 문서(예전 스키마 인덱스)는 응답 시 카탈로그에서 보충
+# (예전 인덱스에는 새 저장 필드를 쓸 수 없으므로 전체 빌드 전까지는 계속 보충 경로를 탐)
+DOC_VERSION = 2
+
+
+def define_schema() -> Schema:
+    """Whoosh 인덱스 스키마 (검색할 필드 정의)"""
+    # NgramTokenizer: '몬스테라'를 '몬스', '스테', '테라', '라' 등으로 분리하여 부분 검색 지원
+    ngram_analyzer = NgramTokenizer(minsize=1, maxsize=3) # 1~3글자 단위로 분리
+
+    return Schema(
+        id=ID(stored=True, unique=True), # DB ID (결과 반환용)
+        name_ko=TEXT(stored=True, analyzer=ngram_analyzer), # 한글 이름 (검색 대상)
+        name_en=TEXT(stored=True), # 영문명 (기본 분석기: 단어 단위 + 소문자)
+        species=KEYWORD(stored=True, lowercase=True), # 학명 (단어 단위 일치, 대소문자 무시)
+        description=TEXT(stored=True, analyzer=ngram_analyzer), # 설명 (검색 대상)
+        # 검색 필터링/패싯에 사용하는 필드들 (sortable: 패싯 건수를 컬럼 저장소에서 바로 집계)
+        difficulty=KEYWORD(stored=True, sortable=True),
+        light_requirement=KEYWORD(stored=True, sortable=True),
+        pet_safe=BOOLEAN(stored=True),
+        # 응답에만 쓰는 저장 전용 필드
+        family=STORED(),
+        image_url=STORED(),
+        watering_type=STORED(),
+        tags=STORED(),
+        fingerprint=STORED(), # 문서 내용 해시 (reconcile에서 변경 감지)
+        doc_version=STORED(),
+    )
+
+
+def _field_signature(field) -> Tuple[Any, ...]:
+    """필드 정의 비교용 값 (컬럼 객체는 __eq__가 없어 클래스 + 속성으로 비교)"""
+    attrs = dict(vars(field))
+    column = attrs.pop("column_type", None)
+    return type(field), attrs, (type(column), vars(column)) if column is not None else None
+
+
+def schema_mismatch(ix) -> List[str]:
+    """define_schema()와 다른 필드 (인덱스에 없거나 정의가 다름). 비어 있지 않으면 전체 빌드 필요"""
+    expected = define_schema()
+    current = set(ix.schema.names())
+    return sorted(
+        name for name in expected.names()
+        if name not in current or _field_signature(ix.schema[name]) != _field_signature(expected[name])
+    )
+
+
+def fingerprint(values: Dict[str, Any]) -> str:
+    raw = json.dumps([values.get(f) for f in DOCUMENT_FIELDS], ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def plant_document(plant) -> Dict[str, Any]:
+    """PlantMaster 행(ORM/카탈로그 스냅샷/Row) → Whoosh 문서 (None 필드 제외)"""
+    values = {f: getattr(plant, f, None) for f in DOCUMENT_FIELDS}
+    values["pet_safe"] = bool(values["pet_safe"]) # None이면 False로 처리
+    if values["tags"] is not None:
+        values["tags"] = list(values["tags"])
+    doc = {"id": str(plant.id), **values, "fingerprint": fingerprint(values), "doc_version": DOC_VERSION}
+    return {k: v for k, v in doc.items() if v is not None}
+
+
+def stored_info(fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """검색 결과 저장 필드 → PlantMasterInfo 형태 dict (예전 형식 문서면 None)"""
+    if fields.get("doc_version", 0) < DOC_VERSION:
+        return None
+    info = {f: fields.get(f) for f in DOCUMENT_FIELDS}
+    info["id"] = int(fields["id"])
+    return info
+
+
+CURRENT_LINK = "current"
+VERSION_PREFIX = "v-"
+
+
+def index_dir() -> str:
+    """활성 인덱스 경로 (`current` 링크가 없으면 예전처럼 SEARCH_INDEX_DIR 자체)"""
+    root = settings.SEARCH_INDEX_DIR
+    link = os.path.join(root, CURRENT_LINK)
+    if os.path.islink(link):
+        return os.path.realpath(link)
+    return root
+
+
+def open_index(path: Optional[str] = None):
+    """인덱스가 없으면 None"""
+    path = path or index_dir()
+    if not exists_in(path):
+        return None
+    return open_dir(path)
+
+
+def new_version_dir() -> str:
+    """전체 빌드용 빈 버전 디렉터리 생성"""
+    root = settings.SEARCH_INDEX_DIR
+    path = os.path.join(root, VERSION_PREFIX + datetime.now().strftime("%Y%m%d-%H%M%S-%f"))
+    os.makedirs(path)
+    return path
+
+
+def activate_version(path: str) -> None:
+    """`current` 링크를 path로 원자적으로 교체 (임시 링크 생성 후 rename)"""
+    root = settings.SEARCH_INDEX_DIR
+    tmp_link = os.path.join(root, f".{CURRENT_LINK}.{os.getpid()}")
+    if os.path.lexists(tmp_link):
+        os.remove(tmp_link)
+    os.symlink(os.path.basename(path), tmp_link) # 상대 링크 (디렉터리째 옮겨도 유지)
+    os.replace(tmp_link, os.path.join(root, CURRENT_LINK))
+
+
+def prune_versions(keep: int) -> List[str]:
+    """활성 버전을 제외하고 최근 keep개만 남기고 삭제"""
+    root = settings.SEARCH_INDEX_DIR
+    active = index_dir()
+    versions = sorted(
+        os.path.join(root, name) for name in os.listdir(root)
+        if name.startswith(VERSION_PREFIX) and os.path.isdir(os.path.join(root, name))
+    )
+    removed = []
+    for path in versions[:max(len(versions) - keep, 0)]:
+        if os.path.realpath(path) != active:
+            shutil.rmtree(path, ignore_errors=True)
+            removed.append(path)
+    return removed
+
+
+# --- 워커별 searcher (refresh로 갱신) ---
+
+_search_lock = threading.Lock()
+_ix = None
+_ix_path: Optional[str] = None
+_searcher = None
+_parser: Optional[MultifieldParser] = None
+_last_refresh = 0.0
+
+
+def get_searcher():
+    """
+    (searcher, query parser). 인덱스가 없으면 (None, None).
+    SEARCH_REFRESH_SEC마다 searcher.refresh()로 다른 프로세스/스레드가 커밋한 변경을 반영하고,
+    `current` 링크가 새 버전을 가리키면 그 인덱스로 교체합니다.
+    (바뀐 게 없으면 같은 searcher를 그대로 돌려받으므로 비용이 거의 없음)
+    """
+    global _ix, _ix_path, _searcher, _parser, _last_refresh
+    now = time.monotonic()
+    if _searcher is not None and now - _last_refresh < settings.SEARCH_REFRESH_SEC:
+        return _searcher, _parser
+    with _search_lock:
+        path = index_dir()
+        if _searcher is None or path != _ix_path:
+            ix = open_index(path)
+            if ix is None:
+                if _searcher is None:
+                    return None, None
+            else:
+                stale = schema_mismatch(ix)
+                if stale:
+                    logger.warning(
+                        "검색 인덱스 스키마가 코드와 다릅니다 (%s): %s — 전체 빌드 전까지 일부 응답 필드는 카탈로그에서 보충합니다.",
+                        ", ".join(stale), path,
+                    )
+                # 이전 searcher는 진행 중인 검색이 끝나도록 닫지 않고 GC에 맡김
+                _ix, _ix_path, _searcher = ix, path, ix.searcher()
+                # 검색할 필드 지정 (한글 이름/설명 + 영문명/학명 — 오타 교정된 라틴어 단어도 여기서 찾음)
+                _parser = MultifieldParser(SEARCH_FIELDS, schema=ix.schema)
+        elif now - _last_refresh >= settings.SEARCH_REFRESH_SEC:
+            _searcher = _searcher.refresh()
+        _last_refresh = now
+    return _searcher, _parser
+
+
+def index_version(searcher) -> Tuple[Optional[str], Any]:
+    """캐시 키용 인덱스 버전 (활성 디렉터리, 세그먼트 세대)"""
+    return _ix_path, searcher.reader().generation()
+
+
+# --- 검색 + 결과 캐시 ---
+
+_cache_lock = threading.Lock()
+_cache: LRUCache = LRUCache(maxsize=settings.SEARCH_CACHE_SIZE)
+
+
+# pet_safe(BOOLEAN)는 정렬 컬럼을 만들 수 없어 Whoosh가 색인된 용어("t"/"f") 그대로 묶으므로
+# 응답 헤더에서는 "true"/"false"로 바꿔 줌
+
+
+def _facet_key(field: str, value: Any) -> str:
+    if isinstance(value, bytes):
+        value = value.decode("utf-8")
+    if field == "pet_safe":
+        return "true" if value is True or value == "t" else "false"
+    return str(value)
+
+
+def search_plants(
+    q: str,
+    skip: int,
+    limit: int,
+    difficulty: Optional[str] = None,
+    light_requirement: Optional[str] = None,
+    pet_safe: Optional[bool] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    검색 결과 {"items": PlantMasterInfo 형태 dict 목록, "facets": {필드: {값: 건수}}}. 인덱스가 없으면 None.
+    - 필터는 Whoosh filter 쿼리로 적용 (점수 계산 없이 후보만 제한)
+      pet_safe는 목록 API(Catalog.filter_ids)와 같은 의미: True면 반려동물 안전 식물만, False/None이면 필터 없음
+    - 패싯 건수는 같은 검색에서 grouping(Count)으로 함께 계산 (필터가 적용된 결과 기준)
+    저장 필드가 부족한 예전 문서만 인메모리 카탈로그에서 보충합니다.
+    """
+    searcher, qp = get_searcher()
+    if searcher is None:
+        return None
+    query = qp.parse(q)
+    corrected = fuzzy.correct(q)
+    if corrected:
+        # 원래 검색어와 맞는 문서가 있으면 그쪽 점수가 더 높으므로 정확한 결과가 앞에 옴
+        query = Or([query, qp.parse(corrected)])
+    filters = (difficulty, light_requirement, True if pet_safe is True else None)
+    # 캐시 키는 파싱 결과 기준 (대소문자를 구분하는 필드, AND/OR 연산자를 문자열 정규화로 뭉개지 않도록)
+    key = (str(query), filters, skip, limit, index_version(searcher))
+    with _cache_lock:
+        cached = _cache.get(key)
+    if cached is not None:
+        return cached
+
+    terms = [Term(field, value) for field, value in zip(FACET_FIELDS, filters) if value is not None]
+    results = searcher.search(
+        query,
+        limit=skip + limit,
+        filter=And(terms) if terms else None,
+        groupedby={field: FieldFacet(field) for field in FACET_FIELDS},
+        maptype=Count,
+    )
+    items = []
+    for hit in results[skip:]:
+        info = stored_info(hit.fields())
+        if info is None:
+            plant = catalog.get_catalog().get(int(hit["id"]))
+            if plant is None:
+                continue
+            info = {"id": plant.id, **{f: getattr(plant, f) for f in DOCUMENT_FIELDS}}
+        items.append(info)
+    facets = {
+        field: {_facet_key(field, value): count for value, count in results.groups(field).items()}
+        for field in FACET_FIELDS
+    }
+
+    result = {"items": items, "facets": facets}
+    with _cache_lock:
+        _cache[key] = result
+    return result
+
+
+# --- 백그라운드 writer (증분 갱신) ---
+
+_UPSERT = "upsert"
+_DELETE = "delete"
+_queue: "queue.Queue[Tuple[str, Any]]" = queue.Queue()
+_writer_thread: Optional[threading.Thread] = None
+_writer_lock = threading.Lock()
+_schema_warned: set = set() # 스키마 불일치 경고를 이미 남긴 인덱스 경로
+
+
+def apply_changes(ix, upserts: Iterable[Dict[str, Any]] = (), deletes: Iterable[str] = ()) -> int:
+    """
+    문서 upsert/삭제를 한 번의 commit으로 반영 (다른 프로세스가 쓰는 중이면 잠금 대기)
+    예전 스키마로 만든 인덱스에는 인덱스가 모르는 필드를 빼고 씁니다. (UnknownFieldError 방지,
+    빠진 저장 필드는 응답 시 카탈로그에서 보충되고 다음 전체 빌드 때 채워짐)
+    """
+    known = set(ix.schema.names())
+    writer = ix.writer(timeout=settings.SEARCH_WRITER_LOCK_TIMEOUT)
+    count = 0
+    try:
+        for doc in upserts:
+            writer.update_document(**{k: v for k, v in doc.items() if k in known})
+            count += 1
+        for doc_id in deletes:
+            writer.delete_by_term("id", doc_id)
+            count += 1
+    except Exception:
+        writer.cancel()
+        raise
+    writer.commit(merge=False) # 작은 세그먼트만 추가 (병합은 전체 빌드/최적화 때)
+    return count
+
+
+def _drain(first) -> Tuple[Dict[str, Dict[str, Any]], set]:
+    """큐에 쌓인 변경을 모아 id별 마지막 상태만 남김"""
+    upserts: Dict[str, Dict[str, Any]] = {}
+    deletes: set = set()
+    item = first
+    while True:
+        op, value = item
+        if op == _UPSERT:
+            upserts[value["id"]] = value
+            deletes.discard(value["id"])
+        else:
+            deletes.add(value)
+            upserts.pop(value, None)
+        if len(upserts) + len(deletes) >= settings.SEARCH_WRITER_BATCH_SIZE:
+            break
+        try:
+            item = _queue.get_nowait()
+        except queue.Empty:
+            break
+    return upserts, deletes
+
+
+def _writer_loop():
+    while True:
+        upserts, deletes = _drain(_queue.get())
+        for attempt in range(3):
+            try:
+                ix = open_index()
+                if ix is None:
+                    logger.warning("검색 인덱스가 없어 %d건의 변경을 건너뜁니다. (전체 빌드 필요)", len(upserts) + len(deletes))
+                    break
+                stale = schema_mismatch(ix)
+                if stale and ix.storage.folder not in _schema_warned:
+                    _schema_warned.add(ix.storage.folder)
+                    logger.warning("검색 인덱스 스키마가 코드와 다릅니다 (%s). 전체 빌드 전까지 해당 필드 없이 갱신합니다.", ", ".join(stale))
+                apply_changes(ix, upserts.values(), deletes)
+                break
+            except LockError:
+                logger.warning("검색 인덱스 잠금 대기 시간 초과 (시도 %d)", attempt + 1)
+            except Exception as e:
+                logger.exception("검색 인덱스 증분 갱신 실패: %s", e)
+                break
+
+
+def _ensure_writer() -> None:
+    global _writer_thread
+    if _writer_thread is None:
+        with _writer_lock:
+            if _writer_thread is None:
+                _writer_thread = threading.Thread(target=_writer_loop, name="search-index-writer", daemon=True)
+                _writer_thread.start()
+
+
+def enqueue_upsert(plant) -> None:
+    """도감 행이 추가/수정된 뒤 호출 (DB commit 이후)"""
+    _ensure_writer()
+    _queue.put((_UPSERT, plant_document(plant)))
+
+
+def enqueue_delete(plant_id: int) -> None:
+    _ensure_writer()
+    _queue.put((_DELETE, str(plant_id)))
+
+
+# --- DB ↔ 인덱스 대조 ---
+
+def reconcile(rows: Iterable[Any], dry_run: bool = False) -> Dict[str, List[str]]:
+    """
+    DB 도감 행 전체(rows)와 인덱스 저장 필드를 비교해
+    인덱스에 없거나(missing) 내용이 다르거나(changed) DB에 없는(extra) 문서를 맞춥니다.
+    """
+    ix = open_index()
+    if ix is None:
+        raise RuntimeError(f"검색 인덱스가 없습니다: {index_dir()} (전체 빌드 필요)")
+    stale = schema_mismatch(ix)
+    if stale:
+        # 예전 인덱스의 문서는 새 필드를 담을 수 없으므로 대조로는 맞출 수 없음 (매번 전부 '내용 다름'이 됨)
+        raise RuntimeError(
+            f"검색 인덱스 스키마가 코드와 다릅니다 ({', '.join(stale)}): {index_dir()} "
+            "(전체 빌드 필요: python scripts/build_whoosh_index.py)"
+        )
+
+    with ix.searcher() as searcher:
+        indexed = {fields["id"]: fields.get("fingerprint") for fields in searcher.all_stored_fields()}
+
+    upserts, missing, changed = [], [], []
+    seen = set()
+    for row in rows:
+        doc = plant_document(row)
+        seen.add(doc["id"])
+        if doc["id"] not in indexed:
+            missing.append(doc["id"])
+            upserts.append(doc)
+        elif indexed[doc["id"]] != doc["fingerprint"]:
+            changed.append(doc["id"])
+            upserts.append(doc)
+    extra = sorted(set(indexed) - seen)
+
+    if not dry_run and (upserts or extra):
+        apply_changes(ix, upserts, extra)
+    return {"missing": missing, "changed": changed, "extra": extra}
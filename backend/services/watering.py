@@ -0,0 +1,58 @@
+# services/watering.py
+"""
+물주기 예정일(Plant.next_watering_at) 계산
+
+예정일은 '마지막으로 물 준 날 + 물주기 주기'이며, 미루기 중이면 미루기가 끝난 다음 날 이후로 밀립니다.
+값은 DB에 저장해 두고 물주기/미루기/식물 등록/도감 물주기 유형 변경 시에만 다시 계산합니다.
+(스케줄러와 예정 목록 API는 이 컬럼의 인덱스 범위 조회만 합니다)
+알림 시각(notification_time)은 분 단위 스케줄러가 버킷으로 쓰도록 notification_minute에 함께 저장합니다.
+"""
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from core.constants import WATERING_CYCLE_MAP, DEFAULT_WATERING_CYCLE_DAYS
+
+DEFAULT_NOTIFICATION_TIME = "09:00"
+
+
+def cycle_days_for(watering_type: Optional[str]) -> Optional[int]:
+    """물주기 유형 → 주기(일). 유형이 비어 있으면 알림 대상이 아니므로 None"""
+    if not watering_type:
+        return None
+    return WATERING_CYCLE_MAP.get(watering_type, DEFAULT_WATERING_CYCLE_DAYS)
+
+
+def compute_next_watering_date(
+    last_watered_at: Optional[datetime],
+    watering_type: Optional[str],
+    snoozed_until: Optional[date] = None,
+) -> Optional[date]:
+    cycle_days = cycle_days_for(watering_type)
+    if cycle_days is None or last_watered_at is None:
+        return None
+
+    next_date = last_watered_at.date() + timedelta(days=cycle_days)
+    # 미루기: snoozed_until 당일까지는 알림을 보내지 않음
+    if snoozed_until and next_date <= snoozed_until:
+        next_date = snoozed_until + timedelta(days=1)
+    return next_date
+
+
+def notification_minute_of(notification_time: Optional[str]) -> int:
+    """'HH:MM' → 하루 중 분(0~1439). 비어 있거나 형식이 잘못되면 기본 알림 시각(09:00)"""
+    try:
+        hour, minute = (int(part) for part in (notification_time or DEFAULT_NOTIFICATION_TIME).split(":"))
+        if 0 <= hour < 24 and 0 <= minute < 60:
+            return hour * 60 + minute
+    except ValueError:
+        pass
+    return notification_minute_of(DEFAULT_NOTIFICATION_TIME)
+
+
+def refresh_next_watering(plant, watering_type: Optional[str] = None) -> None:
+    """plant.next_watering_at을 현재 상태 기준으로 다시 계산합니다. (commit은 호출자가)"""
+    if watering_type is None and plant.master_info is not None:
+        watering_type = plant.master_info.watering_type
+    plant.next_watering_at = compute_next_watering_date(
+        plant.last_watered_at, watering_type, plant.notification_snoozed_until
+    )
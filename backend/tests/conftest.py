@@ -0,0 +1,25 @@
+"""
+backend 테스트 공통 설정 (backend 디렉터리에서: python -m pytest tests)
+
+core.config.Settings의 필수 값이 환경 변수에 없으면 테스트용 값을 채웁니다. (.env가 있으면 그 값이 우선)
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+_TEST_ENV = {
+    "DB_URL": "sqlite://",
+    "SECRET_KEY": "test-secret",
+    "ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "60",
+    "MAIL_USERNAME": "test",
+    "MAIL_PASSWORD": "test",
+    "MAIL_FROM": "test@example.com",
+    "MAIL_PORT": "25",
+    "MAIL_SERVER": "localhost",
+    "MAIL_STARTTLS": "false",
+    "MAIL_SSL_TLS": "false",
+}
+for key, value in _TEST_ENV.items():
+    os.environ.setdefault(key, value)
@@ -0,0 +1,164 @@
+"""
+services/push_sender.PushDispatcher — FakeTransport로 네트워크 없이 확인
+- 배치 크기는 FCM 최대(500)를 넘지 않음
+- 동시에 발송 중인 배치 수는 max_concurrency 이하
+- 일시 오류(RETRY)는 지수 백오프 후 재시도해서 성공
+- 만료 토큰(UNREGISTERED)은 crud.clear_push_tokens로 정리 (scheduler._flush)
+"""
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from services import push_sender
+from services.push_sender import (
+    FCM_MAX_BATCH, RETRY, SENT, UNREGISTERED, FakeTransport, PushDispatcher, PushMessage,
+)
+
+
+def make_messages(count, prefix="token"):
+    return [PushMessage(token=f"{prefix}-{i}", title="t", body="b", user_id=i + 1) for i in range(count)]
+
+
+class RecordingTransport(FakeTransport):
+    """배치 크기와 동시에 발송 중인 배치 수(최대값)를 기록"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.batch_sizes = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def send_batch(self, messages):
+        with self._lock:
+            self.batch_sizes.append(len(messages))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            return super().send_batch(messages)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+class ScriptedTransport:
+    """토큰별로 정해 둔 횟수만큼 RETRY, 그 뒤로는 SENT"""
+
+    def __init__(self, retry_counts):
+        self.retry_counts = dict(retry_counts)
+        self.attempts = []
+
+    def send_batch(self, messages):
+        self.attempts.append([m.token for m in messages])
+        statuses = []
+        for m in messages:
+            if self.retry_counts.get(m.token, 0) > 0:
+                self.retry_counts[m.token] -= 1
+                statuses.append(RETRY)
+            else:
+                statuses.append(SENT)
+        return statuses
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """백오프 대기 시간을 기록하고 실제로는 기다리지 않음 (지터 = 0)"""
+    recorded = []
+    monkeypatch.setattr(push_sender.time, "sleep", recorded.append)
+    monkeypatch.setattr(push_sender.random, "random", lambda: 0.0)
+    return recorded
+
+
+def test_batches_never_exceed_fcm_limit():
+    transport = RecordingTransport(latency_sec=0)
+    dispatcher = PushDispatcher(transport=transport, batch_size=2000, max_concurrency=4)
+
+    report = dispatcher.dispatch(make_messages(1234))
+
+    assert dispatcher.batch_size == FCM_MAX_BATCH
+    assert sorted(transport.batch_sizes, reverse=True) == [500, 500, 234]
+    assert report.sent == 1234
+    assert report.statuses == [SENT] * 1234
+
+
+def test_concurrent_batches_bounded_by_max_concurrency():
+    transport = RecordingTransport(latency_sec=0.05)
+    dispatcher = PushDispatcher(transport=transport, batch_size=10, max_concurrency=3)
+
+    t0 = time.perf_counter()
+    report = dispatcher.dispatch(make_messages(100))
+    elapsed = time.perf_counter() - t0
+
+    assert transport.batches == 10
+    assert transport.max_in_flight == 3
+    assert report.sent == 100
+    # 10배치 / 동시 3 → 최소 4번의 latency (순차라면 10번)
+    assert 4 * 0.05 <= elapsed < 10 * 0.05
+
+
+def test_retry_with_backoff_then_success(sleeps):
+    messages = make_messages(5)
+    transport = ScriptedTransport({"token-1": 2, "token-3": 1})
+    dispatcher = PushDispatcher(transport=transport, batch_size=500, max_concurrency=1,
+                                max_retries=3, backoff_base_sec=0.1)
+
+    report = dispatcher.dispatch(messages)
+
+    # 실패한 메시지만 다시 보냄
+    assert transport.attempts == [[m.token for m in messages], ["token-1", "token-3"], ["token-1"]]
+    assert sleeps == pytest.approx([0.1, 0.2]) # base * 2^시도
+    assert report.sent == 5
+    assert report.failed == 0
+    assert report.retried == 3
+    assert report.statuses == [SENT] * 5
+
+
+def test_retry_exhausted_counts_as_failed(sleeps):
+    transport = ScriptedTransport({"token-0": 10})
+    dispatcher = PushDispatcher(transport=transport, batch_size=500, max_concurrency=1,
+                                max_retries=2, backoff_base_sec=0.1)
+
+    report = dispatcher.dispatch(make_messages(2))
+
+    assert len(transport.attempts) == 3
+    assert sleeps == pytest.approx([0.1, 0.2])
+    assert report.sent == 1
+    assert report.failed == 1
+    assert report.statuses == [RETRY, SENT]
+
+
+def test_unregistered_tokens_are_cleared(monkeypatch):
+    import scheduler
+
+    messages = make_messages(6)
+    dead = {"token-2", "token-4"}
+    dispatcher = PushDispatcher(transport=FakeTransport(latency_sec=0, unregistered_tokens=dead),
+                                batch_size=4, max_concurrency=2)
+    clear_push_tokens = mock.Mock(return_value=len(dead))
+    monkeypatch.setattr(scheduler.crud, "clear_push_tokens", clear_push_tokens)
+    db = mock.Mock()
+    totals = {"users": 6, "queued": 0, "sent": 0, "failed": 0, "pruned": 0}
+
+    scheduler._flush(db, dispatcher, messages, totals)
+
+    clear_push_tokens.assert_called_once()
+    called_db, tokens = clear_push_tokens.call_args.args
+    assert called_db is db
+    assert sorted(tokens) == sorted(dead)
+    assert totals["sent"] == 4
+    assert totals["pruned"] == 2
+    assert messages == [] # 발송한 묶음은 비움
+
+
+def test_unregistered_status_reported_per_message():
+    dispatcher = PushDispatcher(transport=FakeTransport(latency_sec=0, unregistered_tokens={"token-1"}),
+                                batch_size=500, max_concurrency=1)
+
+    report = dispatcher.dispatch(make_messages(3))
+
+    assert report.statuses == [SENT, UNREGISTERED, SENT]
+    assert report.unregistered_tokens == ["token-1"]
+    assert report.sent == 2
+    assert report.failed == 0
@@ -0,0 +1,60 @@
+"""
+한글 자모 분해 (자동완성 / 오타 교정 키 생성용)
+
+- decompose("몬스테라") → "ㅁㅗㄴㅅㅡㅌㅔㄹㅏ" (겹모음/겹받침도 기본 자모로 나눔: "왜" → "ㅇㅗㅐ")
+  입력 중인 글자("몬ㅅ", "뫄")도 같은 규칙으로 풀리므로 접두사 비교가 됩니다.
+- choseong("몬스테라") → "ㅁㅅㅌㄹ"
+한글이 아닌 문자는 그대로 둡니다. 입력은 NFC로 정규화 (iOS 등에서 오는 조합형 자모 대비)
+"""
+import unicodedata
+
+_SYLLABLE_BASE = 0xAC00
+_SYLLABLE_LAST = 0xD7A3
+_JUNG_COUNT = 21
+_JONG_COUNT = 28
+
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = ("", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ",
+             "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ")
+
+# 겹모음/겹받침 → 기본 자모 (키보드로 치는 순서)
+_COMPOUND = {
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ",
+    "ㄽ": "ㄹㅅ", "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+}
+
+
+def _split(jamo: str) -> str:
+    return _COMPOUND.get(jamo, jamo)
+
+
+def decompose(text: str) -> str:
+    """한글 음절을 기본 자모열로 분해"""
+    out = []
+    for ch in unicodedata.normalize("NFC", text):
+        code = ord(ch)
+        if _SYLLABLE_BASE <= code <= _SYLLABLE_LAST:
+            offset = code - _SYLLABLE_BASE
+            cho, rest = divmod(offset, _JUNG_COUNT * _JONG_COUNT)
+            jung, jong = divmod(rest, _JONG_COUNT)
+            out.append(CHOSEONG[cho])
+            out.append(_split(JUNGSEONG[jung]))
+            out.append(_split(JONGSEONG[jong]))
+        else:
+            out.append(_split(ch))
+    return "".join(out)
+
+
+def choseong(text: str) -> str:
+    """한글 음절은 초성만, 나머지 문자는 그대로"""
+    out = []
+    for ch in unicodedata.normalize("NFC", text):
+        code = ord(ch)
+        if _SYLLABLE_BASE <= code <= _SYLLABLE_LAST:
+            out.append(CHOSEONG[(code - _SYLLABLE_BASE) // (_JUNG_COUNT * _JONG_COUNT)])
+        else:
+            out.append(ch)
+    return "".join(out)
+
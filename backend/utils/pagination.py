@@ -0,0 +1,71 @@
+from __future__ import annotations
+import base64, json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from fastapi import HTTPException, Response
+from sqlalchemy import and_, or_
+
+# 다음 페이지 커서를 돌려줄 응답 헤더 (목록 응답 본문(JSON 배열) 형식은 그대로 유지)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(sort_value: Any, row_id: int) -> str:
+    """(정렬 키, id)를 불투명한 URL-safe 문자열로 인코딩."""
+    if isinstance(sort_value, datetime):
+        payload = {"t": "dt", "v": sort_value.isoformat(), "id": row_id}
+    else:
+        payload = {"v": sort_value, "id": row_id}
+    raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[Any, int]:
+    """encode_cursor의 역변환. 형식이 잘못되면 400."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw.decode("utf-8"))
+        value = payload["v"]
+        if payload.get("t") == "dt":
+            value = datetime.fromisoformat(value)
+        return value, int(payload["id"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="INVALID_CURSOR")
+
+def keyset_paginate(
+    query,
+    sort_col,
+    id_col,
+    cursor: Optional[str],
+    limit: int,
+    desc: bool = True,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    OFFSET 대신 (sort_col, id_col) 기준 키셋 페이지네이션을 적용합니다.
+    - 커서 이후의 행만 인덱스에서 바로 찾으므로 N번째 페이지도 첫 페이지와 비용이 같습니다.
+    - limit+1개를 읽어 다음 페이지 존재 여부를 판단합니다.
+    - sort_col은 NULL이 없는 컬럼이어야 하며, (필터 컬럼, sort_col, id) 복합 인덱스가 있어야 효과적입니다.
+    반환: (rows, next_cursor)  # 마지막 페이지면 next_cursor=None
+    """
+    if cursor:
+        value, last_id = decode_cursor(cursor)
+        if desc:
+            query = query.filter(or_(sort_col < value, and_(sort_col == value, id_col < last_id)))
+        else:
+            query = query.filter(or_(sort_col > value, and_(sort_col == value, id_col > last_id)))
+
+    if desc:
+        query = query.order_by(sort_col.desc(), id_col.desc())
+    else:
+        query = query.order_by(sort_col.asc(), id_col.asc())
+
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_col.key), getattr(last, id_col.key))
+    return rows, next_cursor
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    """다음 페이지가 있으면 응답 헤더에 커서를 실어 보냅니다."""
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor